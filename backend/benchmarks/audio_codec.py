@@ -0,0 +1,120 @@
+"""Bandwidth, quality and CPU cost of the negotiated /ws audio codecs.
+
+Usage (from backend/):
+    python -m benchmarks.audio_codec --seconds 30
+    python -m benchmarks.audio_codec --frame-ms 40 --json out.json
+
+Uses a synthetic voiced-speech-like signal (harmonic stack with syllable envelope plus
+noise), framed the way each direction is on the wire: 16 kHz mic chunks of
+--uplink-chunk-ms up, 24 kHz DownlinkPacketizer frames of --frame-ms down.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from modules.audio_codec import ImaAdpcmEncoder, ima_adpcm_decode, mulaw_decode, mulaw_encode
+
+
+def synthetic_speech(seconds: float, rate: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum((0.6 / k) * np.sin(k * phase) for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None) ** 0.6
+    signal = voiced * envelope + 0.02 * rng.standard_normal(t.size)
+    return (signal / np.abs(signal).max() * 12000).astype("<i2")
+
+
+def _snr_db(ref: np.ndarray, out: np.ndarray) -> float:
+    ref = ref.astype(np.float64)
+    err = ref - out[: ref.size].astype(np.float64)
+    return round(float(10 * np.log10((ref ** 2).sum() / max(1e-9, (err ** 2).sum()))), 2)
+
+
+def _frames(pcm: np.ndarray, rate: int, frame_ms: int) -> list[bytes]:
+    step = rate * frame_ms // 1000
+    return [pcm[i:i + step].tobytes() for i in range(0, pcm.size, step)]
+
+
+def _direction(name: str, frames: list[bytes], seconds: float, encode, decode) -> dict:
+    started = time.perf_counter()
+    encoded = [encode(f) for f in frames]
+    encode_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    decoded = b"".join(decode(e) for e in encoded)
+    decode_sec = time.perf_counter() - started
+    raw_bytes = sum(len(f) for f in frames)
+    wire_bytes = sum(len(e) for e in encoded)
+    ref = np.frombuffer(b"".join(frames), dtype="<i2")
+    return {
+        "codec": name,
+        "pcmKbps": round(raw_bytes * 8 / seconds / 1000, 1),
+        "wireKbps": round(wire_bytes * 8 / seconds / 1000, 1),
+        "compression": round(raw_bytes / wire_bytes, 2) if wire_bytes else 0.0,
+        "snrDb": _snr_db(ref, np.frombuffer(decoded, dtype="<i2")),
+        # CPU seconds per second of audio, i.e. the fraction of one core a session costs.
+        "encodeCpuPerAudioSec": round(encode_sec / seconds, 5),
+        "decodeCpuPerAudioSec": round(decode_sec / seconds, 5),
+    }
+
+
+def run_benchmark(seconds: float, frame_ms: int, uplink_chunk_ms: int) -> dict:
+    up = _frames(synthetic_speech(seconds, 16000), 16000, uplink_chunk_ms)
+    down = _frames(synthetic_speech(seconds, 24000, seed=11), 24000, frame_ms)
+    encoder = ImaAdpcmEncoder()
+    report = {
+        "seconds": seconds,
+        "frameMs": frame_ms,
+        "uplinkChunkMs": uplink_chunk_ms,
+        "uplink": _direction("mulaw", up, seconds, mulaw_encode, mulaw_decode),
+        "downlink": _direction("ima_adpcm", down, seconds, encoder.encode, ima_adpcm_decode),
+    }
+    # Server-side cost per session: decode mu-law coming up, encode ADPCM going down.
+    report["serverCpuPerAudioSec"] = round(
+        report["uplink"]["decodeCpuPerAudioSec"] + report["downlink"]["encodeCpuPerAudioSec"], 5
+    )
+    report["sessionKbps"] = {
+        "pcm": round(report["uplink"]["pcmKbps"] + report["downlink"]["pcmKbps"], 1),
+        "compact": round(report["uplink"]["wireKbps"] + report["downlink"]["wireKbps"], 1),
+    }
+    return report
+
+
+def print_report(report: dict):
+    print(f"[Bench] {report['seconds']}s of audio, downlink frames={report['frameMs']}ms")
+    for direction in ("uplink", "downlink"):
+        r = report[direction]
+        print(
+            f"[Bench] {direction:<8} {r['codec']:<9} {r['pcmKbps']} -> {r['wireKbps']} kbps "
+            f"({r['compression']}x) snr={r['snrDb']}dB "
+            f"encode={r['encodeCpuPerAudioSec'] * 100:.2f}% decode={r['decodeCpuPerAudioSec'] * 100:.2f}% of a core"
+        )
+    kbps = report["sessionKbps"]
+    print(
+        f"[Bench] session: {kbps['pcm']} kbps PCM -> {kbps['compact']} kbps compact, "
+        f"server codec CPU={report['serverCpuPerAudioSec'] * 100:.2f}% of a core"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--frame-ms", type=int, default=40)
+    parser.add_argument("--uplink-chunk-ms", type=int, default=32)
+    parser.add_argument("--json", default=None, help="also write the full report to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.seconds, args.frame_ms, args.uplink_chunk_ms)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Callable
+
+
+DEFAULT_CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "intent_corpus.json",
+)
+
+
+# Row fields: text, intent, destination (null when none is named) and optional flags
+# home_update, timer_seconds, active_timer, arrival_eta, vision (all default false/null).
+def load_intent_corpus(path: str | None = None) -> list[dict]:
+    with open(path or DEFAULT_CORPUS_PATH, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [r for r in rows if isinstance(r, dict) and str(r.get("text") or "").strip()]
+
+
+def label_route(row: dict) -> dict:
+    return {
+        "intent": row.get("intent") or "general",
+        "destination": row.get("destination"),
+        "home_update": bool(row.get("home_update", False)),
+        "timer_seconds": row.get("timer_seconds"),
+    }
+
+
+def corpus_answerer(rows: list[dict]) -> Callable[[str, bool], dict]:
+    """Answer function for the stand-in LLM: returns the labelled route for known utterances."""
+    by_text = {str(r.get("text")).strip(): label_route(r) for r in rows}
+
+    def _answer(text: str, _active_timer: bool) -> dict:
+        return by_text.get(str(text or "").strip()) or label_route({"intent": "general"})
+
+    return _answer
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+
+class FakeChatCompletionsServer:
+    """Local stand-in for the Azure OpenAI chat-completions endpoint used by IntentRouter.
+
+    Answers with a fixed JSON route per utterance, after a configurable time-to-first-token
+    and per-token delay, for both plain and `stream=True` requests.
+    """
+
+    def __init__(
+        self,
+        answer_for: Callable[[str, bool], dict],
+        ttft_sec: float = 0.25,
+        token_sec: float = 0.015,
+        chars_per_token: int = 4,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.answer_for = answer_for
+        self.ttft_sec = float(ttft_sec)
+        self.token_sec = float(token_sec)
+        self.chars_per_token = max(1, int(chars_per_token))
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeChatCompletionsServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _content_for(self, body: dict) -> str:
+        messages = body.get("messages") or []
+        user = str((messages[-1] or {}).get("content") or "") if messages else ""
+        active_timer = "active_timer=true" in user
+        text = user.split("user_text=", 1)[1] if "user_text=" in user else user
+        return json.dumps(self.answer_for(text, active_timer), ensure_ascii=False)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args):
+                return
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                content = server._content_for(body)
+                tokens = [
+                    content[i:i + server.chars_per_token]
+                    for i in range(0, len(content), server.chars_per_token)
+                ]
+                time.sleep(server.ttft_sec)
+                if body.get("stream"):
+                    self._stream(tokens, body.get("model"))
+                else:
+                    time.sleep(server.token_sec * len(tokens))
+                    self._send_json(
+                        {
+                            "id": "bench",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": body.get("model"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": content},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                        }
+                    )
+
+            def _send_json(self, payload: dict):
+                raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def _write_chunk(self, raw: bytes):
+                self.wfile.write(f"{len(raw):x}\r\n".encode("ascii") + raw + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, tokens: list[str], model):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for idx, token in enumerate(tokens):
+                    if idx:
+                        time.sleep(server.token_sec)
+                    event = {
+                        "id": "bench",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
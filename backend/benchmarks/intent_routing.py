@@ -0,0 +1,279 @@
+"""Per-tier latency, throughput and accuracy for intent routing and the text detectors.
+
+Usage (from backend/):
+    python -m benchmarks.intent_routing --repeat 20
+    python -m benchmarks.intent_routing --llm-ttft-ms 250 --json out.json
+
+The LLM tier runs against benchmarks.fake_llm_server, which answers with the corpus
+labels: it measures client/transport/parse cost under a simulated model delay, not
+model accuracy.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+from benchmarks.corpus import corpus_answerer, load_intent_corpus
+from benchmarks.fake_llm_server import FakeChatCompletionsServer
+from modules import conversation_text_utils, route_text_utils
+from modules.fast_intent_router import fast_route_intent
+from modules.intent_router import IntentRouter
+from modules.ngram_intent_classifier import DEFAULT_WEIGHTS_PATH, NgramIntentClassifier
+from modules.text_features import extract_text_features
+
+
+PASS = "-"
+
+
+def _percentile_us(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return round(ordered[idx] * 1e6, 1)
+
+
+def _time_calls(fn: Callable[[dict], Any], rows: list[dict], repeat: int) -> tuple[list[Any], list[float]]:
+    outputs: list[Any] = []
+    durations: list[float] = []
+    for rep in range(max(1, repeat)):
+        for row in rows:
+            started = time.perf_counter()
+            out = fn(row)
+            durations.append(time.perf_counter() - started)
+            if rep == 0:
+                outputs.append(out)
+    return outputs, durations
+
+
+def _timing(durations: list[float]) -> dict:
+    total = sum(durations)
+    return {
+        "calls": len(durations),
+        "p50Us": _percentile_us(durations, 50),
+        "p90Us": _percentile_us(durations, 90),
+        "p99Us": _percentile_us(durations, 99),
+        "throughputPerSec": round(len(durations) / total, 1) if total > 0 else 0.0,
+    }
+
+
+def _intent_report(rows: list[dict], predicted: list[str]) -> dict:
+    labels = sorted({r["intent"] for r in rows} | {p for p in predicted if p != PASS})
+    matrix = {gold: {p: 0 for p in labels + [PASS]} for gold in labels}
+    answered = correct = 0
+    for row, pred in zip(rows, predicted):
+        matrix[row["intent"]][pred] += 1
+        if pred != PASS:
+            answered += 1
+            correct += int(pred == row["intent"])
+    n = max(1, len(rows))
+    return {
+        "coverage": round(answered / n, 4),
+        "answeredAccuracy": round(correct / answered, 4) if answered else 0.0,
+        "overallAccuracy": round(correct / n, 4),
+        "labels": labels,
+        "confusion": matrix,
+    }
+
+
+def _binary_report(gold: list[bool], predicted: list[bool]) -> dict:
+    tp = sum(1 for g, p in zip(gold, predicted) if g and p)
+    fp = sum(1 for g, p in zip(gold, predicted) if (not g) and p)
+    fn = sum(1 for g, p in zip(gold, predicted) if g and not p)
+    tn = sum(1 for g, p in zip(gold, predicted) if (not g) and not p)
+    return {
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": round(tp / (tp + fp), 4) if (tp + fp) else 0.0,
+        "recall": round(tp / (tp + fn), 4) if (tp + fn) else 0.0,
+    }
+
+
+def _destination_report(rows: list[dict], predicted: list[str | None]) -> dict:
+    norm = route_text_utils.normalize_place_name
+    named = [(r, p) for r, p in zip(rows, predicted) if r.get("destination")]
+    unnamed = [(r, p) for r, p in zip(rows, predicted) if not r.get("destination")]
+    exact = sum(1 for r, p in named if p and norm(p) == norm(r["destination"]))
+    partial = sum(
+        1 for r, p in named
+        if p and (norm(r["destination"]) in norm(p) or norm(p) in norm(r["destination"]))
+    )
+    spurious = sum(1 for _r, p in unnamed if p)
+    return {
+        "named": len(named),
+        "exact": exact,
+        "overlap": partial,
+        "spuriousOnUnnamed": spurious,
+        "unnamed": len(unnamed),
+    }
+
+
+def run_benchmark(
+    rows: list[dict],
+    repeat: int,
+    llm_ttft_sec: float,
+    llm_token_sec: float,
+    llm_repeat: int,
+    ngram_threshold: float = 0.7,
+) -> dict:
+    extractor = route_text_utils.extract_destination_from_text
+    eta_checker = route_text_utils.is_arrival_eta_query
+    fallback_router = IntentRouter(api_key=None, endpoint=None, api_version=None, model="bench", destination_extractor=extractor)
+    report: dict[str, Any] = {"corpus": len(rows), "repeat": repeat, "tiers": {}, "detectors": {}}
+
+    def _fast(row):
+        route = fast_route_intent(
+            row["text"],
+            active_timer=bool(row.get("active_timer")),
+            destination_extractor=extractor,
+            arrival_eta_query_checker=eta_checker,
+        )
+        return route.get("intent") if route else PASS
+
+    outputs, durations = _time_calls(_fast, rows, repeat)
+    report["tiers"]["fast_route_intent"] = {**_timing(durations), **_intent_report(rows, outputs)}
+
+    try:
+        ngram = NgramIntentClassifier.load(DEFAULT_WEIGHTS_PATH, threshold=ngram_threshold)
+    except Exception as e:
+        print(f"[Bench] n-gram weights unavailable: {e}")
+        ngram = None
+    if ngram is not None:
+        def _ngram(row):
+            route = ngram.route(row["text"], active_timer=bool(row.get("active_timer")))
+            return route.get("intent") if route else PASS
+
+        outputs, durations = _time_calls(_ngram, rows, repeat)
+        report["tiers"]["ngram_classifier"] = {**_timing(durations), **_intent_report(rows, outputs)}
+
+    def _fallback(row):
+        return fallback_router._fallback(row["text"], active_timer=bool(row.get("active_timer"))).get("intent")
+
+    outputs, durations = _time_calls(_fallback, rows, repeat)
+    report["tiers"]["intent_router_fallback"] = {**_timing(durations), **_intent_report(rows, outputs)}
+
+    server = FakeChatCompletionsServer(corpus_answerer(rows), ttft_sec=llm_ttft_sec, token_sec=llm_token_sec).start()
+    llm_router = IntentRouter(
+        api_key="bench",
+        endpoint=server.endpoint,
+        api_version="2024-10-21",
+        model="bench-router",
+        destination_extractor=extractor,
+    )
+    try:
+        outputs, durations = _time_calls(
+            lambda row: llm_router.route(row["text"], active_timer=bool(row.get("active_timer"))).get("intent"),
+            rows,
+            llm_repeat,
+        )
+        report["tiers"]["intent_router_llm_sync"] = {**_timing(durations), **_intent_report(rows, outputs)}
+
+        async def _concurrent() -> tuple[list[str], float]:
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *[llm_router.route_async(r["text"], active_timer=bool(r.get("active_timer"))) for r in rows]
+            )
+            elapsed = time.perf_counter() - started
+            await llm_router.aclose()
+            return [r.get("intent") for r in results], elapsed
+
+        outputs, elapsed = asyncio.run(_concurrent())
+        report["tiers"]["intent_router_llm_async_concurrent"] = {
+            "calls": len(rows),
+            "wallSec": round(elapsed, 3),
+            "throughputPerSec": round(len(rows) / elapsed, 1) if elapsed > 0 else 0.0,
+            **_intent_report(rows, outputs),
+        }
+    finally:
+        server.stop()
+
+    detectors = {
+        "is_arrival_eta_query": (eta_checker, "arrival_eta"),
+        "is_vision_related_query": (conversation_text_utils.is_vision_related_query, "vision"),
+        "is_home_update_utterance": (conversation_text_utils.is_home_update_utterance, "home_update"),
+    }
+    for name, (fn, field) in detectors.items():
+        outputs, durations = _time_calls(lambda row, fn=fn: bool(fn(row["text"])), rows, repeat)
+        gold = [bool(r.get(field)) for r in rows]
+        report["detectors"][name] = {**_timing(durations), **_binary_report(gold, outputs)}
+
+    outputs, durations = _time_calls(
+        lambda row: bool(conversation_text_utils.is_vision_followup_utterance(row["text"])), rows, repeat
+    )
+    report["detectors"]["is_vision_followup_utterance"] = {
+        **_timing(durations),
+        "positiveRate": round(sum(outputs) / max(1, len(outputs)), 4),
+    }
+
+    outputs, durations = _time_calls(lambda row: extractor(row["text"]), rows, repeat)
+    report["detectors"]["extract_destination_from_text"] = {**_timing(durations), **_destination_report(rows, outputs)}
+
+    # The single-pass feature object that replaces the per-detector scans in the turn pipeline.
+    outputs, durations = _time_calls(lambda row: extract_text_features(row["text"]), rows, repeat)
+    report["detectors"]["extract_text_features"] = _timing(durations)
+    return report
+
+
+def _print_confusion(tier: dict):
+    labels = tier["labels"]
+    cols = labels + [PASS]
+    short = {l: l[:6] for l in labels}
+    short[PASS] = PASS
+    print("      gold \\ pred  " + " ".join(f"{short[c]:>6}" for c in cols))
+    for gold in labels:
+        row = tier["confusion"][gold]
+        print(f"  {gold:>17} " + " ".join(f"{row[c]:>6}" for c in cols))
+
+
+def print_report(report: dict):
+    print(f"[Bench] corpus={report['corpus']} repeat={report['repeat']}")
+    for name, tier in report["tiers"].items():
+        latency = (
+            f"p50={tier['p50Us']}us p90={tier['p90Us']}us p99={tier['p99Us']}us"
+            if "p50Us" in tier
+            else f"wall={tier['wallSec']}s"
+        )
+        print(
+            f"\n[Bench] {name}: {latency} throughput={tier['throughputPerSec']}/s "
+            f"coverage={tier['coverage']:.1%} answered-acc={tier['answeredAccuracy']:.1%} "
+            f"overall-acc={tier['overallAccuracy']:.1%}"
+        )
+        _print_confusion(tier)
+    print()
+    for name, det in report["detectors"].items():
+        extra = {k: v for k, v in det.items() if k not in {"calls", "p50Us", "p90Us", "p99Us", "throughputPerSec"}}
+        print(f"[Bench] {name}: p50={det['p50Us']}us p99={det['p99Us']}us throughput={det['throughputPerSec']}/s {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--repeat", type=int, default=20, help="repetitions for in-process tiers")
+    parser.add_argument("--llm-repeat", type=int, default=1, help="repetitions for the sync LLM tier")
+    parser.add_argument("--llm-ttft-ms", type=float, default=250.0)
+    parser.add_argument("--llm-token-ms", type=float, default=15.0)
+    parser.add_argument("--ngram-threshold", type=float, default=0.7)
+    parser.add_argument("--json", default=None, help="also write the full report to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        load_intent_corpus(args.corpus),
+        repeat=args.repeat,
+        llm_ttft_sec=args.llm_ttft_ms / 1000.0,
+        llm_token_sec=args.llm_token_ms / 1000.0,
+        llm_repeat=args.llm_repeat,
+        ngram_threshold=args.ngram_threshold,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
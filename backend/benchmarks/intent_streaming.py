@@ -0,0 +1,98 @@
+"""Streaming vs. non-streaming LLM intent routing against the local stand-in endpoint.
+
+Usage (from backend/):
+    python -m benchmarks.intent_streaming --ttft-ms 250 --token-ms 15 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.corpus import corpus_answerer, load_intent_corpus
+from benchmarks.fake_llm_server import FakeChatCompletionsServer
+from modules.intent_router import IntentRouter
+from modules.latency_stats import LatencyStats
+
+
+async def _run(router: IntentRouter, rows: list[dict], repeat: int, stats: LatencyStats) -> dict:
+    agree = {"early": 0, "early_matches_final": 0, "final_correct": 0, "total": 0}
+    for _ in range(repeat):
+        for row in rows:
+            text = row["text"]
+            active_timer = bool(row.get("active_timer", False))
+
+            started = time.perf_counter()
+            full = await router.route_async(text, active_timer=active_timer)
+            stats.record("non_streaming:ready", time.perf_counter() - started)
+
+            early_at: list[float] = []
+            early_route: list[dict] = []
+
+            def _on_ready(route: dict):
+                early_at.append(time.perf_counter())
+                early_route.append(route)
+
+            started = time.perf_counter()
+            streamed = await router.route_streaming(text, active_timer=active_timer, on_ready=_on_ready)
+            finished = time.perf_counter()
+            stats.record("streaming:final", finished - started)
+            stats.record("streaming:ready", (early_at[0] if early_at else finished) - started)
+
+            agree["total"] += 1
+            agree["final_correct"] += int(streamed.get("intent") == row.get("intent") == full.get("intent"))
+            if early_route:
+                agree["early"] += 1
+                agree["early_matches_final"] += int(
+                    early_route[0].get("intent") == streamed.get("intent")
+                    and early_route[0].get("destination") == streamed.get("destination")
+                )
+    return agree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--ttft-ms", type=float, default=250.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = load_intent_corpus(args.corpus)
+    server = FakeChatCompletionsServer(
+        corpus_answerer(rows),
+        ttft_sec=args.ttft_ms / 1000.0,
+        token_sec=args.token_ms / 1000.0,
+    ).start()
+    router = IntentRouter(
+        api_key="bench",
+        endpoint=server.endpoint,
+        api_version="2024-10-21",
+        model="bench-router",
+    )
+    stats = LatencyStats(window=max(512, len(rows) * args.repeat))
+
+    async def _main():
+        try:
+            return await _run(router, rows, args.repeat, stats)
+        finally:
+            await router.aclose()
+
+    try:
+        agree = asyncio.run(_main())
+    finally:
+        server.stop()
+
+    print(f"[Bench] corpus={len(rows)} repeat={args.repeat} ttft={args.ttft_ms}ms token={args.token_ms}ms")
+    for path in ("non_streaming:ready", "streaming:ready", "streaming:final"):
+        print(f"[Bench] {stats.format_line(path)}")
+    total = max(1, agree["total"])
+    print(
+        f"[Bench] early-start={agree['early']}/{agree['total']} "
+        f"early==final={agree['early_matches_final']}/{max(1, agree['early'])} "
+        f"final-correct={agree['final_correct'] / total:.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Audio-part forwarding throughput: lock-based TurnManager + polling watchdog vs lock-free + call_later.
+
+Usage (from backend/):
+    python -m benchmarks.turn_manager --sessions 200 --parts 2000
+    python -m benchmarks.turn_manager --json out.json
+
+Each simulated session runs two personas that forward Gemini audio parts through the turn
+gate the way LumiRamiManager._run_persona does (send is a no-op coroutine), while the
+session's silence watchdog runs alongside. "legacy" reproduces the previous implementation:
+try_acquire + update_timestamp under an asyncio.Lock, and a 100 ms polling task per session.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+from modules.lumirami import TurnManager
+
+
+class LegacyTurnManager:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.current_speaker = None
+        self.last_speech_time = 0.0
+        self.waiting_for_user = False
+
+    async def try_acquire(self, who: str) -> bool:
+        async with self.lock:
+            if self.waiting_for_user:
+                return False
+            if self.current_speaker == who:
+                self.last_speech_time = time.time()
+                return True
+            if self.current_speaker is None:
+                self.current_speaker = who
+                self.last_speech_time = time.time()
+                return True
+            return False
+
+    async def update_timestamp(self, who: str):
+        async with self.lock:
+            if self.current_speaker == who:
+                self.last_speech_time = time.time()
+
+    async def force_release(self):
+        async with self.lock:
+            self.current_speaker = None
+
+
+async def _send(_data: bytes, _name: str):
+    return None
+
+
+async def _legacy_session(parts: int, counters: dict, stop: asyncio.Event):
+    tm = LegacyTurnManager()
+
+    async def watchdog():
+        while not stop.is_set():
+            await asyncio.sleep(0.1)
+            counters["wakeups"] += 1
+            async with tm.lock:
+                current, last = tm.current_speaker, tm.last_speech_time
+            if current and time.time() - last > 1.5:
+                await tm.force_release()
+
+    async def persona(name: str):
+        for _ in range(parts):
+            if await tm.try_acquire(name):
+                await tm.update_timestamp(name)
+                await _send(b"", name)
+                counters["forwarded"] += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(watchdog())
+    await asyncio.gather(persona("lumi"), persona("rami"))
+    return task
+
+
+async def _lockfree_session(parts: int, counters: dict, stop: asyncio.Event):
+    def on_silence(_speaker: str):
+        counters["wakeups"] += 1
+        tm.force_release()
+
+    tm = TurnManager(silence_sec=1.5, on_silence=on_silence)
+
+    async def persona(name: str):
+        for _ in range(parts):
+            if tm.try_acquire(name):
+                await _send(b"", name)
+                counters["forwarded"] += 1
+            await asyncio.sleep(0)
+
+    await asyncio.gather(persona("lumi"), persona("rami"))
+    return tm
+
+
+async def _run(kind: str, sessions: int, parts: int) -> dict:
+    counters = {"forwarded": 0, "wakeups": 0}
+    stop = asyncio.Event()
+    runner = _legacy_session if kind == "legacy" else _lockfree_session
+    started = time.perf_counter()
+    # TurnManager logs every acquisition; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        leftovers = await asyncio.gather(*[runner(parts, counters, stop) for _ in range(sessions)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for item in leftovers:
+        if isinstance(item, asyncio.Task):
+            item.cancel()
+        else:
+            item.close()
+    await asyncio.sleep(0)
+    attempts = sessions * parts * 2
+    return {
+        "kind": kind,
+        "elapsedSec": round(elapsed, 3),
+        "forwarded": counters["forwarded"],
+        "partsPerSec": round(attempts / elapsed, 1),
+        "usPerPart": round(elapsed / attempts * 1e6, 2),
+        "watchdogWakeups": counters["wakeups"],
+        "watchdogWakeupsPerSec": round(counters["wakeups"] / elapsed, 1),
+    }
+
+
+def run_benchmark(sessions: int, parts: int) -> dict:
+    legacy = asyncio.run(_run("legacy", sessions, parts))
+    lockfree = asyncio.run(_run("lockfree", sessions, parts))
+    return {
+        "sessions": sessions,
+        "partsPerPersona": parts,
+        "legacy": legacy,
+        "lockfree": lockfree,
+        "speedup": round(lockfree["partsPerSec"] / legacy["partsPerSec"], 2) if legacy["partsPerSec"] else 0.0,
+    }
+
+
+def print_report(report: dict):
+    print(f"[Bench] {report['sessions']} sessions x 2 personas x {report['partsPerPersona']} audio parts")
+    for kind in ("legacy", "lockfree"):
+        r = report[kind]
+        print(
+            f"[Bench] {kind:<8} {r['partsPerSec']:>11} parts/s ({r['usPerPart']} us/part), "
+            f"elapsed={r['elapsedSec']}s, watchdog wakeups={r['watchdogWakeups']} ({r['watchdogWakeupsPerSec']}/s)"
+        )
+    print(f"[Bench] speedup: {report['speedup']}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--parts", type=int, default=2000)
+    parser.add_argument("--json", default=None, help="also write the full report to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sessions, args.parts)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+
+# Negotiated per session via /ws?codec=...; PCM16 stays the contract for STT and Gemini.
+UPLINK_CODECS = {"pcm", "mulaw"}
+DOWNLINK_CODECS = {"pcm", "ima_adpcm"}
+_CODEC_ALIASES = {
+    "compact": ("mulaw", "ima_adpcm"),
+    "mulaw": ("mulaw", None),
+    "ulaw": ("mulaw", None),
+    "adpcm": (None, "ima_adpcm"),
+    "ima_adpcm": (None, "ima_adpcm"),
+    "pcm": ("pcm", "pcm"),
+}
+
+
+def negotiate_audio_codecs(value: str | None) -> dict:
+    """'compact' -> mu-law up + IMA-ADPCM down; tokens can also be combined, e.g. 'mulaw,adpcm'."""
+    uplink, downlink = "pcm", "pcm"
+    for token in str(value or "").replace(";", ",").split(","):
+        up, down = _CODEC_ALIASES.get(token.strip().lower(), (None, None))
+        uplink = up or uplink
+        downlink = down or downlink
+    return {"uplink": uplink, "downlink": downlink}
+
+
+# --- G.711 mu-law -----------------------------------------------------------
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+_EXP_LUT = np.array([max(0, int(i).bit_length() - 1) for i in range(256)], dtype=np.int32)
+
+
+def _build_mulaw_decode_table() -> np.ndarray:
+    u = (~np.arange(256, dtype=np.int32)) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    return np.where(u & 0x80, -magnitude, magnitude).astype("<i2")
+
+
+_MULAW_DECODE = _build_mulaw_decode_table()
+
+
+def mulaw_encode(pcm: bytes) -> bytes:
+    x = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).astype(np.int32)
+    sign = (x < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(x), _MULAW_CLIP) + _MULAW_BIAS
+    exponent = _EXP_LUT[magnitude >> 7]
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return ((~(sign | (exponent << 4) | mantissa)) & 0xFF).astype(np.uint8).tobytes()
+
+
+def mulaw_decode(data: bytes) -> bytes:
+    return _MULAW_DECODE[np.frombuffer(data, dtype=np.uint8)].tobytes()
+
+
+# --- IMA-ADPCM --------------------------------------------------------------
+
+_IMA_STEPS = (
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794, 32767,
+)
+_IMA_INDEX_ADJUST = (-1, -1, -1, -1, 2, 4, 6, 8, -1, -1, -1, -1, 2, 4, 6, 8)
+# Block header: first sample (int16), step index (uint8), flags (bit 0: last nibble is padding).
+IMA_BLOCK_HEADER = struct.Struct("<hBB")
+
+
+class ImaAdpcmEncoder:
+    """Encodes each PCM16 frame as a self-contained IMA-ADPCM block (4:1 after the 4-byte header).
+
+    The step index carries over between frames so quality does not reset every frame,
+    but each block header holds the full decoder state: a lost frame never corrupts the next.
+    The sample recurrence is sequential, so only nibble packing is vectorized.
+    """
+
+    def __init__(self):
+        self.index = 0
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+        if samples.size == 0:
+            return b""
+        predictor = int(samples[0])
+        index = self.index
+        steps = _IMA_STEPS
+        adjust = _IMA_INDEX_ADJUST
+        codes = bytearray(samples.size - 1)
+        for i, sample in enumerate(samples[1:].tolist()):
+            step = steps[index]
+            diff = sample - predictor
+            code = 0
+            if diff < 0:
+                code = 8
+                diff = -diff
+            delta = step >> 3
+            if diff >= step:
+                code |= 4
+                diff -= step
+                delta += step
+            step >>= 1
+            if diff >= step:
+                code |= 2
+                diff -= step
+                delta += step
+            step >>= 1
+            if diff >= step:
+                code |= 1
+                delta += step
+            predictor = predictor - delta if code & 8 else predictor + delta
+            if predictor > 32767:
+                predictor = 32767
+            elif predictor < -32768:
+                predictor = -32768
+            index += adjust[code]
+            if index < 0:
+                index = 0
+            elif index > 88:
+                index = 88
+            codes[i] = code
+        header = IMA_BLOCK_HEADER.pack(int(samples[0]), self.index, len(codes) & 1)
+        self.index = index
+        nibbles = np.frombuffer(bytes(codes) + (b"\x00" if len(codes) & 1 else b""), dtype=np.uint8)
+        return header + (nibbles[0::2] | (nibbles[1::2] << 4)).astype(np.uint8).tobytes()
+
+
+def ima_adpcm_decode(block: bytes) -> bytes:
+    if len(block) < IMA_BLOCK_HEADER.size:
+        return b""
+    predictor, index, flags = IMA_BLOCK_HEADER.unpack_from(block)
+    packed = np.frombuffer(block, dtype=np.uint8, offset=IMA_BLOCK_HEADER.size)
+    nibbles = np.empty(packed.size * 2, dtype=np.uint8)
+    nibbles[0::2] = packed & 0x0F
+    nibbles[1::2] = packed >> 4
+    if flags & 1:
+        nibbles = nibbles[:-1]
+    out = [predictor]
+    steps = _IMA_STEPS
+    adjust = _IMA_INDEX_ADJUST
+    index = min(88, int(index))
+    for code in nibbles.tolist():
+        step = steps[index]
+        delta = step >> 3
+        if code & 4:
+            delta += step
+        if code & 2:
+            delta += step >> 1
+        if code & 1:
+            delta += step >> 2
+        predictor = predictor - delta if code & 8 else predictor + delta
+        if predictor > 32767:
+            predictor = 32767
+        elif predictor < -32768:
+            predictor = -32768
+        index += adjust[code]
+        if index < 0:
+            index = 0
+        elif index > 88:
+            index = 88
+        out.append(predictor)
+    return np.asarray(out, dtype="<i2").tobytes()
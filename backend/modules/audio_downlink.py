@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+import time
+from typing import Awaitable, Callable
+
+
+# Optional 12-byte frame header (little-endian): magic "AD", version, speaker id,
+# sequence number, timestamp in samples on the session's playback timeline.
+DOWNLINK_HEADER = struct.Struct("<2sBBII")
+DOWNLINK_MAGIC = b"AD"
+DOWNLINK_VERSION = 1
+SPEAKER_IDS = {"lumi": 1, "rami": 2}
+
+
+class DownlinkPacketizer:
+    """Re-frames Gemini PCM16 output into fixed-duration websocket frames, paced just ahead of playback.
+
+    Gemini hands over audio in irregular bursts; frames leave at most `lead_ms` ahead of
+    where the client's playback will be, so message size and rate stay constant.
+    frame_ms <= 0 forwards each chunk unchanged and unpaced (legacy behaviour, still counted).
+    At most about `max_frames` wait to be paced out; beyond that push() blocks, so a slow client
+    slows the persona receive loop instead of growing this queue.
+    """
+
+    def __init__(
+        self,
+        send_bytes: Callable[[bytes], Awaitable[None]],
+        frame_ms: int = 40,
+        lead_ms: int = 200,
+        sample_rate: int = 24000,
+        header: bool = False,
+        encode: Callable[[bytes], bytes] | None = None,
+        max_frames: int = 128,
+        log=print,
+    ):
+        self.send_bytes = send_bytes
+        self.sample_rate = int(sample_rate)
+        self.bytes_per_sec = self.sample_rate * 2
+        self.passthrough = int(frame_ms) <= 0
+        self.frame_bytes = max(2, (self.bytes_per_sec * int(frame_ms) // 1000) & ~1)
+        self.frame_sec = self.frame_bytes / self.bytes_per_sec
+        self.lead_sec = max(0.0, float(lead_ms) / 1000.0)
+        self.header = bool(header)
+        # Optional wire codec (e.g. ImaAdpcmEncoder.encode); pacing always runs on PCM duration.
+        self.encode = encode
+        self.log = log
+        self._buffer = bytearray()
+        self._speaker: str | None = None
+        self._frames: asyncio.Queue = asyncio.Queue()
+        # Soft bound: the sync tail emit may add one short frame past it.
+        self.max_frames = max(1, int(max_frames))
+        self._space = asyncio.Event()
+        self._space.set()
+        self._closed = False
+        self._tail_timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self._seq = 0
+        self._play_clock = 0.0
+        self._started_at = time.monotonic()
+        self._send_failed = False
+        # Bumped by clear(): frames from an older epoch are dropped even if already dequeued.
+        self._epoch = 0
+        self._stats = {
+            "inputChunks": 0,
+            "inputBytes": 0,
+            "frames": 0,
+            "bytes": 0,
+            "clockResets": 0,
+            "encodeSec": 0.0,
+            "clears": 0,
+            "clearedFrames": 0,
+            "backpressureSec": 0.0,
+            "maxQueuedFrames": 0,
+        }
+
+    def start(self) -> "DownlinkPacketizer":
+        self._task = asyncio.create_task(self._pace_loop())
+        return self
+
+    async def _wait_for_space(self):
+        if self._frames.qsize() < self.max_frames:
+            return
+        started = time.monotonic()
+        while self._frames.qsize() >= self.max_frames and not self._closed:
+            self._space.clear()
+            await self._space.wait()
+        self._stats["backpressureSec"] += time.monotonic() - started
+
+    async def push(self, audio: bytes, speaker: str):
+        if not audio or self._closed:
+            return
+        if speaker != self._speaker:
+            self._emit_tail()
+            self._speaker = speaker
+        self._stats["inputChunks"] += 1
+        self._stats["inputBytes"] += len(audio)
+        if self.passthrough:
+            await self._wait_for_space()
+            self._frames.put_nowait((self._epoch, speaker, bytes(audio)))
+            self._note_queued()
+            return
+        self._buffer += audio
+        while len(self._buffer) >= self.frame_bytes:
+            # clear() may run while waiting; it empties the buffer, which ends this loop.
+            await self._wait_for_space()
+            if len(self._buffer) < self.frame_bytes or self._closed:
+                break
+            self._frames.put_nowait((self._epoch, speaker, bytes(self._buffer[:self.frame_bytes])))
+            del self._buffer[:self.frame_bytes]
+        self._note_queued()
+        # A short trailing remainder is sent on its own if Gemini goes quiet.
+        if self._tail_timer is not None:
+            self._tail_timer.cancel()
+        self._tail_timer = asyncio.get_running_loop().call_later(self.frame_sec * 2, self._emit_tail)
+
+    def _note_queued(self):
+        self._stats["maxQueuedFrames"] = max(self._stats["maxQueuedFrames"], self._frames.qsize())
+
+    def flush(self):
+        self._emit_tail()
+
+    def _emit_tail(self):
+        if self._tail_timer is not None:
+            self._tail_timer.cancel()
+            self._tail_timer = None
+        usable = len(self._buffer) & ~1
+        if usable and self._speaker is not None:
+            self._frames.put_nowait((self._epoch, self._speaker, bytes(self._buffer[:usable])))
+        self._buffer.clear()
+
+    def is_playing(self) -> bool:
+        """True while frames are pending or the client is still playing what was sent."""
+        return bool(self._buffer) or not self._frames.empty() or self._play_clock > time.monotonic()
+
+    def clear(self) -> int:
+        """Barge-in: drop everything not yet sent and restart the playback timeline. Returns frames dropped."""
+        if self._tail_timer is not None:
+            self._tail_timer.cancel()
+            self._tail_timer = None
+        dropped = self._frames.qsize() + (1 if self._buffer else 0)
+        self._buffer.clear()
+        while not self._frames.empty():
+            self._frames.get_nowait()
+        self._space.set()
+        self._epoch += 1
+        self._speaker = None
+        self._play_clock = 0.0
+        self._stats["clears"] += 1
+        self._stats["clearedFrames"] += dropped
+        return dropped
+
+    def _encode(self, speaker: str, frame: bytes) -> bytes:
+        if self.encode is not None:
+            started = time.perf_counter()
+            frame = self.encode(frame)
+            self._stats["encodeSec"] += time.perf_counter() - started
+        if not self.header:
+            return frame
+        timestamp = int((self._play_clock - self._started_at) * self.sample_rate) & 0xFFFFFFFF
+        head = DOWNLINK_HEADER.pack(
+            DOWNLINK_MAGIC,
+            DOWNLINK_VERSION,
+            SPEAKER_IDS.get(speaker, 0),
+            self._seq & 0xFFFFFFFF,
+            timestamp,
+        )
+        return head + frame
+
+    async def _pace_loop(self):
+        while True:
+            epoch, speaker, frame = await self._frames.get()
+            if self._frames.qsize() < self.max_frames:
+                self._space.set()
+            if epoch != self._epoch:
+                continue
+            now = time.monotonic()
+            if self._play_clock < now:
+                # Client playback has drained: restart the timeline at "now".
+                if self._play_clock > 0:
+                    self._stats["clockResets"] += 1
+                self._play_clock = now
+            wait = self._play_clock - self.lead_sec - now
+            if wait > 0 and not self.passthrough:
+                await asyncio.sleep(wait)
+                if epoch != self._epoch:
+                    self._stats["clearedFrames"] += 1
+                    continue
+            payload = self._encode(speaker, frame)
+            try:
+                await self.send_bytes(payload)
+            except Exception as e:
+                if not self._send_failed:
+                    self.log(f"[Downlink] send failed: {e}")
+                self._send_failed = True
+            self._seq += 1
+            self._play_clock += len(frame) / self.bytes_per_sec
+            self._stats["frames"] += 1
+            self._stats["bytes"] += len(payload)
+
+    def snapshot(self) -> dict:
+        elapsed = max(1e-6, time.monotonic() - self._started_at)
+        out = dict(self._stats)
+        out["elapsedSec"] = round(elapsed, 1)
+        out["messagesPerSec"] = round(out["frames"] / elapsed, 2)
+        out["bytesPerSec"] = round(out["bytes"] / elapsed, 1)
+        out["inputChunksPerSec"] = round(out["inputChunks"] / elapsed, 2)
+        out["queuedFrames"] = self._frames.qsize()
+        out["encodeSec"] = round(out["encodeSec"], 3)
+        out["backpressureSec"] = round(out["backpressureSec"], 3)
+        out["compression"] = round(out["inputBytes"] / out["bytes"], 2) if out["bytes"] else 0.0
+        return out
+
+    def format_line(self) -> str:
+        s = self.snapshot()
+        return (
+            f"frames={s['frames']} ({s['messagesPerSec']}/s) from {s['inputChunks']} chunks "
+            f"({s['inputChunksPerSec']}/s), {s['bytesPerSec']} B/s, compression={s['compression']}x, "
+            f"encode={s['encodeSec']}s, clock_resets={s['clockResets']}, backpressure={s['backpressureSec']}s, "
+            f"clears={s['clears']} ({s['clearedFrames']} frames dropped)"
+        )
+
+    async def close(self):
+        self._closed = True
+        self._space.set()
+        if self._tail_timer is not None:
+            self._tail_timer.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
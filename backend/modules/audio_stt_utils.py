@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import azure.cognitiveservices.speech as speechsdk
 
 
@@ -26,3 +28,88 @@ def create_recognizer(
         )
     recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
     return recognizer
+
+
+_SILENCE_BUFFERS: dict[int, bytes] = {}
+
+
+def silence_pcm(seconds: float, sample_rate: int = 24000) -> bytes:
+    """Shared, immutable PCM16 silence; every session writes the same object."""
+    nbytes = int(seconds * sample_rate) * 2
+    buf = _SILENCE_BUFFERS.get(nbytes)
+    if buf is None:
+        buf = _SILENCE_BUFFERS.setdefault(nbytes, bytes(nbytes))
+    return buf
+
+
+class AiSttFlushScheduler:
+    """Writes trailing silence into an AI push stream once its audio has gone quiet.
+
+    Azure only finalizes the last segment after it hears silence. Each audio write just
+    stamps a time; one call_later deadline per stream is armed on the first write and, if
+    it fires early, re-arms for the remainder. Idle sessions schedule nothing.
+    """
+
+    def __init__(
+        self,
+        streams: dict,
+        silence_after_sec: float = 1.2,
+        silence_sec: float = 1.0,
+        sample_rate: int = 24000,
+        log=print,
+    ):
+        self.streams = dict(streams)
+        self.silence_after_sec = max(0.0, float(silence_after_sec))
+        self.silence = silence_pcm(silence_sec, sample_rate)
+        self.log = log
+        self._last_write = {name: 0.0 for name in self.streams}
+        self._pending = {name: False for name in self.streams}
+        self._handles: dict[str, asyncio.TimerHandle] = {}
+        self.stats = {"idleFlushes": 0, "turnFlushes": 0, "rearms": 0, "errors": 0}
+
+    def note_write(self, name: str):
+        if name not in self.streams:
+            return
+        loop = asyncio.get_running_loop()
+        self._last_write[name] = loop.time()
+        self._pending[name] = True
+        if name not in self._handles:
+            self._handles[name] = loop.call_later(self.silence_after_sec, self._on_deadline, name)
+
+    def _on_deadline(self, name: str):
+        self._handles.pop(name, None)
+        loop = asyncio.get_running_loop()
+        remaining = self._last_write[name] + self.silence_after_sec - loop.time()
+        if remaining > 0:
+            self.stats["rearms"] += 1
+            self._handles[name] = loop.call_later(remaining, self._on_deadline, name)
+            return
+        if self._pending[name]:
+            self.stats["idleFlushes"] += 1
+            self._write_silence(name)
+
+    def flush_now(self, name: str):
+        """Turn ended: push silence immediately instead of waiting for the idle deadline."""
+        if name not in self.streams:
+            return
+        handle = self._handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        self.stats["turnFlushes"] += 1
+        self._write_silence(name)
+
+    def _write_silence(self, name: str):
+        self._pending[name] = False
+        future = asyncio.get_running_loop().run_in_executor(None, self.streams[name].write, self.silence)
+        future.add_done_callback(self._on_write_done)
+
+    def _on_write_done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.stats["errors"] += 1
+            if self.stats["errors"] == 1:
+                self.log(f"[STT] silence flush failed: {future.exception()}")
+
+    def close(self):
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+
+
+LIVE_CONTEXT_HEADER = "[LIVE_CONTEXT_UPDATE]"
+# Static notices that carry no new information once a persona has seen them.
+GUARD_NOTICE_TAGS = ("[INTENT:location_guard]", "[INTENT:location_context]")
+_KIND_RE = re.compile(r"\[((?:INTENT:)?[A-Za-z_]+)\]")
+
+# Rough Live API accounting: audio is billed at 32 tokens/s in both directions, images at 258 tokens.
+AUDIO_TOKENS_PER_SEC = 32
+IMAGE_TOKENS = 258
+
+
+def estimate_text_tokens(text: str) -> int:
+    text = str(text or "")
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    # Hangul averages well under two characters per token; ASCII close to four.
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+class ContextBudgetManager:
+    """Keeps what is appended to each persona's Gemini context lean, and estimates its size.
+
+    A live session cannot retract content, so the budget is enforced at send time: repeated
+    guard notices are dropped, an unchanged [LIVE_CONTEXT_UPDATE] becomes a one-line reference to
+    the block already in context, and a changed block of the same kind is numbered and marked
+    as superseding the earlier one. Server-side context_window_compression (sliding window) is
+    what actually bounds the context; the token estimate mirrors it so the logs stay meaningful.
+    """
+
+    def __init__(
+        self,
+        compression: bool = True,
+        trigger_tokens: int = 32000,
+        target_tokens: int = 16000,
+        guard_ttl_sec: float = 600.0,
+        log=print,
+    ):
+        self.compression = bool(compression)
+        self.trigger_tokens = max(1, int(trigger_tokens))
+        self.target_tokens = max(1, min(int(target_tokens), self.trigger_tokens))
+        self.guard_ttl_sec = float(guard_ttl_sec)
+        self.log = log
+        self._personas: dict[str, dict] = {}
+
+    def compression_config(self) -> dict | None:
+        if not self.compression:
+            return None
+        return {
+            "trigger_tokens": self.trigger_tokens,
+            "sliding_window": {"target_tokens": self.target_tokens},
+        }
+
+    def _state(self, name: str) -> dict:
+        state = self._personas.get(name)
+        if state is None:
+            state = self._personas[name] = {
+                "tokens": 0,
+                "seq": 0,
+                "blocks": {},
+                "guards": {},
+                "stats": {
+                    "sessions": 0,
+                    "contextItems": 0,
+                    "guardsDropped": 0,
+                    "blocksReferenced": 0,
+                    "blocksSuperseded": 0,
+                    "tokensSaved": 0,
+                    "compressions": 0,
+                    "peakTokens": 0,
+                },
+            }
+        return state
+
+    def reset(self, name: str, system_instruction: str = ""):
+        """A new Gemini session starts with an empty context (reconnects included)."""
+        state = self._state(name)
+        state["blocks"].clear()
+        state["guards"].clear()
+        state["seq"] = 0
+        state["tokens"] = 0
+        state["stats"]["sessions"] += 1
+        self._add_tokens(state, estimate_text_tokens(system_instruction))
+
+    def _add_tokens(self, state: dict, tokens: int):
+        state["tokens"] += max(0, int(tokens))
+        stats = state["stats"]
+        stats["peakTokens"] = max(stats["peakTokens"], state["tokens"])
+        if self.compression and state["tokens"] > self.trigger_tokens:
+            state["tokens"] = self.target_tokens
+            stats["compressions"] += 1
+            # The sliding window may have evicted earlier blocks: never reference them again.
+            state["blocks"].clear()
+            state["guards"].clear()
+
+    def record_audio(self, name: str, pcm_bytes: int, sample_rate: int):
+        sec = max(0, int(pcm_bytes)) / (2 * int(sample_rate))
+        self._add_tokens(self._state(name), sec * AUDIO_TOKENS_PER_SEC)
+
+    def record_image(self, name: str):
+        self._add_tokens(self._state(name), IMAGE_TOKENS)
+
+    def record_text(self, name: str, text: str):
+        self._add_tokens(self._state(name), estimate_text_tokens(text))
+
+    def filter_context(self, name: str, text: str, complete_turn: bool) -> str | None:
+        """Returns the text to send for a context item, or None when it can be dropped."""
+        state = self._state(name)
+        stats = state["stats"]
+        stats["contextItems"] += 1
+        text = str(text or "")
+        body = text[len(LIVE_CONTEXT_HEADER):] if text.startswith(LIVE_CONTEXT_HEADER) else text
+
+        guard = next((tag for tag in GUARD_NOTICE_TAGS if tag in body), None)
+        if guard is not None and not complete_turn:
+            digest = hashlib.blake2b(body.encode("utf-8"), digest_size=8).digest()
+            now = time.monotonic()
+            if now - state["guards"].get(digest, float("-inf")) < self.guard_ttl_sec:
+                stats["guardsDropped"] += 1
+                stats["tokensSaved"] += estimate_text_tokens(text)
+                return None
+            state["guards"][digest] = now
+            self.record_text(name, text)
+            return text
+
+        if not text.startswith(LIVE_CONTEXT_HEADER):
+            self.record_text(name, text)
+            return text
+
+        match = _KIND_RE.search(body)
+        kind = match.group(1) if match else "general"
+        digest = hashlib.blake2b(body.encode("utf-8"), digest_size=8).digest()
+        previous = state["blocks"].get(kind)
+        if previous is not None and previous[1] == digest:
+            out = f"{LIVE_CONTEXT_HEADER} #{previous[0]} ({kind}) is unchanged; use it for the current answer."
+            stats["blocksReferenced"] += 1
+            stats["tokensSaved"] += max(0, estimate_text_tokens(text) - estimate_text_tokens(out))
+            self.record_text(name, out)
+            return out
+
+        state["seq"] += 1
+        seq = state["seq"]
+        note = f" #{seq}"
+        if previous is not None:
+            note += f" (supersedes #{previous[0]}; ignore #{previous[0]})"
+            stats["blocksSuperseded"] += 1
+        state["blocks"][kind] = (seq, digest)
+        out = LIVE_CONTEXT_HEADER + note + body
+        self.record_text(name, out)
+        return out
+
+    def estimated_tokens(self, name: str) -> int:
+        return int(self._state(name)["tokens"])
+
+    def snapshot(self) -> dict:
+        return {
+            name: dict(state["stats"], estimatedTokens=int(state["tokens"]))
+            for name, state in self._personas.items()
+        }
@@ -7,6 +7,8 @@ import urllib.parse
 import urllib.request
 from typing import Any, Callable
 
+from .turn_deadline import fetch_budget_left, fetch_timeout
+
 
 class ContextRuntimeService:
     def __init__(
@@ -48,12 +50,13 @@ class ContextRuntimeService:
         for attempt in range(3):
             try:
                 req = urllib.request.Request(url, method="GET")
-                with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
+                with urllib.request.urlopen(req, timeout=fetch_timeout(timeout), context=ctx) as resp:
                     body = resp.read().decode("utf-8", errors="ignore")
                     return json.loads(body)
             except Exception as e:
-                if attempt == 2:
-                    self.log(f"[SeoulInfo] HTTP error after 3 attempts: {e}")
+                if attempt == 2 or not fetch_budget_left():
+                    self.log(f"[SeoulInfo] HTTP error after {attempt + 1} attempts: {e}")
+                    break
                 time.sleep(0.5)
         return None
 
@@ -66,12 +69,13 @@ class ContextRuntimeService:
         for attempt in range(3):
             try:
                 req = urllib.request.Request(url, method="GET", headers=headers or {})
-                with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
+                with urllib.request.urlopen(req, timeout=fetch_timeout(timeout), context=ctx) as resp:
                     body = resp.read().decode("utf-8", errors="ignore")
                     return json.loads(body)
             except Exception as e:
-                if attempt == 2:
-                    self.log(f"[SeoulInfo] HTTP error after 3 attempts: {e}")
+                if attempt == 2 or not fetch_budget_left():
+                    self.log(f"[SeoulInfo] HTTP error after {attempt + 1} attempts: {e}")
+                    break
                 time.sleep(0.5)
         return None
 
@@ -4,23 +4,104 @@ import re
 from typing import Callable
 
 
+# Matched against the lowercased, whitespace-free utterance.
+FAST_TIMER_CANCEL_KEYS = ("지금말해", "바로말해", "바로", "지금", "취소", "그만", "중지")
+FAST_AIR_QUALITY_KEYS = ("미세먼지", "초미세", "대기질", "aqi")
+FAST_WEATHER_KEYS = ("날씨", "기온", "강수", "비와", "비와?", "덥", "춥")
+FAST_RESTAURANT_KEYS = ("맛집", "음식점", "식당", "밥집", "점심", "저녁", "먹을만한", "restaurant", "food")
+FAST_NEWS_KEYS = ("뉴스", "헤드라인", "기사")
+FAST_SCHEDULE_KEYS = ("시간표", "운행일정", "운행시간", "첫차", "막차")
+# "A랑 B 알려줘": only utterances with a conjunction are split into several intents.
+FAST_COMPOUND_KEYS = ("랑", "하고", "그리고", "및", "and")
+FAST_KEY_GROUPS = {
+    "fast:timer_cancel": FAST_TIMER_CANCEL_KEYS,
+    "fast:air_quality": FAST_AIR_QUALITY_KEYS,
+    "fast:weather": FAST_WEATHER_KEYS,
+    "fast:restaurant": FAST_RESTAURANT_KEYS,
+    "fast:news": FAST_NEWS_KEYS,
+    "fast:schedule": FAST_SCHEDULE_KEYS,
+    "fast:compound": FAST_COMPOUND_KEYS,
+}
+ROUTE_WORDS = ("길", "경로", "가는")
+TIMER_PATTERN = re.compile(r"(\d{1,3})\s*(초|분|시간)\s*(뒤|후)")
+_CLAUSE_SPLIT = re.compile(r"(?:이랑|랑|하고|그리고|및|,)\s+|\s+(?:그리고|및|and)\s+")
+# Precedence of the single-intent checks below; a compound clause is classified the same way.
+_FAST_DATA_TAGS = (
+    ("fast:air_quality", "air_quality"),
+    ("fast:weather", "weather"),
+    ("fast:restaurant", "restaurant"),
+    ("fast:news", "news"),
+)
+_TRANSIT_INTENTS = {"subway_route", "commute_overview"}
+
+
+def split_compound_clauses(text: str) -> list[str]:
+    return [c.strip() for c in _CLAUSE_SPLIT.split(str(text or "")) if c and c.strip()]
+
+
+def _clause_intent(
+    clause: str,
+    arrival_eta_query_checker: Callable[[str], bool],
+    destination_extractor: Callable[[str], str | None],
+) -> dict | None:
+    norm = re.sub(r"\s+", "", clause.lower())
+    for tag, intent in _FAST_DATA_TAGS:
+        if any(k in norm for k in FAST_KEY_GROUPS[tag]):
+            return {"intent": intent, "destination": None}
+    if arrival_eta_query_checker(clause):
+        return {"intent": "subway_route", "destination": destination_extractor(clause)}
+    if any(w in clause for w in ROUTE_WORDS):
+        return {"intent": "commute_overview", "destination": destination_extractor(clause)}
+    return None
+
+
+def _compound_intents(
+    t: str,
+    arrival_eta_query_checker: Callable[[str], bool],
+    destination_extractor: Callable[[str], str | None],
+) -> list[dict]:
+    """One intent per clause, in spoken order; a conjunction inside a single request is not a compound."""
+    clauses = split_compound_clauses(t)
+    if len(clauses) < 2:
+        return []
+    intents: list[dict] = []
+    seen: set[str] = set()
+    for clause in clauses:
+        item = _clause_intent(clause, arrival_eta_query_checker, destination_extractor)
+        if item is None or item["intent"] in seen:
+            continue
+        # One transit leg per turn: the live summary only carries one destination.
+        if item["intent"] in _TRANSIT_INTENTS and seen & _TRANSIT_INTENTS:
+            continue
+        seen.add(item["intent"])
+        intents.append(item)
+    return intents
+
+
 def fast_route_intent(
     text: str,
     active_timer: bool = False,
     destination_extractor: Callable[[str], str | None] | None = None,
     arrival_eta_query_checker: Callable[[str], bool] | None = None,
+    features=None,
 ) -> dict | None:
     t = str(text or "").strip()
     if not t:
         return None
-    norm = re.sub(r"\s+", "", t.lower())
     destination_extractor = destination_extractor or (lambda _text: None)
     arrival_eta_query_checker = arrival_eta_query_checker or (lambda _text: False)
+    if features is not None:
+        has = features.has
+    else:
+        norm = re.sub(r"\s+", "", t.lower())
 
-    if active_timer and any(k in norm for k in ["지금말해", "바로말해", "바로", "지금", "취소", "그만", "중지"]):
+        def has(tag: str) -> bool:
+            return any(k in norm for k in FAST_KEY_GROUPS[tag])
+
+    if active_timer and has("fast:timer_cancel"):
         return {"intent": "timer_cancel", "destination": None, "source": "fast", "home_update": False, "timer_seconds": None}
 
-    timer_match = re.search(r"(\d{1,3})\s*(초|분|시간)\s*(뒤|후)", t)
+    timer_match = features.timer_match if features is not None else TIMER_PATTERN.search(t)
     if timer_match:
         n = int(timer_match.group(1))
         unit = timer_match.group(2)
@@ -28,22 +109,33 @@ def fast_route_intent(
         if 5 <= sec <= 21600:
             return {"intent": "timer", "destination": None, "source": "fast", "home_update": False, "timer_seconds": sec}
 
-    if any(k in norm for k in ["미세먼지", "초미세", "대기질", "aqi"]):
+    if has("fast:compound"):
+        intents = _compound_intents(t, arrival_eta_query_checker, destination_extractor)
+        if len(intents) > 1:
+            return {
+                "intent": intents[0]["intent"],
+                "destination": intents[0]["destination"],
+                "source": "fast",
+                "home_update": False,
+                "timer_seconds": None,
+                "intents": intents,
+            }
+
+    if has("fast:air_quality"):
         return {"intent": "air_quality", "destination": None, "source": "fast", "home_update": False, "timer_seconds": None}
 
-    if any(k in norm for k in ["날씨", "기온", "강수", "비와", "비와?", "덥", "춥"]):
+    if has("fast:weather"):
         return {"intent": "weather", "destination": None, "source": "fast", "home_update": False, "timer_seconds": None}
 
-    if any(k in norm for k in ["맛집", "음식점", "식당", "밥집", "점심", "저녁", "먹을만한", "restaurant", "food"]):
+    if has("fast:restaurant"):
         return {"intent": "restaurant", "destination": None, "source": "fast", "home_update": False, "timer_seconds": None}
 
-    if any(k in norm for k in ["뉴스", "헤드라인", "기사"]):
+    if has("fast:news"):
         return {"intent": "news", "destination": None, "source": "fast", "home_update": False, "timer_seconds": None}
 
-    if arrival_eta_query_checker(t):
-        return {"intent": "subway_route", "destination": destination_extractor(t), "source": "fast", "home_update": False, "timer_seconds": None}
-
-    if any(k in norm for k in ["시간표", "운행일정", "운행시간", "첫차", "막차"]):
-        return {"intent": "subway_route", "destination": destination_extractor(t), "source": "fast", "home_update": False, "timer_seconds": None}
+    is_arrival = features.is_arrival_eta if features is not None else arrival_eta_query_checker(t)
+    if is_arrival or has("fast:schedule"):
+        destination = features.destination if features is not None else destination_extractor(t)
+        return {"intent": "subway_route", "destination": destination, "source": "fast", "home_update": False, "timer_seconds": None}
 
     return None
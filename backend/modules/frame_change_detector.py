@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+
+import numpy as np
+from PIL import Image
+
+
+def dhash(jpeg: bytes, hash_size: int = 8) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size grayscale thumbnail."""
+    with Image.open(io.BytesIO(jpeg)) as img:
+        # JPEG draft mode decodes at 1/2..1/8 scale straight from the DCT, far cheaper than a full decode.
+        img.draft("L", (hash_size * 8, hash_size * 8))
+        thumb = img.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    px = np.asarray(thumb, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class FrameChangeDetector:
+    """Decides whether a camera frame is worth sending to Gemini.
+
+    Frames nearly identical to the last sent one (dHash Hamming distance below
+    `min_distance`) are suppressed. The send interval slides between `min_interval_sec`
+    (lots of motion) and `max_interval_sec` (static scene) with an EMA of frame-to-frame change.
+    """
+
+    def __init__(
+        self,
+        min_interval_sec: float = 1.0,
+        max_interval_sec: float = 4.0,
+        min_distance: int = 6,
+        keepalive_sec: float = 30.0,
+        motion_ref: float = 0.25,
+        hash_size: int = 8,
+    ):
+        self.min_interval_sec = float(min_interval_sec)
+        self.max_interval_sec = max(self.min_interval_sec, float(max_interval_sec))
+        self.min_distance = int(min_distance)
+        self.keepalive_sec = float(keepalive_sec)
+        self.motion_ref = max(1e-6, float(motion_ref))
+        self.hash_size = int(hash_size)
+        self.hash_bits = self.hash_size * self.hash_size
+        self.reset()
+        self._stats = {"hashed": 0, "sent": 0, "suppressed": 0, "hashErrors": 0, "hashSec": 0.0}
+
+    def reset(self):
+        self._last_sent_hash: int | None = None
+        self._last_sent_ts = 0.0
+        self._prev_hash: int | None = None
+        self.motion = 1.0
+
+    def current_interval(self) -> float:
+        level = min(1.0, self.motion / self.motion_ref)
+        return self.max_interval_sec - (self.max_interval_sec - self.min_interval_sec) * level
+
+    async def should_send(self, jpeg: bytes, now_ts: float | None = None) -> bool:
+        now_ts = float(now_ts if now_ts is not None else time.monotonic())
+        started = time.perf_counter()
+        try:
+            frame_hash = await asyncio.to_thread(dhash, bytes(jpeg), self.hash_size)
+        except Exception:
+            # Undecodable frame: let Gemini see it rather than silently dropping the camera.
+            self._stats["hashErrors"] += 1
+            return True
+        self._stats["hashSec"] += time.perf_counter() - started
+        self._stats["hashed"] += 1
+        if self._prev_hash is not None:
+            change = (frame_hash ^ self._prev_hash).bit_count() / self.hash_bits
+            self.motion = 0.6 * self.motion + 0.4 * change
+        self._prev_hash = frame_hash
+
+        if (
+            self._last_sent_hash is not None
+            and (frame_hash ^ self._last_sent_hash).bit_count() < self.min_distance
+            and now_ts - self._last_sent_ts < self.keepalive_sec
+        ):
+            self._stats["suppressed"] += 1
+            return False
+        self._last_sent_hash = frame_hash
+        self._last_sent_ts = now_ts
+        self._stats["sent"] += 1
+        return True
+
+    def stats(self) -> dict:
+        out = dict(self._stats)
+        out["hashSec"] = round(out["hashSec"], 3)
+        out["motion"] = round(self.motion, 3)
+        out["intervalSec"] = round(self.current_interval(), 2)
+        return out
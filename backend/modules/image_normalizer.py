@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+
+class ImageNormalizer:
+    """Downscales images to `max_long_edge` and re-encodes them as JPEG before they reach Gemini.
+
+    Decode/resize/encode runs on a small dedicated pool shared by all sessions, so a burst of
+    large photo uploads queues up instead of starving the default executor. Images already
+    within the size limit keep their original bytes unless re-encoding makes them smaller.
+    """
+
+    def __init__(self, max_long_edge: int = 768, jpeg_quality: int = 80, max_workers: int = 2, log=print):
+        self.max_long_edge = max(16, int(max_long_edge))
+        self.jpeg_quality = min(95, max(10, int(jpeg_quality)))
+        self.log = log
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="img-norm")
+        self._stats = {"images": 0, "normalized": 0, "errors": 0, "inputBytes": 0, "outputBytes": 0, "normalizeSec": 0.0}
+
+    def _normalize_sync(self, data: bytes) -> bytes:
+        edge = self.max_long_edge
+        with Image.open(io.BytesIO(data)) as img:
+            # Lets the JPEG decoder scale down by 1/2..1/8 on the fly when the source is much larger.
+            img.draft("RGB", (edge, edge))
+            img = ImageOps.exif_transpose(img)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            resized = max(img.size) > edge
+            img.thumbnail((edge, edge), Image.Resampling.BILINEAR, reducing_gap=2.0)
+            out = io.BytesIO()
+            img.save(out, "JPEG", quality=self.jpeg_quality)
+        encoded = out.getvalue()
+        return encoded if resized or len(encoded) < len(data) else data
+
+    async def normalize(self, image_bytes) -> bytes:
+        data = bytes(image_bytes or b"")
+        if not data:
+            return data
+        started = time.perf_counter()
+        try:
+            out = await asyncio.get_running_loop().run_in_executor(self._executor, self._normalize_sync, data)
+        except Exception as e:
+            self._stats["errors"] += 1
+            if self._stats["errors"] == 1 or self._stats["errors"] % 20 == 0:
+                self.log(f"[Image] normalize failed, sending original: {e}")
+            out = data
+        self._stats["normalizeSec"] += time.perf_counter() - started
+        self._stats["images"] += 1
+        self._stats["inputBytes"] += len(data)
+        self._stats["outputBytes"] += len(out)
+        if out is not data:
+            self._stats["normalized"] += 1
+        return out
+
+    def stats(self) -> dict:
+        out = dict(self._stats)
+        images = max(1, out["images"])
+        out["avgBytesSaved"] = round((out["inputBytes"] - out["outputBytes"]) / images, 1)
+        out["avgNormalizeMs"] = round(out["normalizeSec"] * 1000 / images, 2)
+        out["normalizeSec"] = round(out["normalizeSec"], 3)
+        return out
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# Utterances whose meaning depends on "now" may route differently a few minutes later.
+_RELATIVE_TIME_TOKENS = (
+    "지금", "방금", "아까", "이따", "곧", "오늘", "내일", "모레", "어제", "이번", "다음",
+    "아침", "점심", "저녁", "밤", "주말", "분 뒤", "분 후", "분뒤", "분후", "시간 뒤", "시간 후",
+)
+_ROUTE_FIELDS = ("intent", "destination", "home_update", "timer_seconds", "intents")
+
+
+class IntentRouteCache:
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_sec: float = 600.0,
+        relative_ttl_sec: float = 30.0,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_sec = float(ttl_sec)
+        self.relative_ttl_sec = float(relative_ttl_sec)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, bool], tuple[float, dict]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"[\s\W_]+", "", str(text or "").lower())
+
+    def _ttl_for(self, text: str) -> float:
+        t = str(text or "")
+        if any(k in t for k in _RELATIVE_TIME_TOKENS):
+            return self.relative_ttl_sec
+        return self.ttl_sec
+
+    def get(self, text: str, active_timer: bool = False) -> dict | None:
+        key = (self.normalize(text), bool(active_timer))
+        if not key[0]:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, route = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(route)
+
+    def put(self, text: str, active_timer: bool, route: dict):
+        key = (self.normalize(text), bool(active_timer))
+        if not key[0] or not isinstance(route, dict):
+            return
+        ttl = self._ttl_for(text)
+        if ttl <= 0:
+            return
+        stored = {k: route.get(k) for k in _ROUTE_FIELDS}
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, stored)
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+        lookups = out["hits"] + out["misses"]
+        out["hitRate"] = round(out["hits"] / lookups, 4) if lookups else 0.0
+        # Every hit is an Azure OpenAI completion that was not issued.
+        out["llmCallsSaved"] = out["hits"]
+        return out
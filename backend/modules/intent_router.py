@@ -1,11 +1,36 @@
+import asyncio
 import json
 import re
+import threading
+import time
 from typing import Callable, Optional
 
-from openai import AzureOpenAI
+import httpx
+from openai import AsyncAzureOpenAI, AzureOpenAI, DefaultAsyncHttpxClient
+
+from .fast_intent_router import TIMER_PATTERN
+from .partial_json import PartialJsonObjectScanner
+
+
+FALLBACK_KEY_GROUPS = {
+    "fallback:timer_hint": ("말걸어", "알려줘", "알림", "깨워", "리마인드", "다시 말", "다시말", "브리핑"),
+    "fallback:timer_cancel_now": ("지금", "바로", "지금 말", "지금 알려", "지금 해", "바로 해"),
+    "fallback:timer_cancel": ("타이머 취소", "알림 취소", "타이머 꺼", "알림 꺼", "취소해", "취소", "해제", "그만"),
+    "fallback:news": ("뉴스", "헤드라인", "속보", "기사"),
+    "fallback:subway": ("지하철", "역", "방면", "열차", "몇 분"),
+    "fallback:bus": ("버스", "정류장"),
+    "fallback:weather": ("날씨", "비", "기온"),
+    "fallback:air_quality": ("대기질", "미세먼지", "aqi"),
+    "fallback:restaurant_en": ("restaurant", "food", "lunch", "dinner"),
+    "fallback:restaurant_ko": ("맛집", "음식점", "식당", "밥집", "먹을", "먹을만한", "추천해줘"),
+}
 
 
 class IntentRouter:
+    DATA_BACKED_INTENTS = {"subway_route", "bus_route", "commute_overview", "weather", "air_quality", "restaurant", "news"}
+    TRANSIT_INTENTS = {"subway_route", "bus_route", "commute_overview"}
+    LLM_SOURCES = {"llm", "llm_stream", "llm_cache"}
+
     def __init__(
         self,
         api_key: str | None,
@@ -13,10 +38,23 @@ class IntentRouter:
         api_version: str | None,
         model: str,
         destination_extractor: Optional[Callable[[str], str | None]] = None,
+        budget_sec: float = 1.2,
+        latency_stats=None,
+        streaming: bool = False,
+        route_cache=None,
+        route_log_path: str | None = None,
     ):
         self.client = None
+        self.async_client = None
         self.model = model
         self.destination_extractor = destination_extractor or (lambda _text: None)
+        self.budget_sec = float(budget_sec)
+        self.latency_stats = latency_stats
+        self.streaming = bool(streaming)
+        self.route_cache = route_cache
+        # (text, llm intent) pairs for retraining the n-gram classifier tier offline.
+        self.route_log_path = str(route_log_path or "").strip() or None
+        self._route_log_lock = threading.Lock()
 
         if not api_key or not endpoint:
             print("[IntentRouter] Azure OpenAI credentials missing. Fallback routing only.")
@@ -35,21 +73,31 @@ class IntentRouter:
             if api_version:
                 kwargs["api_version"] = api_version
             self.client = AzureOpenAI(**kwargs)
+            # One keep-alive pool shared by every session so routing skips the TLS handshake.
+            self.async_client = AsyncAzureOpenAI(
+                **kwargs,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0),
+                ),
+            )
             print("[IntentRouter] Azure OpenAI router initialized.")
         except Exception as e:
             print(f"[IntentRouter] init failed: {e}")
             self.client = None
+            self.async_client = None
 
-    def _extract_timer_seconds(self, text: str):
+    def _extract_timer_seconds(self, text: str, features=None):
         t = str(text or "").strip()
         if not t:
             return None
-        has_timer_intent = any(
-            k in t for k in ["말걸어", "알려줘", "알림", "깨워", "리마인드", "다시 말", "다시말", "브리핑"]
-        )
+        if features is not None:
+            has_timer_intent = features.has("fallback:timer_hint")
+        else:
+            has_timer_intent = any(k in t for k in FALLBACK_KEY_GROUPS["fallback:timer_hint"])
         if not has_timer_intent:
             return None
-        m = re.search(r"(\d{1,3})\s*(초|분|시간)\s*(뒤|후)", t)
+        m = features.timer_match if features is not None else TIMER_PATTERN.search(t)
         if not m:
             return None
         n = int(m.group(1))
@@ -59,9 +107,23 @@ class IntentRouter:
             return None
         return sec
 
-    def _fallback(self, text: str, active_timer: bool = False):
+    def _fallback(self, text: str, active_timer: bool = False, features=None, default_intent: str = "commute_overview"):
         t = str(text or "")
-        if active_timer and any(k in t for k in ["지금", "바로", "지금 말", "지금 알려", "지금 해", "바로 해"]):
+        if features is not None:
+            has = features.has
+
+            def destination():
+                return features.destination
+        else:
+
+            def has(tag: str) -> bool:
+                view = t.lower() if tag == "fallback:restaurant_en" else t
+                return any(k in view for k in FALLBACK_KEY_GROUPS[tag])
+
+            def destination():
+                return self.destination_extractor(t)
+
+        if active_timer and has("fallback:timer_cancel_now"):
             return {
                 "intent": "timer_cancel",
                 "destination": None,
@@ -69,7 +131,7 @@ class IntentRouter:
                 "home_update": False,
                 "timer_seconds": None,
             }
-        if any(k in t for k in ["타이머 취소", "알림 취소", "타이머 꺼", "알림 꺼", "취소해", "취소", "해제", "그만"]):
+        if has("fallback:timer_cancel"):
             return {
                 "intent": "timer_cancel",
                 "destination": None,
@@ -77,7 +139,7 @@ class IntentRouter:
                 "home_update": False,
                 "timer_seconds": None,
             }
-        timer_sec = self._extract_timer_seconds(t)
+        timer_sec = self._extract_timer_seconds(t, features=features)
         if timer_sec is not None:
             return {
                 "intent": "timer",
@@ -86,29 +148,30 @@ class IntentRouter:
                 "home_update": False,
                 "timer_seconds": timer_sec,
             }
-        if any(k in t for k in ["뉴스", "헤드라인", "속보", "기사"]):
-            return {"intent": "news", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
-        if any(k in t for k in ["지하철", "역", "방면", "열차", "몇 분"]):
-            return {"intent": "subway_route", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
-        if any(k in t for k in ["버스", "정류장"]):
-            return {"intent": "bus_route", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
-        if any(k in t for k in ["날씨", "비", "기온"]):
-            return {"intent": "weather", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
-        if any(k in t for k in ["대기질", "미세먼지", "aqi"]):
-            return {"intent": "air_quality", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
-        if any(k in t.lower() for k in ["restaurant", "food", "lunch", "dinner"]) or any(
-            k in t for k in ["맛집", "음식점", "식당", "밥집", "먹을", "먹을만한", "추천해줘"]
-        ):
+        if has("fallback:news"):
+            return {"intent": "news", "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
+        if has("fallback:subway"):
+            return {"intent": "subway_route", "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
+        if has("fallback:bus"):
+            return {"intent": "bus_route", "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
+        if has("fallback:weather"):
+            return {"intent": "weather", "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
+        if has("fallback:air_quality"):
+            return {"intent": "air_quality", "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
+        if has("fallback:restaurant_en") or has("fallback:restaurant_ko"):
             return {"intent": "restaurant", "destination": None, "source": "fallback", "home_update": False, "timer_seconds": None}
-        return {"intent": "commute_overview", "destination": self.destination_extractor(t), "source": "fallback", "home_update": False, "timer_seconds": None}
+        return {"intent": default_intent, "destination": destination(), "source": "fallback", "home_update": False, "timer_seconds": None}
 
-    def route(self, text: str, active_timer: bool = False):
-        if not self.client:
-            return self._fallback(text, active_timer=active_timer)
+    def _budget_fallback(self, text: str, active_timer: bool = False, features=None):
+        """Acting before the LLM answers: a keyword hit routes as usual, anything else is conversation."""
+        result = self._fallback(text, active_timer=active_timer, features=features, default_intent="general")
+        result["source"] = "fallback_budget"
+        return result
 
-        system = (
+    def _system_prompt(self) -> str:
+        return (
             "Classify Korean commuter query intent. Return JSON only with keys: "
-            "intent, destination, home_update, timer_seconds. "
+            "intent, destination, home_update, timer_seconds, extra_intents. "
             "intent must be one of "
             "[subway_route,bus_route,weather,air_quality,restaurant,news,commute_overview,general,timer,timer_cancel]. "
             "destination should be a concise place/station name or null. "
@@ -118,6 +181,10 @@ class IntentRouter:
             "If active_timer=true and user asks to do it now/immediately (e.g., '지금 말해줘', '바로 알려줘'), "
             "classify as timer_cancel. "
             "For non-timer intents, timer_seconds must be null. "
+            "If one utterance asks for several kinds of live information (e.g., '날씨랑 집 가는 길 알려줘'), "
+            "put the first in intent/destination and the rest in extra_intents as a list of "
+            "{intent, destination} objects using only [subway_route,bus_route,weather,air_quality,restaurant,news,commute_overview]; "
+            "otherwise extra_intents must be []. "
             "home_update must be true only when the user explicitly indicates home relocation/change "
             "(e.g., moved house, changed home location, says 'my home is now ...'). "
             "CRITICAL: If home_update is true, the 'destination' key MUST be the name of the newly relocated place. "
@@ -126,44 +193,294 @@ class IntentRouter:
             "without intending to go to a specific destination, classify intent as 'general', NOT 'subway_route'."
         )
 
+    def _messages(self, text: str, active_timer: bool):
+        return [
+            {"role": "system", "content": self._system_prompt()},
+            {"role": "user", "content": f"active_timer={str(bool(active_timer)).lower()}\nuser_text={str(text or '')}"},
+        ]
+
+    def _parse_response(self, resp, text: str, active_timer: bool):
+        return self._parse_content(resp.choices[0].message.content, text, active_timer)
+
+    def _parse_content(self, content: str | None, text: str, active_timer: bool):
+        data = json.loads(content) if content else {}
+        intent = data.get("intent") if isinstance(data, dict) else None
+        destination = data.get("destination") if isinstance(data, dict) else None
+        home_update = bool(data.get("home_update")) if isinstance(data, dict) else False
+        timer_seconds = None
+        if isinstance(data, dict):
+            raw_timer = data.get("timer_seconds")
+            try:
+                timer_seconds = int(raw_timer) if raw_timer is not None else None
+            except Exception:
+                timer_seconds = None
+
+        if intent not in {"subway_route", "bus_route", "weather", "air_quality", "restaurant", "news", "commute_overview", "general", "timer", "timer_cancel"}:
+            return self._fallback(text, active_timer=active_timer)
+
+        if intent == "timer" and (timer_seconds is None or timer_seconds < 5 or timer_seconds > 21600):
+            timer_seconds = self._extract_timer_seconds(text)
+
+        result = {
+            "intent": intent,
+            "destination": destination,
+            "source": "llm",
+            "home_update": home_update,
+            "timer_seconds": timer_seconds,
+        }
+        intents = self._parse_extra_intents(intent, destination, data.get("extra_intents") if isinstance(data, dict) else None)
+        if intents:
+            result["intents"] = intents
+        if self.route_cache is not None:
+            self.route_cache.put(text, active_timer, result)
+        self._log_route(text, active_timer, result)
+        return result
+
+    def _parse_extra_intents(self, intent: str, destination, extra) -> list[dict] | None:
+        if intent not in self.DATA_BACKED_INTENTS or not isinstance(extra, list):
+            return None
+        intents = [{"intent": intent, "destination": destination}]
+        seen = {intent}
+        for item in extra:
+            extra_intent = item.get("intent") if isinstance(item, dict) else None
+            if extra_intent not in self.DATA_BACKED_INTENTS or extra_intent in seen:
+                continue
+            # One transit leg per turn: the live summary only carries one destination.
+            if extra_intent in self.TRANSIT_INTENTS and seen & self.TRANSIT_INTENTS:
+                continue
+            seen.add(extra_intent)
+            intents.append({"intent": extra_intent, "destination": item.get("destination")})
+        return intents if len(intents) > 1 else None
+
+    def _log_route(self, text: str, active_timer: bool, result: dict):
+        if not self.route_log_path:
+            return
+        line = json.dumps(
+            {
+                "ts": int(time.time()),
+                "text": str(text or ""),
+                "active_timer": bool(active_timer),
+                "intent": result.get("intent"),
+                "destination": result.get("destination"),
+            },
+            ensure_ascii=False,
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            self._append_route_log(line)
+        else:
+            # route_async/route_hedged parse on the event loop: keep file I/O off it.
+            loop.run_in_executor(None, self._append_route_log, line)
+
+    def _append_route_log(self, line: str):
+        try:
+            with self._route_log_lock:
+                with open(self.route_log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except Exception as e:
+            print(f"[IntentRouter] route log write failed: {e}")
+
+    def _cached_route(self, text: str, active_timer: bool):
+        if self.route_cache is None:
+            return None
+        cached = self.route_cache.get(text, active_timer=active_timer)
+        if cached is None:
+            return None
+        cached["source"] = "llm_cache"
+        return cached
+
+    def _on_route_error(self, e: Exception, text: str, active_timer: bool):
+        print(f"[IntentRouter] route failed: {e}")
+        if "DeploymentNotFound" in str(e):
+            print("[IntentRouter] Disabling Azure router due to missing deployment. Using fallback routing.")
+            self.client = None
+            self.async_client = None
+        return self._fallback(text, active_timer=active_timer)
+
+    def _record(self, path: str, started_at: float):
+        if self.latency_stats is not None:
+            self.latency_stats.record(path, time.monotonic() - started_at)
+
+    def route(self, text: str, active_timer: bool = False):
+        if not self.client:
+            return self._fallback(text, active_timer=active_timer)
+
+        started_at = time.monotonic()
+        cached = self._cached_route(text, active_timer)
+        if cached is not None:
+            self._record("route:llm_cache", started_at)
+            return cached
         try:
             resp = self.client.chat.completions.create(
                 model=self.model,
                 response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": f"active_timer={str(bool(active_timer)).lower()}\nuser_text={str(text or '')}"},
-                ],
+                messages=self._messages(text, active_timer),
             )
-            content = resp.choices[0].message.content
-            data = json.loads(content) if content else {}
-            intent = data.get("intent") if isinstance(data, dict) else None
-            destination = data.get("destination") if isinstance(data, dict) else None
-            home_update = bool(data.get("home_update")) if isinstance(data, dict) else False
-            timer_seconds = None
-            if isinstance(data, dict):
-                raw_timer = data.get("timer_seconds")
-                try:
-                    timer_seconds = int(raw_timer) if raw_timer is not None else None
-                except Exception:
-                    timer_seconds = None
+            result = self._parse_response(resp, text, active_timer)
+            self._record(f"route:{result.get('source')}", started_at)
+            return result
+        except Exception as e:
+            self._record("route:error", started_at)
+            return self._on_route_error(e, text, active_timer)
 
-            if intent not in {"subway_route", "bus_route", "weather", "air_quality", "restaurant", "news", "commute_overview", "general", "timer", "timer_cancel"}:
-                return self._fallback(text, active_timer=active_timer)
+    async def route_async(self, text: str, active_timer: bool = False):
+        if not self.async_client:
+            return self._fallback(text, active_timer=active_timer)
+        try:
+            resp = await self.async_client.chat.completions.create(
+                model=self.model,
+                response_format={"type": "json_object"},
+                messages=self._messages(text, active_timer),
+            )
+            return self._parse_response(resp, text, active_timer)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return self._on_route_error(e, text, active_timer)
 
-            if intent == "timer" and (timer_seconds is None or timer_seconds < 5 or timer_seconds > 21600):
-                timer_seconds = self._extract_timer_seconds(text)
+    def _early_route(self, fields: dict):
+        intent = fields.get("intent")
+        if intent not in self.DATA_BACKED_INTENTS:
+            return None
+        if intent in self.TRANSIT_INTENTS and "destination" not in fields:
+            return None
+        return {
+            "intent": intent,
+            "destination": fields.get("destination"),
+            "source": "llm_stream",
+            "home_update": bool(fields.get("home_update")),
+            "timer_seconds": None,
+        }
 
-            return {
-                "intent": intent,
-                "destination": destination,
-                "source": "llm",
-                "home_update": home_update,
-                "timer_seconds": timer_seconds,
-            }
-        except Exception as e:
-            print(f"[IntentRouter] route failed: {e}")
-            if "DeploymentNotFound" in str(e):
-                print("[IntentRouter] Disabling Azure router due to missing deployment. Using fallback routing.")
-                self.client = None
+    async def route_streaming(
+        self,
+        text: str,
+        active_timer: bool = False,
+        on_ready: Optional[Callable[[dict], None]] = None,
+    ):
+        """Stream the completion; on_ready gets an early route as soon as the intent
+        (plus destination for transit intents) has been parsed. Returns the full route."""
+        if not self.async_client:
             return self._fallback(text, active_timer=active_timer)
+        scanner = PartialJsonObjectScanner()
+        content = []
+        ready_sent = on_ready is None
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.model,
+                response_format={"type": "json_object"},
+                messages=self._messages(text, active_timer),
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                content.append(delta)
+                if ready_sent:
+                    continue
+                try:
+                    scanner.feed(delta)
+                except ValueError:
+                    ready_sent = True
+                    continue
+                early = self._early_route(scanner.fields)
+                if early is not None:
+                    ready_sent = True
+                    on_ready(early)
+            return self._parse_content("".join(content), text, active_timer)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return self._on_route_error(e, text, active_timer)
+
+    def _late_route_disagrees(self, acted: dict, late: dict) -> bool:
+        if not isinstance(late, dict) or late.get("source") != "llm":
+            return False
+        if bool(late.get("home_update")) and not bool(acted.get("home_update")):
+            return True
+        late_intent = late.get("intent")
+        if late_intent == acted.get("intent"):
+            return False
+        if late_intent in self.DATA_BACKED_INTENTS:
+            return True
+        # A keyword guess started a data turn the LLM says is not one: let the caller call it off.
+        return acted.get("source") == "fallback_budget" and acted.get("intent") in self.DATA_BACKED_INTENTS
+
+    async def route_hedged(
+        self,
+        text: str,
+        active_timer: bool = False,
+        budget_sec: float | None = None,
+        on_late_correction: Optional[Callable[[dict, dict], None]] = None,
+        features=None,
+    ):
+        """Route within budget_sec; past the budget answer with _fallback and keep the LLM call running.
+
+        With streaming enabled the early partial route is returned as soon as it parses.
+        Either way the final LLM result is handed to on_late_correction(late, acted) only
+        when it disagrees with the route that was already acted on.
+        """
+        started_at = time.monotonic()
+        if not self.async_client:
+            result = self._fallback(text, active_timer=active_timer, features=features)
+            self._record("route:fallback", started_at)
+            return result
+        cached = self._cached_route(text, active_timer)
+        if cached is not None:
+            self._record("route:llm_cache", started_at)
+            return cached
+        budget = self.budget_sec if budget_sec is None else float(budget_sec)
+        early: asyncio.Future = asyncio.get_running_loop().create_future()
+        if self.streaming:
+
+            def _on_ready(route: dict):
+                if not early.done():
+                    early.set_result(route)
+
+            task = asyncio.ensure_future(self.route_streaming(text, active_timer=active_timer, on_ready=_on_ready))
+        else:
+            task = asyncio.ensure_future(self.route_async(text, active_timer=active_timer))
+        await asyncio.wait({task, early}, timeout=budget if budget > 0 else None, return_when=asyncio.FIRST_COMPLETED)
+
+        if task.done() and not task.cancelled() and task.exception() is None:
+            result = task.result()
+            self._record(f"route:{result.get('source')}", started_at)
+            return result
+        if early.done():
+            acted = early.result()
+            self._record("route:llm_stream", started_at)
+        else:
+            acted = self._budget_fallback(text, active_timer=active_timer, features=features)
+            self._record("route:fallback_budget", started_at)
+
+        def _on_late(done: asyncio.Future):
+            if done.cancelled() or done.exception() is not None:
+                return
+            late = done.result()
+            if acted.get("source") == "fallback_budget":
+                self._record("route:llm_late", started_at)
+            if not self._late_route_disagrees(acted, late):
+                return
+            print(
+                f"[IntentRouter] late LLM route disagrees: acted={acted.get('intent')}({acted.get('source')}), "
+                f"llm={late.get('intent')}, home_update={late.get('home_update')}, "
+                f"after={time.monotonic() - started_at:.2f}s"
+            )
+            if on_late_correction is not None:
+                try:
+                    on_late_correction(late, acted)
+                except Exception as e:
+                    print(f"[IntentRouter] late correction failed: {e}")
+
+        task.add_done_callback(_on_late)
+        return acted
+
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.close()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+
+class LatencyStats:
+    def __init__(self, window: int = 512):
+        self.window = max(1, int(window))
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, path: str, seconds: float):
+        key = str(path or "unknown")
+        with self._lock:
+            bucket = self._samples.get(key)
+            if bucket is None:
+                bucket = deque(maxlen=self.window)
+                self._samples[key] = bucket
+            bucket.append(float(seconds))
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _percentile(self, ordered: list[float], pct: float) -> float:
+        if not ordered:
+            return 0.0
+        idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            items = {k: sorted(v) for k, v in self._samples.items()}
+            counts = dict(self._counts)
+        out = {}
+        for key, ordered in items.items():
+            out[key] = {
+                "count": counts.get(key, 0),
+                "p50Ms": round(self._percentile(ordered, 50) * 1000.0, 1),
+                "p90Ms": round(self._percentile(ordered, 90) * 1000.0, 1),
+                "p99Ms": round(self._percentile(ordered, 99) * 1000.0, 1),
+                "meanMs": round((sum(ordered) / len(ordered)) * 1000.0, 1) if ordered else 0.0,
+            }
+        return out
+
+    def format_line(self, path: str) -> str:
+        row = self.snapshot().get(str(path or "unknown"))
+        if not row:
+            return f"{path}: no samples"
+        return (
+            f"{path}: n={row['count']} p50={row['p50Ms']}ms "
+            f"p90={row['p90Ms']}ms p99={row['p99Ms']}ms"
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+from .turn_deadline import TurnDeadline
+
+
+# Gemini Live function declarations for the live-data tools (LIVE_TOOL_MODE=function_calling).
+LIVE_TOOL_DECLARATIONS = [
+    {
+        "name": "get_transit_route",
+        "description": (
+            "Live Seoul public-transit guidance from the user's current location: route, "
+            "next arrivals, walking time and congestion. Use for any commute / how-to-get-there question."
+        ),
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                "destination": {
+                    "type": "STRING",
+                    "description": "Place name the user wants to go to. Omit to use the saved home destination.",
+                },
+                "mode": {
+                    "type": "STRING",
+                    "enum": ["subway", "bus", "any"],
+                    "description": "Preferred transport mode; 'any' when the user did not say.",
+                },
+            },
+        },
+    },
+    {
+        "name": "get_weather",
+        "description": "Current weather at the user's location.",
+        "parameters": {"type": "OBJECT", "properties": {}},
+    },
+    {
+        "name": "get_air_quality",
+        "description": "Current fine-dust / air-quality level at the user's location.",
+        "parameters": {"type": "OBJECT", "properties": {}},
+    },
+    {
+        "name": "get_news",
+        "description": "Latest Korean news headlines, optionally for one topic.",
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                "topic": {"type": "STRING", "description": "News topic keyword, e.g. '경제'. Omit for general news."},
+            },
+        },
+    },
+    {
+        "name": "search_restaurants",
+        "description": "Restaurants near the user's current location.",
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                "keyword": {"type": "STRING", "description": "Food or place keyword, e.g. '국밥'. Omit for any."},
+            },
+        },
+    },
+]
+
+LIVE_TOOL_INSTRUCTION = """
+[LIVE DATA TOOLS]
+- For transit, weather, air quality, news or nearby restaurant questions, CALL the matching tool first
+  and answer only from its `summary`. Never guess live data.
+- If the tool result has ok=false, say briefly that the information is unavailable right now.
+- The user's location is already known to the tools; never ask for it.
+"""
+
+_TRANSIT_MODE_INTENTS = {"subway": "subway_route", "bus": "bus_route", "any": "commute_overview"}
+
+
+class LiveToolExecutor:
+    """Runs Gemini function calls against SeoulLiveService.execute_tools_for_intent.
+
+    Both personas receive the same user audio and usually issue the same call; identical
+    (name, args) calls within `dedupe_sec` share one fetch.
+    """
+
+    def __init__(
+        self,
+        execute_tools: Callable[..., Any],
+        context_provider: Callable[[], dict],
+        budget_sec: float = 3.5,
+        optional_reserve_sec: float = 1.2,
+        dedupe_sec: float = 5.0,
+        latency_stats=None,
+        log=print,
+    ):
+        self.execute_tools = execute_tools
+        self.context_provider = context_provider
+        self.budget_sec = float(budget_sec)
+        self.optional_reserve_sec = float(optional_reserve_sec)
+        self.dedupe_sec = float(dedupe_sec)
+        self.latency_stats = latency_stats
+        self.log = log
+        self._calls: dict[str, tuple[float, asyncio.Task]] = {}
+        self._stats = {"calls": 0, "fetches": 0, "shared": 0, "errors": 0}
+
+    @staticmethod
+    def supports(name: str) -> bool:
+        return any(d["name"] == name for d in LIVE_TOOL_DECLARATIONS)
+
+    def _resolve(self, name: str, args: dict, ctx: dict) -> dict | None:
+        user_text = str(ctx.get("user_text") or "")
+        if name == "get_transit_route":
+            mode = str(args.get("mode") or "any").strip().lower()
+            destination = str(args.get("destination") or "").strip() or ctx.get("destination")
+            return {
+                "intent": _TRANSIT_MODE_INTENTS.get(mode, "commute_overview"),
+                "destination_name": destination,
+                "user_text": user_text,
+            }
+        if name == "get_weather":
+            return {"intent": "weather", "destination_name": None, "user_text": user_text}
+        if name == "get_air_quality":
+            return {"intent": "air_quality", "destination_name": None, "user_text": user_text}
+        if name == "get_news":
+            topic = str(args.get("topic") or "").strip()
+            return {"intent": "news", "destination_name": topic or None, "user_text": topic or user_text}
+        if name == "search_restaurants":
+            return {"intent": "restaurant", "destination_name": None, "user_text": str(args.get("keyword") or "").strip()}
+        return None
+
+    async def execute(self, name: str, args: dict | None) -> dict:
+        args = dict(args or {})
+        key = f"{name}:{json.dumps(args, ensure_ascii=False, sort_keys=True)}"
+        now = time.monotonic()
+        self._stats["calls"] += 1
+        for stale in [k for k, (ts, _task) in self._calls.items() if now - ts > self.dedupe_sec]:
+            del self._calls[stale]
+        entry = self._calls.get(key)
+        if entry is not None:
+            self._stats["shared"] += 1
+            self.log(f"[LiveTool] sharing in-flight result: {name}")
+            return await asyncio.shield(entry[1])
+        task = asyncio.create_task(self._run(name, args))
+        self._calls[key] = (now, task)
+        return await asyncio.shield(task)
+
+    async def _run(self, name: str, args: dict) -> dict:
+        started_at = time.monotonic()
+        ctx = self.context_provider() or {}
+        plan = self._resolve(name, args, ctx)
+        if plan is None:
+            return {"ok": False, "summary": f"Unknown tool: {name}"}
+        self._stats["fetches"] += 1
+        deadline = TurnDeadline(self.budget_sec, optional_reserve_sec=self.optional_reserve_sec, label=name, log=self.log)
+        try:
+            data = await asyncio.to_thread(
+                self.execute_tools,
+                intent=plan["intent"],
+                lat=ctx.get("lat"),
+                lng=ctx.get("lng"),
+                destination_name=plan["destination_name"],
+                env_cache=ctx.get("env_cache"),
+                user_text=plan["user_text"],
+                deadline=deadline,
+            )
+        except Exception as e:
+            self._stats["errors"] += 1
+            self.log(f"[LiveTool] {name} failed: {e}")
+            return {"ok": False, "summary": "Live data is unavailable right now."}
+        summary = str((data or {}).get("speechSummary") or "").strip() if isinstance(data, dict) else ""
+        elapsed = time.monotonic() - started_at
+        if self.latency_stats is not None:
+            self.latency_stats.record(f"tool:{name}", elapsed)
+        self.log(
+            f"[LiveTool] {name}({args}) -> intent={plan['intent']}, ok={bool(summary)}, "
+            f"elapsed={elapsed:.2f}s, skipped={deadline.skipped}, timed_out={deadline.timed_out}"
+        )
+        return {"ok": bool(summary), "summary": summary or "Live data is unavailable right now."}
+
+    def stats(self) -> dict:
+        return dict(self._stats)
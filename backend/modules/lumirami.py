@@ -7,6 +7,8 @@ from typing import Callable, Dict, Optional
 from google import genai
 from dotenv import load_dotenv
 
+from .live_tools import LIVE_TOOL_DECLARATIONS, LIVE_TOOL_INSTRUCTION
+
 load_dotenv()
 API_KEY = os.getenv("GEMINI_API_KEY")
 # MODEL_NAME = "gemini-2.0-flash-exp" # Legacy?
@@ -71,6 +73,12 @@ RAMI_INSTRUCTION = f"""
 {COMMON_INSTRUCTION}
 """
 
+# Sent as client content on barge-in: any client content interrupts the current Live API generation.
+INTERRUPT_NOTE = (
+    "[INTERRUPTED] The user started speaking, so your last reply was cut off and not heard in full. "
+    "Stop and listen; do not resume it unless asked."
+)
+
 # --- Tool Definitions (Optional, kept for strict port if needed) ---
 tools_def = [
     {
@@ -86,76 +94,138 @@ tools_def = [
 
 # --- Turn Manager (Legacy 2 Dynamic Logic) ---
 class TurnManager:
-    def __init__(self):
-        self.lock = asyncio.Lock()
+    """Single-owner turn state. Every caller runs on the session's event loop, so plain
+    attribute updates are atomic and no lock is needed on the per-audio-part path.
+
+    Silence is detected with one call_later deadline: refreshing the turn only moves
+    `last_speech_time`, and when the deadline fires early it re-arms itself for the remainder.
+    `on_silence(speaker)` runs once the current speaker has been silent for `silence_sec`.
+    """
+
+    def __init__(self, silence_sec: float = 1.5, on_silence: Optional[Callable[[str], None]] = None):
         self.current_speaker: Optional[str] = None
-        self.last_speech_time = 0
+        self.last_speech_time = 0.0
         self.waiting_for_user = False # Block AI until user speaks
+        self.silence_sec = float(silence_sec)
+        self.on_silence = on_silence
+        self._deadline: Optional[asyncio.TimerHandle] = None
         print("   >>> [TurnManager] Initialized (Dynamic).")
         
-    async def try_acquire(self, who: str) -> bool:
-        async with self.lock:
-            # If waiting for user, DENY all AI turns
-            if self.waiting_for_user:
-                return False
-
-            # If I already have the turn, keep it
-            if self.current_speaker == who:
-                self.last_speech_time = time.time()
-                return True
-            
-            # If turn is free, take it
-            if self.current_speaker is None:
-                self.current_speaker = who
-                self.last_speech_time = time.time()
-                print(f"[TurnManager] Turn acquired by {who}")
-                return True
-            
-            # Someone else has the turn
+    def try_acquire(self, who: str) -> bool:
+        # If waiting for user, DENY all AI turns
+        if self.waiting_for_user:
             return False
 
-    async def update_timestamp(self, who: str):
-        async with self.lock:
-            if self.current_speaker == who:
-                self.last_speech_time = time.time()
-
-    async def release(self, who: str):
-        async with self.lock:
-            if self.current_speaker == who:
-                self.current_speaker = None
-                print(f"[TurnManager] Turn released by {who}")
-
-    async def force_release(self):
-        async with self.lock:
-            if self.current_speaker:
-                print(f"[TurnManager] Turn FORCED released (was {self.current_speaker})")
-                self.current_speaker = None
-
-    async def set_waiting(self, enabled: bool):
-        async with self.lock:
-            if self.waiting_for_user != enabled:
-                self.waiting_for_user = enabled
-                if enabled: 
-                    print("   >>> [Logic] Entering WAIT_FOR_USER mode. AI will be silent.")
-                else: 
-                    print("   >>> [Logic] Exiting WAIT_FOR_USER mode.")
-
-    async def set_user_turn(self):
+        # If I already have the turn, keep it
+        if self.current_speaker == who:
+            self.last_speech_time = time.monotonic()
+            return True
+        
+        # If turn is free, take it
+        if self.current_speaker is None:
+            self.current_speaker = who
+            self.last_speech_time = time.monotonic()
+            self._arm_deadline(self.silence_sec)
+            print(f"[TurnManager] Turn acquired by {who}")
+            return True
+        
+        # Someone else has the turn
+        return False
+
+    def update_timestamp(self, who: str):
+        if self.current_speaker == who:
+            self.last_speech_time = time.monotonic()
+
+    def _arm_deadline(self, delay: float):
+        if self._deadline is not None:
+            self._deadline.cancel()
+        self._deadline = asyncio.get_running_loop().call_later(max(0.0, delay), self._on_deadline)
+
+    def _on_deadline(self):
+        self._deadline = None
+        current = self.current_speaker
+        if current is None:
+            return
+        remaining = self.last_speech_time + self.silence_sec - time.monotonic()
+        if remaining > 0:
+            self._arm_deadline(remaining)
+            return
+        if self.on_silence is not None:
+            self.on_silence(current)
+
+    def _clear(self):
+        self.current_speaker = None
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    def release(self, who: str):
+        if self.current_speaker == who:
+            self._clear()
+            print(f"[TurnManager] Turn released by {who}")
+
+    def force_release(self):
+        if self.current_speaker:
+            print(f"[TurnManager] Turn FORCED released (was {self.current_speaker})")
+            self._clear()
+
+    def set_waiting(self, enabled: bool):
+        if self.waiting_for_user != enabled:
+            self.waiting_for_user = enabled
+            if enabled: 
+                print("   >>> [Logic] Entering WAIT_FOR_USER mode. AI will be silent.")
+            else: 
+                print("   >>> [Logic] Exiting WAIT_FOR_USER mode.")
+
+    def set_user_turn(self):
         """Called when user speaks to break the wait"""
-        async with self.lock:
-            # Force release AI to let user speak freely
-            self.current_speaker = None 
-            if self.waiting_for_user:
-                print("   >>> [Logic] User detected! Breaking infinite wait.")
-                self.waiting_for_user = False
+        # Force release AI to let user speak freely
+        self._clear()
+        if self.waiting_for_user:
+            print("   >>> [Logic] User detected! Breaking infinite wait.")
+            self.waiting_for_user = False
+
+    def close(self):
+        self._clear()
 
 # --- Manager Class (Merged) ---
 class LumiRamiManager:
-    def __init__(self, ws_send_func: Callable[[bytes, str], None], flush_stt_func: Callable[[str], None] = None):
+    def __init__(
+        self,
+        ws_send_func: Callable[[bytes, str], None],
+        flush_stt_func: Callable[[str], None] = None,
+        tool_executor=None,
+        audio_coalesce_ms: int = 100,
+        context_budget=None,
+        peer_settle_sec: float = 0.8,
+        spawn: Optional[Callable] = None,
+    ):
         self.ws_send = ws_send_func
         self.flush_stt = flush_stt_func
-        self.turn_manager = TurnManager()
+        # LiveToolExecutor: when set, live-data tools are declared to Gemini (LIVE_TOOL_MODE=function_calling).
+        self.tool_executor = tool_executor
+        # ContextBudgetManager: dedupes context items per persona and tracks estimated context tokens.
+        self.context_budget = context_budget
+        # Mic chunks already queued are merged into one realtime_input up to this much 16kHz PCM16 audio.
+        self.audio_coalesce_bytes = max(0, int(audio_coalesce_ms)) * 16000 * 2 // 1000
+        self.uplink_stats = {
+            name: {"audioItems": 0, "audioMessages": 0, "audioBytes": 0} for name in ("lumi", "rami")
+        }
+        # Task factory (SessionSupervisor.spawn): persona and tool tasks get an owner that awaits them.
+        self._spawn_func = spawn
+        self._tasks: set = set()
+        self.turn_manager = TurnManager(silence_sec=1.5, on_silence=self._on_turn_silence)
         self.running = False
+        # Peer transcripts are buffered per AI turn; after the turn ends, late STT segments
+        # (flushed by the trailing silence) get `peer_settle_sec` to arrive before one injection.
+        self.peer_settle_sec = max(0.0, float(peer_settle_sec))
+        self._peer_pending = {"speaker": None, "segments": [], "turn_done": False}
+        self._peer_flush_timer: Optional[asyncio.TimerHandle] = None
+        self.peer_stats = {"segments": 0, "injections": 0, "replyTurns": 0}
+        # Barge-in: personas with a generation in flight, and those muted until it ends.
+        self._generating: set[str] = set()
+        self._interrupted: set[str] = set()
+        self.interrupt_stats = {"interrupts": 0, "droppedParts": 0}
         
         # Legacy State
         self.last_ai_speaker = "lumi" 
@@ -183,29 +253,65 @@ class LumiRamiManager:
              print("[Error] No GEMINI_API_KEY")
              return
         
-        asyncio.create_task(self._run_persona("lumi"))
-        asyncio.create_task(self._run_persona("rami"))
-        asyncio.create_task(self._auto_release_task())
+        self._spawn(self._run_persona("lumi"), "persona:lumi")
+        self._spawn(self._run_persona("rami"), "persona:rami")
+
+    def _spawn(self, coro, label: str):
+        task = self._spawn_func(coro, label) if self._spawn_func else asyncio.create_task(coro)
+        if task is not None:
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return task
 
     async def stop(self):
         self.running = False
         print("[LumiRami] Stopping...")
-
-    async def _auto_release_task(self):
-        """Watchdog to release turns if silence for too long (Legacy Logic)"""
-        while self.running:
-            await asyncio.sleep(0.1)
-            async with self.turn_manager.lock:
-                current = self.turn_manager.current_speaker
-                last = self.turn_manager.last_speech_time
-            
-            if current:
-                # If silence > 1.5s (Legacy Tuned), assume turn over
-                if time.time() - last > 1.5:
-                    # [Legacy logic with Fix]
-                    # print(f"[LumiRami] Silence detected for {current}. Force releasing.")
-                    if self.flush_stt: await self.flush_stt(current) 
-                    await self.turn_manager.force_release()
+        self.turn_manager.close()
+        # Personas may be parked in queue.get()/session.receive(); cancelling also closes their Gemini connection.
+        for task in list(self._tasks):
+            task.cancel()
+        if self._peer_flush_timer is not None:
+            self._peer_flush_timer.cancel()
+            self._peer_flush_timer = None
+        print(
+            f"[LumiRami] peer transcripts: {self.peer_stats['segments']} segments -> "
+            f"{self.peer_stats['injections']} injections ({self.peer_stats['replyTurns']} reply turns)"
+        )
+        if self.interrupt_stats["interrupts"]:
+            print(f"[LumiRami] barge-in: {self.interrupt_stats}")
+        for name, stats in self.uplink_stats.items():
+            ratio = stats["audioItems"] / stats["audioMessages"] if stats["audioMessages"] else 0.0
+            print(
+                f"[LumiRami] uplink {name}: {stats['audioItems']} audio chunks -> "
+                f"{stats['audioMessages']} messages ({ratio:.1f}x), {stats['audioBytes']} bytes"
+            )
+        if self.context_budget is not None:
+            for name, stats in self.context_budget.snapshot().items():
+                print(f"[LumiRami] context {name}: {stats}")
+
+    def _coalesce_audio(self, name: str, queue: asyncio.Queue, first: bytes):
+        """Merge audio items already waiting in the queue; returns (payload, held control item)."""
+        stats = self.uplink_stats[name]
+        stats["audioItems"] += 1
+        chunks = [first]
+        size = len(first)
+        while size < self.audio_coalesce_bytes and not queue.empty():
+            item = queue.get_nowait()
+            if item[0] != "audio":
+                # Control items flush the batch; send_loop handles this one next (and marks it done).
+                return b"".join(chunks), item
+            queue.task_done()
+            chunks.append(item[1])
+            size += len(item[1])
+            stats["audioItems"] += 1
+        return (chunks[0] if len(chunks) == 1 else b"".join(chunks)), None
+
+    def _on_turn_silence(self, current: str):
+        """Silence > 1.5s (Legacy Tuned): assume the speaker's turn is over."""
+        if self.flush_stt:
+            self._spawn(self.flush_stt(current), f"flush_stt:{current}")
+        self.turn_manager.force_release()
+        self._end_peer_turn(current)
 
     async def push_audio(self, audio_data: bytes):
         # [Legacy Logic] Send to ALL AIs
@@ -230,8 +336,12 @@ class LumiRamiManager:
 
         # [Legacy Logic]
         if role == "user":
+            # Safety net: never keep a persona muted past the user's finished utterance.
+            self._interrupted.clear()
+            # The peer should know what was said before the user's new turn reaches it.
+            self._flush_peer_transcripts()
             self.ai_turn_count = 0 # Reset count
-            await self.turn_manager.set_user_turn() # Unlock
+            self.turn_manager.set_user_turn() # Unlock
             
             # Keyword Switching
             if "라미" in text or "나미" in text: 
@@ -242,22 +352,70 @@ class LumiRamiManager:
                  print(f"[LumiRami] Primary Switched to LUMI (Keyword)")
             return
 
-        # AI Turn Handling
+        # AI Turn Handling: buffer until the speaker's turn is over.
+        if self._peer_pending["speaker"] not in (None, speaker):
+            self._flush_peer_transcripts()
+        pending = self._peer_pending
+        pending["speaker"] = speaker
+        pending["segments"].append(text)
+        self.peer_stats["segments"] += 1
+        if pending["turn_done"]:
+            self._arm_peer_flush()
+
+    def interrupt(self) -> list[str]:
+        """Barge-in: mute every persona still generating and tell its session to stop. Returns them."""
+        targets = sorted(self._generating - self._interrupted)
+        for name in targets:
+            self._interrupted.add(name)
+            self.queues[name].put_nowait(("context", INTERRUPT_NOTE))
+        self.turn_manager.set_user_turn()
+        if targets:
+            self.interrupt_stats["interrupts"] += 1
+        return targets
+
+    def _end_peer_turn(self, name: str):
+        pending = self._peer_pending
+        if pending["speaker"] in (None, name):
+            pending["turn_done"] = True
+            self._arm_peer_flush()
+
+    def _arm_peer_flush(self):
+        if self._peer_flush_timer is not None:
+            self._peer_flush_timer.cancel()
+        self._peer_flush_timer = asyncio.get_running_loop().call_later(
+            self.peer_settle_sec, self._flush_peer_transcripts, True
+        )
+
+    def _flush_peer_transcripts(self, reply: bool = False):
+        """reply=True (the speaker's answer is over): one completed turn, so the peer reacts to it.
+        Otherwise (user speech, or the peer already started) it only goes in as silent context."""
+        if self._peer_flush_timer is not None:
+            self._peer_flush_timer.cancel()
+            self._peer_flush_timer = None
+        pending = self._peer_pending
+        speaker, segments = pending["speaker"], pending["segments"]
+        self._peer_pending = {"speaker": None, "segments": [], "turn_done": False}
+        if not segments or not self.running:
+            return
+
         self.ai_turn_count += 1
-        print(f"[Logic] AI Turn Count: {self.ai_turn_count}")
+        print(f"[Logic] AI Turn Count: {self.ai_turn_count} ({len(segments)} segments)")
 
-        # Inject to Peer
-        message = f"[System] Peer({speaker}) said: \"{text}\""
+        # Inject to Peer: one item per AI turn instead of one per STT segment.
+        message = f"[System] Peer({speaker}) said: \"{' '.join(segments)}\""
         
         # Infinite Loop Prevention
-        if self.ai_turn_count >= 3:
+        if reply and self.ai_turn_count >= 3:
             print("[Logic] Max AI turns reached! Forcing User Inclusion.")
             message += "\n\n[SYSTEM INSTRUCTION] STOP debating. SUMMARIZE and ASK USER."
-            await self.turn_manager.set_waiting(True)
+            self.turn_manager.set_waiting(True)
             
         for name, q in self.queues.items():
             if name != speaker and name != "ai": 
-                await q.put(("text", message))
+                q.put_nowait(("text" if reply else "context", message))
+        self.peer_stats["injections"] += 1
+        if reply:
+            self.peer_stats["replyTurns"] += 1
 
     async def handle_multimodal_input(self, text: str, image_bytes: bytes = None):
         """Processes text and optional image payload from the frontend directly into Gemini"""
@@ -265,7 +423,7 @@ class LumiRamiManager:
         
         # 1. Reset user turns (same as voice STT)
         self.ai_turn_count = 0
-        await self.turn_manager.set_user_turn()
+        self.turn_manager.set_user_turn()
         
         # 2. Push image via realtimeInput first if attached (Live API Requirement)
         if image_bytes:
@@ -290,6 +448,11 @@ class LumiRamiManager:
             full_instruction += f"\n\n[REMEMBERED MEMORY from Past Conversations]:\n{self.memory_context[name]}"
             print(f"[{name}] Injected Long-Term Memory ({len(self.memory_context[name])} chars).")
 
+        tools = tools_def
+        if self.tool_executor is not None:
+            full_instruction += f"\n{LIVE_TOOL_INSTRUCTION}"
+            tools = [{"function_declarations": tools_def[0]["function_declarations"] + LIVE_TOOL_DECLARATIONS}]
+
         # [Config Fix] Use Strict Dict Structure from Stable version
         config = {
             "response_modalities": ["AUDIO"],
@@ -297,28 +460,52 @@ class LumiRamiManager:
                 "voice_config": {"prebuilt_voice_config": {"voice_name": config_data["voice"]}}
             },
             "system_instruction": {"parts": [{"text": full_instruction}]}, 
-            "tools": tools_def 
+            "tools": tools 
         }
+        if self.context_budget is not None and self.context_budget.compression_config():
+            config["context_window_compression"] = self.context_budget.compression_config()
 
         while self.running:
             try:
                 print(f"[{name}] Connecting...")
                 async with client.aio.live.connect(model=MODEL_NAME, config=config) as session:
                     print(f"[{name}] Connected!")
+                    budget = self.context_budget
+                    if budget is not None:
+                        budget.reset(name, full_instruction)
+                    self._generating.discard(name)
+                    self._interrupted.discard(name)
                     
                     async def send_loop():
                         print(f"[{name}] Send Loop Started")
+                        held = None
                         while self.running:
                             try:
                                 try:
-                                    item = await my_queue.get()
+                                    if held is not None:
+                                        item, held = held, None
+                                    else:
+                                        item = await my_queue.get()
                                     source, content = item # "audio"/"text"
+                                    if source in ("context", "text") and budget is not None:
+                                        filtered = budget.filter_context(name, content, complete_turn=source == "text")
+                                        if filtered is None:
+                                            print(f"[{name}] Skipping duplicate CTX: {content[:30]}...")
+                                            source = "dropped"
+                                        content = filtered
                                     
                                     # [Legacy Type Handling]
                                     if source == "audio":
+                                        content, held = self._coalesce_audio(name, my_queue, content)
+                                        self.uplink_stats[name]["audioMessages"] += 1
+                                        self.uplink_stats[name]["audioBytes"] += len(content)
+                                        if budget is not None:
+                                            budget.record_audio(name, len(content), 16000)
                                         await session.send_realtime_input(audio={"data": content, "mime_type": "audio/pcm;rate=16000"})
                                     elif source == "image":
                                         print(f"[{name}] Sending IMAGE via realtime_input...")
+                                        if budget is not None:
+                                            budget.record_image(name)
                                         await session.send_realtime_input(media={"data": content, "mime_type": "image/jpeg"})
                                     elif source == "context":
                                         print(f"[{name}] Sending SILENT CTX: {content[:30]}...")
@@ -334,25 +521,27 @@ class LumiRamiManager:
                                         )
                                     elif source == "turns":
                                         print(f"[{name}] Sending TURNS CTX...")
+                                        if budget is not None:
+                                            for turn in content:
+                                                for part in turn.get("parts", []):
+                                                    if "inline_data" in part:
+                                                        budget.record_image(name)
+                                                    else:
+                                                        budget.record_text(name, part.get("text", ""))
                                         await session.send_client_content(
                                             turns=content,
                                             turn_complete=True
                                         )
                                     elif source == "TOOL_RESPONSE":
                                         print(f"[{name}] Sending TOOL_RESPONSE")
+                                        if budget is not None:
+                                            budget.record_text(name, json.dumps(content, ensure_ascii=False))
                                         from google.genai import types
-                                        parts = []
-                                        for f in content["function_responses"]:
-                                            fc_resp = types.FunctionResponse(
-                                                id=f["id"],
-                                                name=f["name"],
-                                                response=f["response"]
-                                            )
-                                            parts.append(types.Part(function_response=fc_resp))
-                                        
-                                        await session.send_client_content(
-                                            turns=[{"role": "user", "parts": parts}],
-                                            turn_complete=True
+                                        await session.send_tool_response(
+                                            function_responses=[
+                                                types.FunctionResponse(id=f["id"], name=f["name"], response=f["response"])
+                                                for f in content["function_responses"]
+                                            ]
                                         )
                                     
                                     my_queue.task_done()
@@ -377,24 +566,39 @@ class LumiRamiManager:
                                     if response.server_content and response.server_content.model_turn:
                                         for part in response.server_content.model_turn.parts:
                                             if part.inline_data:
+                                                if budget is not None:
+                                                    # Generated audio stays in context whether or not it is played.
+                                                    budget.record_audio(name, len(part.inline_data.data or b""), 24000)
+                                                if name in self._interrupted:
+                                                    # Tail of a barged-in generation: nobody should hear it.
+                                                    self.interrupt_stats["droppedParts"] += 1
+                                                    continue
+                                                self._generating.add(name)
                                                 # [Legacy Logic] Double-Speak Check
                                                 if self.ai_turn_count == 0 and name != self.primary_speaker:
                                                     continue # Respect Primary
 
                                                 # [Legacy Logic] Turn Acquisition
-                                                if await self.turn_manager.try_acquire(name):
+                                                if self.turn_manager.try_acquire(name):
                                                     self.last_ai_speaker = name
-                                                    await self.turn_manager.update_timestamp(name)
                                                     await self.ws_send(part.inline_data.data, name)
                                     
+                                    if response.server_content and (
+                                        response.server_content.turn_complete or response.server_content.interrupted
+                                    ):
+                                        self._generating.discard(name)
+                                        self._interrupted.discard(name)
+
                                     # 2. Turn Complete Signal (New Fit)
                                     if response.server_content and response.server_content.turn_complete:
                                          if self.current_speaker_is(name):
                                              if self.flush_stt: await self.flush_stt(name)
+                                             self._end_peer_turn(name)
                                     
                                     # 3. Tool Call
                                     if response.tool_call:
-                                        await self._handle_tool_call(session, response.tool_call, my_queue)
+                                        # Live-data tools can take seconds; keep receiving audio meanwhile.
+                                        self._spawn(self._handle_tool_call(session, response.tool_call, my_queue), f"tool_call:{name}")
 
                                 print(f"[{name}] Iterator ended (Natural). Re-entering loop...")
                                 
@@ -420,11 +624,23 @@ class LumiRamiManager:
         # Helper for check
         return self.turn_manager.current_speaker == name
 
+    async def _run_tool(self, fc) -> dict:
+        if self.tool_executor is not None and self.tool_executor.supports(fc.name):
+            try:
+                return await self.tool_executor.execute(fc.name, fc.args or {})
+            except Exception as e:
+                print(f"   >>> [Tool] {fc.name} failed: {e}")
+                return {"ok": False, "summary": "Live data is unavailable right now."}
+        return {"result": "success", "message": "Tool executed"}
+
     async def _handle_tool_call(self, session, tool_call, queue):
         print(f"   >>> [Tool] Gemini Request: {tool_call}")
-        function_responses = []
-        for fc in tool_call.function_calls:
+        calls = list(tool_call.function_calls or [])
+        for fc in calls:
             print(f"      Call: {fc.name}({fc.args})")
-            result = {"result": "success", "message": "Tool executed"}
-            function_responses.append({"id": fc.id, "name": fc.name, "response": result})
+        results = await asyncio.gather(*[self._run_tool(fc) for fc in calls])
+        function_responses = [
+            {"id": fc.id, "name": fc.name, "response": result}
+            for fc, result in zip(calls, results)
+        ]
         await queue.put(("TOOL_RESPONSE", {"function_responses": function_responses}))
@@ -11,6 +11,12 @@ from typing import List, Optional, Tuple
 
 import json
 
+try:
+    from .turn_deadline import fetch_timeout
+except ImportError:  # run directly: python news_agent.py
+    def fetch_timeout(default: float) -> float:
+        return default
+
 
 class NewsConfig:
     """
@@ -207,7 +213,7 @@ class NewsAgent(BaseModule):
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=5)
+            response = requests.get(url, headers=headers, timeout=fetch_timeout(5))
             
             if response.status_code != 200:
                 logging.warning(f"[NewsAgent] ⚠️ Naver API Error: {response.status_code} - {response.text[:100]}")
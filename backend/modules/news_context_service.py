@@ -2,6 +2,44 @@ import re
 from typing import Any
 
 
+NEWS_DETAIL_KEYWORDS = (
+    "자세히",
+    "상세",
+    "무슨 내용",
+    "어떤 내용",
+    "디테일",
+    "요약",
+    "더 알려",
+    "더 말해",
+    "그 기사",
+    "그 뉴스",
+    "첫 기사",
+    "첫 뉴스",
+    "1번",
+    "2번",
+    "3번",
+    "첫번째",
+    "두번째",
+    "세번째",
+    "관련 뉴스",
+)
+NEWS_FOLLOWUP_KEYWORDS = (
+    "그럼",
+    "그건",
+    "왜",
+    "언제",
+    "누가",
+    "어디",
+    "어떻게",
+    "무슨 의미",
+    "영향",
+    "결과",
+    "정리",
+    "다시 설명",
+    "추가로",
+)
+
+
 class NewsContextService:
     def __init__(self, news_agent=None, log=print):
         self.news_agent = news_agent
@@ -59,53 +97,21 @@ class NewsContextService:
                 headlines.append(title)
         return headlines
 
-    def is_detail_query(self, text: str | None) -> bool:
+    def is_detail_query(self, text: str | None, features=None) -> bool:
+        if features is not None:
+            return features.has("news_detail")
         t = str(text or "").strip().lower()
         if not t:
             return False
-        keys = [
-            "자세히",
-            "상세",
-            "무슨 내용",
-            "어떤 내용",
-            "디테일",
-            "요약",
-            "더 알려",
-            "더 말해",
-            "그 기사",
-            "그 뉴스",
-            "첫 기사",
-            "첫 뉴스",
-            "1번",
-            "2번",
-            "3번",
-            "첫번째",
-            "두번째",
-            "세번째",
-            "관련 뉴스",
-        ]
-        return any(k in t for k in keys)
+        return any(k in t for k in NEWS_DETAIL_KEYWORDS)
 
-    def is_followup_query(self, text: str | None) -> bool:
+    def is_followup_query(self, text: str | None, features=None) -> bool:
+        if features is not None:
+            return features.has("news_followup")
         t = str(text or "").strip().lower()
         if not t:
             return False
-        keys = [
-            "그럼",
-            "그건",
-            "왜",
-            "언제",
-            "누가",
-            "어디",
-            "어떻게",
-            "무슨 의미",
-            "영향",
-            "결과",
-            "정리",
-            "다시 설명",
-            "추가로",
-        ]
-        return any(k in t for k in keys)
+        return any(k in t for k in NEWS_FOLLOWUP_KEYWORDS)
 
     def select_item_by_text(self, text: str | None, items: list[dict[str, Any]]):
         t = str(text or "").strip().lower()
@@ -0,0 +1,237 @@
+"""Hashed character n-gram intent classifier: the tier between fast_route_intent and the LLM.
+
+Train / evaluate (from backend/):
+    python -m modules.ngram_intent_classifier train --data data/intent_seed_routes.jsonl \
+        --data logs/intent_routes.jsonl --out data/intent_ngram_weights.npz
+    python -m modules.ngram_intent_classifier eval --data data/intent_corpus.json \
+        --weights data/intent_ngram_weights.npz --threshold 0.85
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+import zlib
+from typing import Callable, Iterable
+
+import numpy as np
+
+
+DEFAULT_WEIGHTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "intent_ngram_weights.npz",
+)
+# Timer intents need timer_seconds / active-timer state, so they always go to the LLM.
+_DEFERRED_INTENTS = {"timer", "timer_cancel"}
+
+
+def _normalize(text: str) -> str:
+    return " " + re.sub(r"\s+", " ", str(text or "").lower()).strip() + " "
+
+
+def featurize(text: str, n_features: int, ngram_range: tuple[int, int] = (1, 3)) -> tuple[np.ndarray, np.ndarray]:
+    t = _normalize(text)
+    counts: dict[int, float] = {}
+    lo, hi = ngram_range
+    for n in range(lo, hi + 1):
+        for i in range(0, max(0, len(t) - n + 1)):
+            gram = t[i:i + n]
+            if gram.isspace():
+                continue
+            idx = zlib.crc32(gram.encode("utf-8")) % n_features
+            counts[idx] = counts.get(idx, 0.0) + 1.0
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    val = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    val /= np.sqrt(np.dot(val, val))
+    return idx, val
+
+
+class NgramIntentClassifier:
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        labels: list[str],
+        ngram_range: tuple[int, int] = (1, 3),
+        threshold: float = 0.85,
+        destination_extractor: Callable[[str], str | None] | None = None,
+    ):
+        # weights: (n_features, n_labels) so a sparse row gather is one fancy-index.
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = list(labels)
+        self.n_features = int(self.weights.shape[0])
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        self.threshold = float(threshold)
+        self.destination_extractor = destination_extractor or (lambda _text: None)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_WEIGHTS_PATH, **kwargs) -> "NgramIntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                weights=data["weights"],
+                bias=data["bias"],
+                labels=[str(x) for x in data["labels"]],
+                ngram_range=tuple(int(x) for x in data["ngram_range"]),
+                **kwargs,
+            )
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            labels=np.array(self.labels),
+            ngram_range=np.array(self.ngram_range),
+        )
+
+    def predict(self, text: str) -> tuple[str, float]:
+        idx, val = featurize(text, self.n_features, self.ngram_range)
+        logits = self.bias + (val @ self.weights[idx] if idx.size else 0.0)
+        logits = logits - logits.max()
+        probs = np.exp(logits)
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    def route(self, text: str, active_timer: bool = False) -> dict | None:
+        """Return a route only when confident; None hands the utterance to IntentRouter."""
+        if active_timer:
+            return None
+        intent, confidence = self.predict(text)
+        if confidence < self.threshold or intent in _DEFERRED_INTENTS:
+            return None
+        return {
+            "intent": intent,
+            "destination": self.destination_extractor(text) if intent != "general" else None,
+            "source": "ngram",
+            "home_update": False,
+            "timer_seconds": None,
+            "confidence": round(confidence, 4),
+        }
+
+    @classmethod
+    def train(
+        cls,
+        texts: list[str],
+        labels: list[str],
+        n_features: int = 8192,
+        ngram_range: tuple[int, int] = (1, 3),
+        epochs: int = 300,
+        lr: float = 2.0,
+        l2: float = 1e-4,
+    ) -> "NgramIntentClassifier":
+        label_names = sorted(set(labels))
+        y = np.array([label_names.index(l) for l in labels], dtype=np.int64)
+        x = np.zeros((len(texts), n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            idx, val = featurize(text, n_features, ngram_range)
+            np.add.at(x[row], idx, val)
+        w = np.zeros((n_features, len(label_names)), dtype=np.float32)
+        b = np.zeros(len(label_names), dtype=np.float32)
+        onehot = np.eye(len(label_names), dtype=np.float32)[y]
+        # Full-batch softmax regression; the logged corpus is small enough to fit in memory.
+        for _ in range(max(1, int(epochs))):
+            logits = x @ w + b
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            grad = (probs - onehot) / len(texts)
+            w -= lr * (x.T @ grad + l2 * w)
+            b -= lr * grad.sum(axis=0)
+        return cls(weights=w, bias=b, labels=label_names, ngram_range=ngram_range)
+
+
+def load_labelled_routes(paths: Iterable[str]) -> list[dict]:
+    """Read (text, intent) rows from .json lists or .jsonl route logs."""
+    rows: list[dict] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                items = [json.loads(line) for line in f if line.strip()]
+            else:
+                items = json.load(f)
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            text = str(item.get("text") or "").strip()
+            intent = str(item.get("intent") or "").strip()
+            if text and intent:
+                rows.append({"text": text, "intent": intent})
+    return rows
+
+
+def evaluate(classifier: NgramIntentClassifier, rows: list[dict]) -> dict:
+    answered = correct_answered = correct_top1 = 0
+    latencies = []
+    per_label: dict[str, dict[str, int]] = {}
+    for row in rows:
+        started = time.perf_counter()
+        intent, confidence = classifier.predict(row["text"])
+        latencies.append(time.perf_counter() - started)
+        hit = intent == row["intent"]
+        correct_top1 += int(hit)
+        bucket = per_label.setdefault(row["intent"], {"n": 0, "correct": 0})
+        bucket["n"] += 1
+        bucket["correct"] += int(hit)
+        if confidence >= classifier.threshold and intent not in _DEFERRED_INTENTS:
+            answered += 1
+            correct_answered += int(hit)
+    ordered = sorted(latencies)
+    total = max(1, len(rows))
+    return {
+        "n": len(rows),
+        "top1Accuracy": round(correct_top1 / total, 4),
+        "coverage": round(answered / total, 4),
+        "answeredAccuracy": round(correct_answered / answered, 4) if answered else 0.0,
+        "p50Us": round(ordered[len(ordered) // 2] * 1e6, 1) if ordered else 0.0,
+        "p99Us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6, 1) if ordered else 0.0,
+        "perLabel": per_label,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train / evaluate the n-gram intent classifier.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    train_p = sub.add_parser("train")
+    train_p.add_argument("--data", action="append", required=True)
+    train_p.add_argument("--out", default=DEFAULT_WEIGHTS_PATH)
+    train_p.add_argument("--features", type=int, default=8192)
+    train_p.add_argument("--epochs", type=int, default=300)
+    eval_p = sub.add_parser("eval")
+    eval_p.add_argument("--data", action="append", required=True)
+    eval_p.add_argument("--weights", default=DEFAULT_WEIGHTS_PATH)
+    eval_p.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    if args.cmd == "train":
+        rows = load_labelled_routes(args.data)
+        clf = NgramIntentClassifier.train(
+            [r["text"] for r in rows],
+            [r["intent"] for r in rows],
+            n_features=args.features,
+            epochs=args.epochs,
+        )
+        clf.save(args.out)
+        print(f"[Ngram] trained on {len(rows)} rows, labels={clf.labels}, saved={args.out}")
+        return
+
+    clf = NgramIntentClassifier.load(args.weights, threshold=args.threshold)
+    report = evaluate(clf, load_labelled_routes(args.data))
+    print(
+        f"[Ngram] n={report['n']} top1={report['top1Accuracy']:.1%} "
+        f"coverage@{args.threshold}={report['coverage']:.1%} "
+        f"answered-accuracy={report['answeredAccuracy']:.1%} "
+        f"p50={report['p50Us']}us p99={report['p99Us']}us"
+    )
+    for label, bucket in sorted(report["perLabel"].items()):
+        print(f"[Ngram]   {label:<17} {bucket['correct']}/{bucket['n']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+_DECODER = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+class PartialJsonObjectScanner:
+    """Incrementally extracts top-level fields of one streamed JSON object.
+
+    A field is reported only once its value is complete, so "tru" or a number
+    still at the end of the buffer never surfaces early. Raises ValueError when
+    the stream is not a JSON object; callers then wait for the full content.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self.closed = False
+        self.fields: dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> dict[str, Any]:
+        if self.closed or not chunk:
+            return {}
+        self._buf += chunk
+        completed: dict[str, Any] = {}
+        while not self.closed:
+            field = self._next_field()
+            if field is None:
+                break
+            key, value = field
+            self.fields[key] = value
+            completed[key] = value
+        return completed
+
+    def _skip_ws(self, i: int) -> int:
+        buf = self._buf
+        while i < len(buf) and buf[i] in _WS:
+            i += 1
+        return i
+
+    def _next_field(self):
+        buf = self._buf
+        i = self._skip_ws(self._pos)
+        if not self._started:
+            if i >= len(buf):
+                return None
+            if buf[i] != "{":
+                raise ValueError("stream is not a JSON object")
+            self._started = True
+            i = self._skip_ws(i + 1)
+        if i < len(buf) and buf[i] == ",":
+            i = self._skip_ws(i + 1)
+        self._pos = i
+        if i >= len(buf):
+            return None
+        if buf[i] == "}":
+            self.closed = True
+            self._pos = i + 1
+            return None
+        try:
+            key, j = _DECODER.raw_decode(buf, i)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(key, str):
+            raise ValueError("object key is not a string")
+        j = self._skip_ws(j)
+        if j >= len(buf):
+            return None
+        if buf[j] != ":":
+            raise ValueError("expected ':' after object key")
+        j = self._skip_ws(j + 1)
+        if j >= len(buf):
+            return None
+        try:
+            value, end = _DECODER.raw_decode(buf, j)
+        except json.JSONDecodeError:
+            return None
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and end >= len(buf):
+            # More digits may still be on the way.
+            return None
+        self._pos = end
+        return key, value
@@ -5,10 +5,28 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 
-def extract_destination_from_text(text: str) -> str | None:
+CONGESTION_KEYWORDS = (
+    "혼잡", "붐", "여유", "덜 붐비", "칸", "인파", "crowd", "congestion",
+)
+SCHEDULE_KEYWORDS = (
+    "시간표", "운행 일정", "운행일정", "운행 시간", "운행시간",
+    "첫차", "막차", "운행", "timetable", "schedule",
+)
+ARRIVAL_TRANSIT_TOKENS = ("지하철", "전철", "열차", "subway", "train", "호선", "버스")
+ARRIVAL_ETA_TOKENS = (
+    "몇 분", "몇분", "언제 와", "언제와", "도착", "남았", "어디 쯤", "어디쯤", "어디야",
+    "도착 예정", "도착예정", "다음 열차", "다음열차", "첫 열차", "첫차", "막차",
+)
+# Every destination pattern below needs at least one of these literals to match.
+DESTINATION_ANCHORS = ("까지", "로", "가려면", "가는", "방법", "약속", "쪽", "에", "경로", "역")
+
+
+def extract_destination_from_text(text: str, features=None) -> str | None:
     s = str(text or "").strip()
     if not s:
         return None
+    if features is not None and not features.has("dest_anchor"):
+        return None
 
     patterns = [
         r"([가-힣A-Za-z0-9\s]{1,30})\s*까지",
@@ -50,45 +68,49 @@ def extract_destination_from_text(text: str) -> str | None:
     return None
 
 
+def extract_station_mention(text: str | None) -> str | None:
+    t = str(text or "").strip()
+    if not t:
+        return None
+    m = re.search(r"([^\s]{2,24})\s*역", t)
+    if m:
+        return str(m.group(1)).strip() + "역"
+    return None
+
+
 def normalize_place_name(name: str | None) -> str:
     if not name:
         return ""
     return re.sub(r"\s+", "", str(name)).lower()
 
 
-def is_congestion_query(text: str) -> bool:
+def is_congestion_query(text: str, features=None) -> bool:
+    if features is not None:
+        return features.has("congestion")
     t = str(text or "").lower()
     if not t:
         return False
-    keys = [
-        "혼잡", "붐", "여유", "덜 붐비", "칸", "인파", "crowd", "congestion",
-    ]
-    return any(k in t for k in keys)
+    return any(k in t for k in CONGESTION_KEYWORDS)
 
 
-def is_schedule_query(text: str) -> bool:
+def is_schedule_query(text: str, features=None) -> bool:
+    if features is not None:
+        return features.has("schedule")
     t = str(text or "").lower()
     if not t:
         return False
-    keys = [
-        "시간표", "운행 일정", "운행일정", "운행 시간", "운행시간",
-        "첫차", "막차", "운행", "timetable", "schedule",
-    ]
-    return any(k in t for k in keys)
+    return any(k in t for k in SCHEDULE_KEYWORDS)
 
 
-def is_arrival_eta_query(text: str) -> bool:
+def is_arrival_eta_query(text: str, features=None) -> bool:
+    if features is not None:
+        return features.has("arrival_transit") and features.has("arrival_eta")
     t = str(text or "").lower()
     if not t:
         return False
     # Use exact same logic defined in AIRA_FIX_PLAN
-    transit_tokens = ["지하철", "전철", "열차", "subway", "train", "호선", "버스"]
-    eta_tokens = [
-        "몇 분", "몇분", "언제 와", "언제와", "도착", "남았", "어디 쯤", "어디쯤", "어디야",
-        "도착 예정", "도착예정", "다음 열차", "다음열차", "첫 열차", "첫차", "막차"
-    ]
-    has_transit = any(k in t for k in transit_tokens)
-    has_eta = any(k in t for k in eta_tokens)
+    has_transit = any(k in t for k in ARRIVAL_TRANSIT_TOKENS)
+    has_eta = any(k in t for k in ARRIVAL_ETA_TOKENS)
     return has_transit and has_eta
 
 
@@ -1,6 +1,23 @@
 import math
 import time
-from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .turn_deadline import TurnDeadline
+
+
+# One job per intent of a compound turn; each job's own fetches still go through TurnDeadline's pool.
+_INTENT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="intent-tools")
+_TRANSIT_INTENTS = {"subway_route", "bus_route", "commute_overview"}
+_INTENT_LABELS = {
+    "subway_route": "지하철",
+    "bus_route": "버스",
+    "commute_overview": "길찾기",
+    "weather": "날씨",
+    "air_quality": "대기질",
+    "restaurant": "음식점",
+    "news": "뉴스",
+}
 
 
 class SeoulLiveService:
@@ -38,7 +55,10 @@ class SeoulLiveService:
         destination_name: str | None,
         env_cache: dict | None = None,
         user_text: str | None = None,
+        deadline: TurnDeadline | None = None,
+        on_route_ready: Callable[[dict[str, Any]], None] | None = None,
     ):
+        deadline = deadline or TurnDeadline.unbounded()
         if intent == "news":
             topic = ""
             if self.extract_news_topic:
@@ -48,7 +68,7 @@ class SeoulLiveService:
 
             news_items = []
             if self.get_news_items:
-                news_items = self.get_news_items(topic=topic, limit=3) or []
+                news_items = deadline.call("news_items", self.get_news_items, topic=topic, limit=3, default=[]) or []
 
             headlines = []
             if news_items:
@@ -121,7 +141,15 @@ class SeoulLiveService:
             if use_cache:
                 restaurants = [x for x in cache_rows if isinstance(x, dict)]
             elif self.search_restaurants:
-                restaurants = self.search_restaurants(lat, lng, keyword, 5) or []
+                restaurants = deadline.call(
+                    "restaurants",
+                    self.search_restaurants,
+                    lat,
+                    lng,
+                    keyword,
+                    5,
+                    default=[],
+                ) or []
                 if isinstance(cache_bucket, dict):
                     cache_bucket["restaurant"] = {
                         "lat": float(lat),
@@ -174,8 +202,14 @@ class SeoulLiveService:
                 if isinstance(cache_air, dict):
                     air = cache_air
             elif lat is not None and lng is not None:
-                weather, air = self.get_weather_and_air(lat, lng)
-                if isinstance(env_cache, dict):
+                weather, air = deadline.call(
+                    "weather_air",
+                    self.get_weather_and_air,
+                    lat,
+                    lng,
+                    default=({}, {}),
+                )
+                if isinstance(env_cache, dict) and (weather or air):
                     env_cache["weather"] = weather or {}
                     env_cache["air"] = air or {}
                     env_cache["lat"] = lat
@@ -257,6 +291,9 @@ class SeoulLiveService:
             prefer_subway=prefer_subway,
             detailed_subway=detailed_subway,
             user_text=user_text,
+            deadline=deadline,
+            # bus_route rewrites the summary from fields, so only pass-through intents stream early.
+            on_route_ready=on_route_ready if intent in {"subway_route", "commute_overview"} else None,
         )
         if not isinstance(live, dict):
             return None
@@ -283,3 +320,74 @@ class SeoulLiveService:
         merged = " ".join([p for p in parts if p]).strip()
         live["speechSummary"] = merged or str(live.get("speechSummary", ""))
         return live
+
+    def execute_tools_for_intents(
+        self,
+        intents: list[dict],
+        lat: float | None,
+        lng: float | None,
+        destination_name: str | None,
+        env_cache: dict | None = None,
+        user_text: str | None = None,
+        deadline: TurnDeadline | None = None,
+    ):
+        """Run every intent of a compound turn concurrently and merge them into one live context.
+
+        `intents` is [{"intent", "destination"}, ...], primary first. Fields of the primary
+        result win on merge; speechSummary joins one labelled part per intent.
+        """
+        deadline = deadline or TurnDeadline.unbounded()
+        jobs: list[list[dict]] = []
+        env_job: list[dict] = []
+        for item in intents:
+            # weather and air_quality share one fetch: run them back to back so the second hits env_cache.
+            if item.get("intent") in {"weather", "air_quality"}:
+                if not env_job:
+                    jobs.append(env_job)
+                env_job.append(item)
+            else:
+                jobs.append([item])
+
+        def _run(job: list[dict]) -> list[tuple[dict, Any]]:
+            out = []
+            for item in job:
+                try:
+                    data = self.execute_tools_for_intent(
+                        intent=item.get("intent"),
+                        lat=lat,
+                        lng=lng,
+                        # destination_name is the session's transit default; other intents keep their own.
+                        destination_name=item.get("destination")
+                        or (destination_name if item.get("intent") in _TRANSIT_INTENTS else None),
+                        env_cache=env_cache,
+                        user_text=user_text,
+                        deadline=deadline,
+                    )
+                except Exception as e:
+                    print(f"[SeoulInfo] compound intent failed: intent={item.get('intent')}, error={e}")
+                    data = None
+                out.append((item, data))
+            return out
+
+        futures = [_INTENT_EXECUTOR.submit(_run, job) for job in jobs]
+        results: dict[str, Any] = {}
+        for future in futures:
+            for item, data in deadline.wait("compound_intents", future, default=[]) or []:
+                results[item.get("intent")] = data
+
+        merged: dict[str, Any] = {}
+        parts = []
+        for item in reversed(intents):
+            data = results.get(item.get("intent"))
+            if isinstance(data, dict):
+                merged.update(data)
+        for item in intents:
+            intent = item.get("intent")
+            data = results.get(intent)
+            summary = str(data.get("speechSummary") or "").strip() if isinstance(data, dict) else ""
+            label = _INTENT_LABELS.get(intent, intent)
+            parts.append(f"[{label}] {summary or f'현재 {label} 정보를 받을 수 없습니다.'}")
+        merged["speechSummary"] = " ".join(parts)
+        merged["speechParts"] = parts
+        merged["intents"] = [item.get("intent") for item in intents]
+        return merged
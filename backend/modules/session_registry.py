@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import secrets
+
+
+def new_resume_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+class SessionRegistry:
+    """Process-wide table of resumable sessions, keyed by (user id, resume token).
+
+    A session registers when it issues its token and re-arms after every handoff, so it can be
+    claimed for its whole life: while parked after a disconnect, and also while its old socket
+    still looks alive (a mobile client usually reconnects before the server notices the drop).
+    claim() resolves the session's handoff future with (websocket, released); the session moves
+    onto the new socket, while the new /ws handler only waits on `released` so its connection
+    stays open until the session is done with that socket.
+    """
+
+    def __init__(self, log=print):
+        self.log = log
+        self._sessions: dict[tuple[str, str], asyncio.Future] = {}
+        self._parked: set[tuple[str, str]] = set()
+        self.stats = {"registered": 0, "parked": 0, "resumed": 0, "takeovers": 0, "expired": 0, "misses": 0}
+
+    def register(self, user_id: str, token: str) -> asyncio.Future:
+        self.stats["registered"] += 1
+        return self.arm(user_id, token)
+
+    def arm(self, user_id: str, token: str) -> asyncio.Future:
+        """New handoff future for the session; call again after each claim."""
+        key = (str(user_id), str(token))
+        previous = self._sessions.get(key)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        handoff = asyncio.get_running_loop().create_future()
+        self._sessions[key] = handoff
+        self._parked.discard(key)
+        return handoff
+
+    def park(self, user_id: str, token: str):
+        key = (str(user_id), str(token))
+        if key in self._sessions:
+            self._parked.add(key)
+            self.stats["parked"] += 1
+
+    def claim(self, user_id: str, token: str, ws) -> asyncio.Future | None:
+        """Hands `ws` to the session; returns the future resolved when that session lets go of it."""
+        key = (str(user_id), str(token))
+        handoff = self._sessions.get(key)
+        if handoff is None or handoff.done():
+            self.stats["misses"] += 1
+            return None
+        released = asyncio.get_running_loop().create_future()
+        handoff.set_result((ws, released))
+        self.stats["resumed" if key in self._parked else "takeovers"] += 1
+        self._parked.discard(key)
+        return released
+
+    def discard(self, user_id: str, token: str, expired: bool = False):
+        key = (str(user_id), str(token))
+        handoff = self._sessions.pop(key, None)
+        self._parked.discard(key)
+        if handoff is not None and not handoff.done():
+            handoff.cancel()
+        if expired:
+            self.stats["expired"] += 1
+
+    def snapshot(self) -> dict:
+        return dict(self.stats, sessions=len(self._sessions), waiting=len(self._parked))
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from typing import Awaitable, Callable
+
+# Process-wide counters; leaked* should stay at 0 and `active` should return to 0 between sessions.
+SUPERVISOR_TOTALS = {
+    "sessions": 0,
+    "active": 0,
+    "tasksSpawned": 0,
+    "tasksCancelled": 0,
+    "leakedTasks": 0,
+    "leakedResources": 0,
+    "rejectedAfterClose": 0,
+}
+
+
+class SessionSupervisor:
+    """Owns every task and closeable resource of one /ws session (TaskGroup-style).
+
+    Work is started through spawn()/submit_threadsafe() instead of bare create_task, and
+    resources register a closer. aclose() cancels all tasks while running closers in reverse
+    order, and gives the whole teardown `teardown_sec`; anything still running after that is
+    counted as leaked and reported rather than awaited forever.
+    """
+
+    def __init__(self, label: str, loop: asyncio.AbstractEventLoop, teardown_sec: float = 5.0, log=print):
+        self.label = label
+        self.loop = loop
+        self.teardown_sec = max(0.1, float(teardown_sec))
+        self.log = log
+        self._tasks: set[asyncio.Task] = set()
+        self._closers: list[tuple[str, Callable[[], object]]] = []
+        self._closed = False
+        self.stats = {"spawned": 0, "failed": 0}
+        SUPERVISOR_TOTALS["sessions"] += 1
+        SUPERVISOR_TOTALS["active"] += 1
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def spawn(self, coro: Awaitable, label: str = "task") -> asyncio.Task | None:
+        """Event-loop only."""
+        if self._closed:
+            SUPERVISOR_TOTALS["rejectedAfterClose"] += 1
+            if inspect.iscoroutine(coro):
+                coro.close()
+            return None
+        task = self.loop.create_task(coro, name=f"{self.label}:{label}")
+        self._tasks.add(task)
+        self.stats["spawned"] += 1
+        SUPERVISOR_TOTALS["tasksSpawned"] += 1
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.stats["failed"] += 1
+            self.log(f"[Supervisor] {task.get_name()} failed: {exc}")
+
+    async def _owned(self, coro: Awaitable, label: str):
+        task = asyncio.current_task()
+        if self._closed:
+            SUPERVISOR_TOTALS["rejectedAfterClose"] += 1
+            if inspect.iscoroutine(coro):
+                coro.close()
+            return None
+        self._tasks.add(task)
+        self.stats["spawned"] += 1
+        SUPERVISOR_TOTALS["tasksSpawned"] += 1
+        try:
+            return await coro
+        finally:
+            self._tasks.discard(task)
+
+    def submit_threadsafe(self, coro: Awaitable, label: str = "task"):
+        """From any thread (Azure STT callbacks); returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(self._owned(coro, label), self.loop)
+
+    def add_closer(self, label: str, close: Callable[[], object]):
+        """`close` may be sync or return an awaitable; closers run last-registered first."""
+        self._closers.append((label, close))
+
+    async def _run_closer(self, label: str, close: Callable[[], object]):
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+    async def _close_resources(self, deadline: float) -> list[str]:
+        leaked = []
+        for label, close in reversed(self._closers):
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                await asyncio.wait_for(self._run_closer(label, close), timeout=remaining)
+            except asyncio.TimeoutError:
+                leaked.append(label)
+            except Exception as e:
+                leaked.append(label)
+                self.log(f"[Supervisor] {self.label} closer {label} failed: {e}")
+        self._closers.clear()
+        return leaked
+
+    async def _cancel_tasks(self, tasks: list[asyncio.Task], deadline: float) -> list[str]:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+        return [t.get_name() for t in tasks if not t.done()]
+
+    async def aclose(self) -> dict:
+        if self._closed:
+            return {}
+        self._closed = True
+        started = time.monotonic()
+        deadline = started + self.teardown_sec
+        current = asyncio.current_task()
+        tasks = [t for t in self._tasks if t is not current and not t.done()]
+        SUPERVISOR_TOTALS["tasksCancelled"] += len(tasks)
+        # Closers do not depend on the tasks, so one stuck task cannot starve them of the deadline.
+        leaked_tasks, leaked_resources = await asyncio.gather(
+            self._cancel_tasks(tasks, deadline),
+            self._close_resources(deadline),
+        )
+
+        SUPERVISOR_TOTALS["active"] -= 1
+        SUPERVISOR_TOTALS["leakedTasks"] += len(leaked_tasks)
+        SUPERVISOR_TOTALS["leakedResources"] += len(leaked_resources)
+        report = {
+            "cancelled": len(tasks),
+            "leakedTasks": leaked_tasks,
+            "leakedResources": leaked_resources,
+            "teardownSec": round(time.monotonic() - started, 3),
+        }
+        self.log(f"[Supervisor] {self.label} teardown: {report}")
+        return report
+
+
+def supervisor_totals() -> dict:
+    return dict(SUPERVISOR_TOTALS)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+
+_SPECULATION_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speculative-fetch")
+
+
+class SpeculativePrefetcher:
+    DATA_INTENTS = {
+        "subway_route",
+        "bus_route",
+        "commute_overview",
+        "weather",
+        "air_quality",
+        "news",
+        "restaurant",
+    }
+
+    def __init__(
+        self,
+        execute_tools: Callable[..., Any],
+        stable_hits: int = 2,
+        max_age_sec: float = 10.0,
+        log=print,
+    ):
+        self.execute_tools = execute_tools
+        self.stable_hits = max(1, int(stable_hits))
+        self.max_age_sec = float(max_age_sec)
+        self.log = log
+        self._lock = threading.Lock()
+        self._candidate_key: Hashable | None = None
+        self._candidate_hits = 0
+        self._pending_key: Hashable | None = None
+        self._pending_future: Future | None = None
+        self._pending_started_at = 0.0
+        self._stats = {"started": 0, "hits": 0, "misses": 0, "cancelled": 0}
+
+    def observe(self, key: Hashable | None, intent: str | None, tool_kwargs: dict | None = None) -> bool:
+        """Feed one interim hypothesis; starts the fetch once the same key repeats."""
+        if key is None or intent not in self.DATA_INTENTS:
+            with self._lock:
+                self._candidate_key = None
+                self._candidate_hits = 0
+            return False
+        with self._lock:
+            if key == self._candidate_key:
+                self._candidate_hits += 1
+            else:
+                self._candidate_key = key
+                self._candidate_hits = 1
+            if self._candidate_hits < self.stable_hits:
+                return False
+            if key == self._pending_key and self._pending_future is not None:
+                return False
+            self._cancel_locked("superseded")
+            self._pending_key = key
+            self._pending_started_at = time.monotonic()
+            self._pending_future = _SPECULATION_EXECUTOR.submit(self.execute_tools, **dict(tool_kwargs or {}))
+            self._stats["started"] += 1
+        self.log(f"[Speculative] prefetch started: intent={intent}")
+        return True
+
+    def claim(self, key: Hashable | None) -> Future | None:
+        """Return the in-flight fetch if the final utterance confirmed it, else cancel it."""
+        with self._lock:
+            future = self._pending_future
+            pending_key = self._pending_key
+            fresh = (time.monotonic() - self._pending_started_at) <= self.max_age_sec
+            self._candidate_key = None
+            self._candidate_hits = 0
+            if future is None:
+                return None
+            if key is not None and key == pending_key and fresh and not future.cancelled():
+                self._pending_key = None
+                self._pending_future = None
+                self._stats["hits"] += 1
+                return future
+            self._stats["misses"] += 1
+            self._cancel_locked("final utterance did not confirm")
+            return None
+
+    def cancel(self, reason: str = ""):
+        with self._lock:
+            self._candidate_key = None
+            self._candidate_hits = 0
+            self._cancel_locked(reason)
+
+    def _cancel_locked(self, reason: str):
+        future = self._pending_future
+        self._pending_key = None
+        self._pending_future = None
+        if future is None:
+            return
+        # A fetch already running cannot be interrupted; its result is simply dropped.
+        future.cancel()
+        self._stats["cancelled"] += 1
+        if reason:
+            self.log(f"[Speculative] prefetch dropped: {reason}")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
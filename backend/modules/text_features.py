@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+from .conversation_text_utils import HOME_UPDATE_KEYWORDS, VISION_FOLLOWUP_HINTS, VISION_KEYWORDS
+from .fast_intent_router import FAST_KEY_GROUPS, ROUTE_WORDS, TIMER_PATTERN
+from .intent_router import FALLBACK_KEY_GROUPS
+from .news_context_service import NEWS_DETAIL_KEYWORDS, NEWS_FOLLOWUP_KEYWORDS
+from .route_text_utils import (
+    ARRIVAL_ETA_TOKENS,
+    ARRIVAL_TRANSIT_TOKENS,
+    CONGESTION_KEYWORDS,
+    DESTINATION_ANCHORS,
+    SCHEDULE_KEYWORDS,
+    extract_destination_from_text,
+)
+
+
+# Matched against text.lower() as-is (whitespace kept).
+_SPACED_GROUPS: dict[str, Iterable[str]] = {
+    "congestion": CONGESTION_KEYWORDS,
+    "schedule": SCHEDULE_KEYWORDS,
+    "arrival_transit": ARRIVAL_TRANSIT_TOKENS,
+    "arrival_eta": ARRIVAL_ETA_TOKENS,
+    "dest_anchor": DESTINATION_ANCHORS,
+    "route_words": ROUTE_WORDS,
+    "vision": VISION_KEYWORDS,
+    "vision_followup": VISION_FOLLOWUP_HINTS,
+    "home_update": HOME_UPDATE_KEYWORDS,
+    "news_detail": NEWS_DETAIL_KEYWORDS,
+    "news_followup": NEWS_FOLLOWUP_KEYWORDS,
+    **FALLBACK_KEY_GROUPS,
+}
+# Matched against the lowercased text with all whitespace removed (fast_route_intent's view).
+_COMPACT_GROUPS: dict[str, Iterable[str]] = dict(FAST_KEY_GROUPS)
+
+TAG_BITS: dict[str, int] = {
+    tag: 1 << i for i, tag in enumerate(list(_SPACED_GROUPS) + list(_COMPACT_GROUPS))
+}
+
+
+class AhoCorasick:
+    """Multi-pattern matcher compiled to a DFA: one dict lookup per input character.
+
+    Each pattern carries a bitmask; scanning ORs together the masks of every pattern
+    occurring anywhere in the text, overlaps included.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, int]]):
+        goto: list[dict[str, int]] = [{}]
+        out: list[int] = [0]
+        for pattern, bits in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(0)
+                state = nxt
+            out[state] |= bits
+
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Resolve failure transitions up front so scanning never walks the fail chain.
+            row = dict(delta[fail[state]])
+            row.update(goto[state])
+            delta[state] = row
+            out[state] |= out[fail[state]]
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+        self._delta = delta
+        self._out = out
+
+    def scan(self, text: str, skip_whitespace: bool = False) -> int:
+        delta = self._delta
+        out = self._out
+        state = 0
+        mask = 0
+        for ch in text:
+            if skip_whitespace and ch.isspace():
+                continue
+            state = delta[state].get(ch, 0)
+            mask |= out[state]
+        return mask
+
+
+def _compile(groups: dict[str, Iterable[str]]) -> AhoCorasick:
+    return AhoCorasick((keyword, TAG_BITS[tag]) for tag, keywords in groups.items() for keyword in keywords)
+
+
+_SPACED_MATCHER = _compile(_SPACED_GROUPS)
+_COMPACT_MATCHER = _compile(_COMPACT_GROUPS)
+_UNSET = object()
+
+
+class TextFeatures:
+    """Every keyword flag for one utterance, computed once and passed through the turn."""
+
+    __slots__ = ("text", "mask", "_timer_match", "_destination")
+
+    def __init__(self, text: str, mask: int):
+        self.text = text
+        self.mask = mask
+        self._timer_match = _UNSET
+        self._destination = _UNSET
+
+    def has(self, tag: str) -> bool:
+        return bool(self.mask & TAG_BITS[tag])
+
+    @property
+    def is_arrival_eta(self) -> bool:
+        return self.has("arrival_transit") and self.has("arrival_eta")
+
+    @property
+    def timer_match(self):
+        if self._timer_match is _UNSET:
+            self._timer_match = TIMER_PATTERN.search(self.text.strip())
+        return self._timer_match
+
+    @property
+    def destination(self) -> str | None:
+        if self._destination is _UNSET:
+            self._destination = extract_destination_from_text(self.text, features=self)
+        return self._destination
+
+    def tags(self) -> list[str]:
+        return [tag for tag, bit in TAG_BITS.items() if self.mask & bit]
+
+
+def extract_text_features(text: str | None) -> TextFeatures:
+    raw = str(text or "")
+    lower = raw.lower()
+    mask = _SPACED_MATCHER.scan(lower) | _COMPACT_MATCHER.scan(lower, skip_whitespace=True)
+    return TextFeatures(raw, mask)
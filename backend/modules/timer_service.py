@@ -25,6 +25,8 @@ class TimerService:
 
     async def register(self, timer_sec: int):
         task = asyncio.create_task(self._run_timer(timer_sec))
+        # Drop finished timers so a long session does not accumulate task objects.
+        self._tasks = [t for t in self._tasks if not t.done()]
         self._tasks.append(task)
 
     def has_active(self):
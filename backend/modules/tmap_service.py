@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from .turn_deadline import fetch_timeout
+
 
 class TmapService:
     _shared_congestion_cache: dict[str, dict[str, Any]] = {}
@@ -159,7 +161,7 @@ class TmapService:
             },
         )
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_sec) as resp:
+            with urllib.request.urlopen(req, timeout=fetch_timeout(self.timeout_sec)) as resp:
                 raw = resp.read().decode("utf-8", errors="ignore")
             return json.loads(raw)
         except urllib.error.HTTPError as e:
@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from .turn_deadline import fetch_timeout
+
 
 class TransitRuntimeService:
     def __init__(
@@ -28,7 +30,7 @@ class TransitRuntimeService:
     def _http_get_json(self, url: str, timeout: int = 6):
         try:
             req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
+            with urllib.request.urlopen(req, timeout=fetch_timeout(timeout)) as resp:
                 body = resp.read().decode("utf-8", errors="ignore")
                 return json.loads(body)
         except Exception as e:
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+
+# Shared by every session: fetches are blocking urllib calls, so a bounded pool
+# lets a turn stop waiting on a slow API without blocking the STT callback thread.
+# Sized by configure_fetch_pool() (TURN_FETCH_WORKERS) before the first fetch.
+_FETCH_WORKERS = 32
+_FETCH_EXECUTOR: ThreadPoolExecutor | None = None
+_FETCH_LOCK = threading.Lock()
+# Deadline of the fetch running on this worker thread; HTTP helpers clamp their timeout to it.
+_FETCH_BUDGET = threading.local()
+# queueWaitSec vs fetchSec tells a saturated pool apart from a slow upstream API.
+FETCH_POOL_STATS = {
+    "workers": _FETCH_WORKERS,
+    "submitted": 0,
+    "completed": 0,
+    "expiredInQueue": 0,
+    "timedOutQueued": 0,
+    "timedOutRunning": 0,
+    "queueWaitSec": 0.0,
+    "fetchSec": 0.0,
+}
+
+
+def configure_fetch_pool(max_workers: int):
+    global _FETCH_WORKERS
+    with _FETCH_LOCK:
+        if _FETCH_EXECUTOR is None:
+            _FETCH_WORKERS = max(1, int(max_workers))
+            FETCH_POOL_STATS["workers"] = _FETCH_WORKERS
+
+
+def _fetch_executor() -> ThreadPoolExecutor:
+    global _FETCH_EXECUTOR
+    with _FETCH_LOCK:
+        if _FETCH_EXECUTOR is None:
+            _FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="turn-fetch")
+        return _FETCH_EXECUTOR
+
+
+def fetch_timeout(default: float) -> float:
+    """HTTP timeout for a blocking call: `default`, cut to what is left of the current fetch's budget."""
+    expires_at = getattr(_FETCH_BUDGET, "expires_at", None)
+    if expires_at is None:
+        return default
+    return max(0.1, min(float(default), expires_at - time.monotonic()))
+
+
+def fetch_budget_left() -> bool:
+    """False once the fetch running on this thread is past its budget (stop retrying)."""
+    expires_at = getattr(_FETCH_BUDGET, "expires_at", None)
+    return expires_at is None or time.monotonic() < expires_at
+
+
+def fetch_pool_stats() -> dict:
+    with _FETCH_LOCK:
+        out = dict(FETCH_POOL_STATS)
+    out["queueWaitSec"] = round(out["queueWaitSec"], 3)
+    out["fetchSec"] = round(out["fetchSec"], 3)
+    return out
+
+
+def _run_budgeted(fn: Callable[..., Any], args, kwargs, submitted_at: float, expires_at: float, state: dict, default: Any):
+    started_at = time.monotonic()
+    state["started"] = True
+    with _FETCH_LOCK:
+        FETCH_POOL_STATS["queueWaitSec"] += started_at - submitted_at
+    if started_at >= expires_at:
+        # Waited out its whole budget in the queue: nobody is waiting for the result any more.
+        state["expired"] = True
+        with _FETCH_LOCK:
+            FETCH_POOL_STATS["expiredInQueue"] += 1
+        return default
+    previous = getattr(_FETCH_BUDGET, "expires_at", None)
+    _FETCH_BUDGET.expires_at = expires_at if previous is None else min(previous, expires_at)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _FETCH_BUDGET.expires_at = previous
+        with _FETCH_LOCK:
+            FETCH_POOL_STATS["completed"] += 1
+            FETCH_POOL_STATS["fetchSec"] += time.monotonic() - started_at
+
+
+class TurnDeadline:
+    def __init__(
+        self,
+        budget_sec: float,
+        optional_reserve_sec: float = 1.0,
+        label: str = "",
+        log=print,
+    ):
+        self.budget_sec = float(budget_sec)
+        self.optional_reserve_sec = max(0.0, float(optional_reserve_sec))
+        self.label = str(label or "")
+        self.log = log
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + self.budget_sec
+        self.skipped: list[str] = []
+        self.timed_out: list[str] = []
+
+    @classmethod
+    def unbounded(cls) -> "TurnDeadline":
+        return cls(budget_sec=math.inf, optional_reserve_sec=0.0, log=lambda _msg: None)
+
+    @property
+    def bounded(self) -> bool:
+        return math.isfinite(self.budget_sec)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def allows(self, optional: bool = False) -> bool:
+        reserve = self.optional_reserve_sec if optional else 0.0
+        return self.remaining() > reserve
+
+    def call(
+        self,
+        label: str,
+        fn: Callable[..., Any],
+        *args,
+        optional: bool = False,
+        default: Any = None,
+        **kwargs,
+    ) -> Any:
+        if not self.bounded:
+            return fn(*args, **kwargs)
+        if not self.allows(optional=optional):
+            self.skipped.append(label)
+            self.log(
+                f"[Deadline] skip {label}: remaining={self.remaining():.2f}s "
+                f"optional={optional}"
+            )
+            return default
+        # Optional fetches must leave the reserve untouched for essential fetches that follow.
+        timeout = max(0.0, self.remaining() - (self.optional_reserve_sec if optional else 0.0))
+        submitted_at = time.monotonic()
+        state = {"started": False}
+        with _FETCH_LOCK:
+            FETCH_POOL_STATS["submitted"] += 1
+        future = _fetch_executor().submit(
+            _run_budgeted, fn, args, kwargs, submitted_at, submitted_at + timeout, state, default
+        )
+        try:
+            result = future.result(timeout=timeout)
+            if state.get("expired"):
+                self.timed_out.append(label)
+                self.log(f"[Deadline] {label} exceeded turn budget after {self.elapsed():.2f}s (queued)")
+            return result
+        except FutureTimeoutError:
+            # A queued job is dropped; a running one is cut short by its HTTP timeout (fetch_timeout).
+            future.cancel()
+            where = "running" if state["started"] else "queued"
+            with _FETCH_LOCK:
+                FETCH_POOL_STATS["timedOutRunning" if state["started"] else "timedOutQueued"] += 1
+            self.timed_out.append(label)
+            self.log(f"[Deadline] {label} exceeded turn budget after {self.elapsed():.2f}s ({where})")
+            return default
+
+    def wait(self, label: str, future: Future, default: Any = None) -> Any:
+        timeout = self.remaining() if self.bounded else None
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.timed_out.append(label)
+            self.log(f"[Deadline] {label} exceeded turn budget after {self.elapsed():.2f}s")
+            return default
+        except Exception as e:
+            self.log(f"[Deadline] {label} failed: {e}")
+            return default
+
+    def summary(self) -> dict:
+        return {
+            "budgetSec": self.budget_sec if self.bounded else None,
+            "elapsedSec": round(self.elapsed(), 3),
+            "skipped": list(self.skipped),
+            "timedOut": list(self.timed_out),
+        }
@@ -1,33 +1,115 @@
 import base64
+import struct
 import time
-from collections import deque
+from bisect import bisect_right
 from typing import Callable
 
 
+# Binary camera sub-protocol (/ws?camera=binary): 8-byte header + raw JPEG in one binary message.
+# Header: magic "ACAM", version (1), kind (1=frame, 2=snapshot), reserved uint16.
+CAMERA_FRAME_HEADER = struct.Struct("<4sBBH")
+CAMERA_FRAME_MAGIC = b"ACAM"
+CAMERA_KIND_FRAME = 1
+CAMERA_KIND_SNAPSHOT = 2
+
+
+def parse_camera_frame(data: bytes) -> tuple[int, memoryview] | None:
+    """Returns (kind, jpeg view into `data`) for a camera message, None for anything else (mic audio)."""
+    if len(data) <= CAMERA_FRAME_HEADER.size or data[:4] != CAMERA_FRAME_MAGIC:
+        return None
+    _magic, version, kind, _reserved = CAMERA_FRAME_HEADER.unpack_from(data)
+    if version != 1 or kind not in (CAMERA_KIND_FRAME, CAMERA_KIND_SNAPSHOT):
+        return None
+    return kind, memoryview(data)[CAMERA_FRAME_HEADER.size:]
+
+
+class SnapshotRing:
+    """Recent camera frames under a byte budget, one memoryview each, searchable by timestamp."""
+
+    def __init__(self, byte_budget: int):
+        self.byte_budget = max(1, int(byte_budget))
+        self._ts: list[float] = []
+        self._frames: list[memoryview] = []
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def append(self, ts: float, frame: memoryview):
+        if self._ts and ts < self._ts[-1]:
+            ts = self._ts[-1]
+        self._ts.append(ts)
+        self._frames.append(frame)
+        self.nbytes += frame.nbytes
+        # Always keep the newest frame, even if it alone exceeds the budget.
+        while self.nbytes > self.byte_budget and len(self._frames) > 1:
+            self.nbytes -= self._frames[0].nbytes
+            del self._ts[0]
+            del self._frames[0]
+
+    def latest_between(self, start: float, end: float) -> memoryview | None:
+        idx = bisect_right(self._ts, end) - 1
+        if idx >= 0 and self._ts[idx] >= start:
+            return self._frames[idx]
+        return None
+
+    def clear(self):
+        self._ts.clear()
+        self._frames.clear()
+        self.nbytes = 0
+
+
 class VisionService:
-    def __init__(self, min_interval_sec: float, snapshot_ttl_sec: float, log: Callable[[str], None] = print):
+    def __init__(
+        self,
+        min_interval_sec: float,
+        snapshot_ttl_sec: float,
+        snapshot_buffer_bytes: int = 4 * 1024 * 1024,
+        snapshot_min_interval_sec: float = 0.2,
+        change_detector=None,
+        log: Callable[[str], None] = print,
+    ):
         self.min_interval_sec = float(min_interval_sec)
         self.snapshot_ttl_sec = float(snapshot_ttl_sec)
+        # Frames closer together than this are dropped before any decode work.
+        self.snapshot_min_interval_sec = float(snapshot_min_interval_sec)
+        # Optional FrameChangeDetector: suppresses near-duplicate frames and stretches the interval on static scenes.
+        self.change_detector = change_detector
         self.log = log
         self.camera_state = {
             "enabled": False,
             "last_frame_ts": 0.0,
             "frames_sent": 0,
+            "frames_dropped": 0,
+            "frames_suppressed": 0,
+            "last_check_ts": 0.0,
             "latest_snapshot": None,
             "snapshot_ts": 0.0,
             "snapshot_updates": 0,
-            "snapshot_buffer": deque(maxlen=40),
+            "snapshot_buffer": SnapshotRing(snapshot_buffer_bytes),
         }
 
-    def _record_snapshot(self, image_bytes: bytes, ts: float | None = None):
+    def _should_drop_frame(self, now_ts: float) -> bool:
+        if now_ts - float(self.camera_state.get("snapshot_ts") or 0.0) >= self.snapshot_min_interval_sec:
+            return False
+        if now_ts - float(self.camera_state.get("last_frame_ts") or 0.0) >= self.min_interval_sec:
+            return False
+        self.camera_state["frames_dropped"] = int(self.camera_state.get("frames_dropped") or 0) + 1
+        return True
+
+    def _record_snapshot(self, image_bytes, ts: float | None = None):
         if not image_bytes:
             return
         now_ts = float(ts if ts is not None else time.monotonic())
-        self.camera_state["latest_snapshot"] = bytes(image_bytes)
+        # One owned buffer per frame: bytes are viewed in place, anything mutable is copied once.
+        frame = image_bytes if isinstance(image_bytes, memoryview) else memoryview(
+            image_bytes if isinstance(image_bytes, bytes) else bytes(image_bytes)
+        )
+        self.camera_state["latest_snapshot"] = frame
         self.camera_state["snapshot_ts"] = now_ts
         buf = self.camera_state.get("snapshot_buffer")
-        if isinstance(buf, deque):
-            buf.append({"ts": now_ts, "data": bytes(image_bytes)})
+        if isinstance(buf, SnapshotRing):
+            buf.append(now_ts, frame)
 
     async def send_frame_to_gemini(
         self,
@@ -41,12 +123,29 @@ class VisionService:
         now_ts = time.monotonic()
         # Keep latest frame snapshot synced so query-time snapshot turn uses the newest view.
         self._record_snapshot(image_bytes=image_bytes, ts=now_ts)
-        if now_ts - float(self.camera_state.get("last_frame_ts") or 0.0) < self.min_interval_sec:
+        detector = self.change_detector
+        interval = detector.current_interval() if detector is not None else self.min_interval_sec
+        last_ts = max(
+            float(self.camera_state.get("last_frame_ts") or 0.0),
+            float(self.camera_state.get("last_check_ts") or 0.0),
+        )
+        if now_ts - last_ts < interval:
             return
         if not push_image_now:
             return
+        frame = bytes(image_bytes)
+        if detector is not None and not await detector.should_send(frame, now_ts):
+            self.camera_state["last_check_ts"] = now_ts
+            self.camera_state["frames_suppressed"] = int(self.camera_state.get("frames_suppressed") or 0) + 1
+            suppressed = int(self.camera_state["frames_suppressed"])
+            if suppressed % 20 == 0:
+                self.log(
+                    f"[Vision] unchanged frames suppressed: {suppressed} "
+                    f"(sent={self.camera_state.get('frames_sent')}, interval={interval:.1f}s)"
+                )
+            return
         try:
-            await push_image_now(image_bytes)
+            await push_image_now(frame)
             self.camera_state["last_frame_ts"] = now_ts
             self.camera_state["frames_sent"] = int(self.camera_state.get("frames_sent") or 0) + 1
             frames = int(self.camera_state["frames_sent"])
@@ -70,8 +169,11 @@ class VisionService:
         self.camera_state["latest_snapshot"] = None
         self.camera_state["snapshot_ts"] = 0.0
         self.camera_state["last_frame_ts"] = 0.0
+        self.camera_state["last_check_ts"] = 0.0
+        if self.change_detector is not None:
+            self.change_detector.reset()
         buf = self.camera_state.get("snapshot_buffer")
-        if isinstance(buf, deque):
+        if isinstance(buf, SnapshotRing):
             buf.clear()
         self.log(f"[Vision] Camera state changed: enabled={camera_on}")
         if camera_on:
@@ -85,6 +187,8 @@ class VisionService:
             return
         b64 = payload.get("data")
         mime_type = str(payload.get("mime_type") or "image/jpeg")
+        if self._should_drop_frame(time.monotonic()):
+            return
         if isinstance(b64, str) and b64:
             try:
                 image_bytes = base64.b64decode(b64)
@@ -104,7 +208,7 @@ class VisionService:
         if isinstance(b64, str) and b64:
             try:
                 image_bytes = base64.b64decode(b64)
-                self._record_snapshot(image_bytes=image_bytes, ts=time.monotonic())
+                # send_frame_to_gemini records it into the snapshot ring.
                 self.camera_state["snapshot_updates"] = int(self.camera_state.get("snapshot_updates") or 0) + 1
                 updates = int(self.camera_state["snapshot_updates"])
                 if updates == 1 or updates % 20 == 0:
@@ -118,13 +222,35 @@ class VisionService:
             except Exception as e:
                 self.log(f"[Vision] snapshot decode failed: {e}")
 
+    async def handle_camera_frame_bytes(
+        self,
+        kind: int,
+        jpeg: memoryview,
+        push_image_now: Callable,
+        inject_live_context_now,
+    ):
+        """Binary-protocol counterpart of the two *_payload handlers: no JSON, no base64."""
+        if not self.camera_state.get("enabled") or not jpeg:
+            return
+        now_ts = time.monotonic()
+        if kind == CAMERA_KIND_SNAPSHOT:
+            self.camera_state["snapshot_updates"] = int(self.camera_state.get("snapshot_updates") or 0) + 1
+        elif self._should_drop_frame(now_ts):
+            return
+        await self.send_frame_to_gemini(
+            push_image_now=push_image_now,
+            inject_live_context_now=inject_live_context_now,
+            image_bytes=jpeg,
+            mime_type="image/jpeg",
+        )
+
     def get_recent_snapshot_for_query(self, text: str, is_vision_related_query: Callable[[str], bool]) -> bytes | None:
         if not is_vision_related_query(text):
             return None
         snapshot_bytes = self.camera_state.get("latest_snapshot")
         snapshot_ts = float(self.camera_state.get("snapshot_ts") or 0.0)
         if (
-            isinstance(snapshot_bytes, (bytes, bytearray))
+            isinstance(snapshot_bytes, (bytes, bytearray, memoryview))
             and (time.monotonic() - snapshot_ts) <= self.snapshot_ttl_sec
         ):
             return bytes(snapshot_bytes)
@@ -135,7 +261,7 @@ class VisionService:
         snapshot_ts = float(self.camera_state.get("snapshot_ts") or 0.0)
         ttl = float(max_age_sec) if max_age_sec is not None else float(self.snapshot_ttl_sec)
         if (
-            isinstance(snapshot_bytes, (bytes, bytearray))
+            isinstance(snapshot_bytes, (bytes, bytearray, memoryview))
             and (time.monotonic() - snapshot_ts) <= ttl
         ):
             return bytes(snapshot_bytes)
@@ -152,18 +278,8 @@ class VisionService:
         end = float(utterance_end_ts or 0.0)
         now = time.monotonic()
         buf = self.camera_state.get("snapshot_buffer")
-        if isinstance(buf, deque) and len(buf) > 0:
-            picked = None
-            for item in reversed(buf):
-                ts = float(item.get("ts") or 0.0)
-                data = item.get("data")
-                if not isinstance(data, (bytes, bytearray)):
-                    continue
-                if ts < (now - float(max_age_sec)):
-                    continue
-                if start <= ts <= end:
-                    picked = bytes(data)
-                    break
+        if isinstance(buf, SnapshotRing) and len(buf) > 0:
+            picked = buf.latest_between(max(start, now - float(max_age_sec)), end)
             if picked is not None:
-                return picked
+                return bytes(picked)
         return self.get_recent_snapshot(max_age_sec=max_age_sec)
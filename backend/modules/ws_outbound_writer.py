@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+
+class WsOutboundWriter:
+    """The only coroutine that writes to a session's websocket.
+
+    Drains three lanes in priority order: control JSON > transcripts > audio frames.
+    Transcripts may be enqueued from any thread (Azure STT callbacks); they only cost a
+    deque append plus at most one loop wake-up per batch. The audio lane is bounded, so a
+    slow client pushes back on the downlink packetizer instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        ws,
+        loop: asyncio.AbstractEventLoop,
+        batch_transcripts: bool = False,
+        max_audio_frames: int = 64,
+        resumable: bool = False,
+        log=print,
+    ):
+        self.ws = ws
+        self.loop = loop
+        # Opt-in: older clients only understand one {"type": "transcript"} per frame.
+        self.batch_transcripts = bool(batch_transcripts)
+        # Resumable sessions survive a dead socket: the writer detaches and waits for attach().
+        self.resumable = bool(resumable)
+        self.log = log
+        self._control: deque = deque()
+        self._transcripts: deque = deque()
+        self._transcript_lock = threading.Lock()
+        self._transcript_wake_pending = False
+        self._audio: asyncio.Queue = asyncio.Queue(maxsize=max(1, int(max_audio_frames)))
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self._stats = {
+            "control": 0,
+            "transcripts": 0,
+            "transcriptFrames": 0,
+            "audioFrames": 0,
+            "audioBytes": 0,
+            "audioBackpressureSec": 0.0,
+            "maxTranscriptBacklog": 0,
+            "dropped": 0,
+            "audioCleared": 0,
+            "detaches": 0,
+        }
+
+    def start(self) -> "WsOutboundWriter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def send_control(self, payload: dict, on_sent=None):
+        """Event-loop only. `on_sent()` runs right after the frame has been written."""
+        if self._closed:
+            self._stats["dropped"] += 1
+            return
+        self._control.append((payload, on_sent))
+        self._wake.set()
+
+    def clear_audio(self) -> int:
+        """Drops queued audio frames (barge-in); returns how many were dropped."""
+        dropped = 0
+        while not self._audio.empty():
+            self._audio.get_nowait()
+            dropped += 1
+        self._stats["audioCleared"] += dropped
+        return dropped
+
+    def send_transcript_threadsafe(self, payload: dict):
+        if self._closed:
+            self._stats["dropped"] += 1
+            return
+        with self._transcript_lock:
+            self._transcripts.append(payload)
+            wake = not self._transcript_wake_pending
+            self._transcript_wake_pending = True
+        if wake:
+            try:
+                self.loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # Loop already closed during shutdown.
+                self._stats["dropped"] += 1
+
+    def detach(self):
+        """Socket gone: stop writing. Control/transcripts stay queued; audio is dropped (it would be stale)."""
+        if self.ws is not None:
+            self.ws = None
+            self._stats["detaches"] += 1
+        self._stats["dropped"] += self.clear_audio()
+
+    def attach(self, ws):
+        self.ws = ws
+        self._wake.set()
+
+    async def send_audio(self, frame: bytes):
+        if self._closed or self.ws is None:
+            self._stats["dropped"] += 1
+            return
+        if self._audio.full():
+            started = time.monotonic()
+            await self._audio.put(frame)
+            self._stats["audioBackpressureSec"] += time.monotonic() - started
+        else:
+            self._audio.put_nowait(frame)
+        self._wake.set()
+
+    def _take_transcripts(self) -> list[dict]:
+        with self._transcript_lock:
+            self._transcript_wake_pending = False
+            if not self._transcripts:
+                return []
+            self._stats["maxTranscriptBacklog"] = max(self._stats["maxTranscriptBacklog"], len(self._transcripts))
+            if self.batch_transcripts:
+                batch = list(self._transcripts)
+                self._transcripts.clear()
+                return batch
+            return [self._transcripts.popleft()]
+
+    async def _send_transcripts(self, ws, batch: list[dict]):
+        if len(batch) == 1:
+            await ws.send_text(json.dumps(batch[0]))
+        else:
+            await ws.send_text(json.dumps({"type": "transcript_batch", "events": batch}))
+        self._stats["transcripts"] += len(batch)
+        self._stats["transcriptFrames"] += 1
+
+    async def _drain(self, ws):
+        # Stops as soon as attach() swaps the socket; _run picks up the new one.
+        while self.ws is ws:
+            if self._control:
+                payload, on_sent = self._control[0]
+                await ws.send_text(json.dumps(payload))
+                self._control.popleft()
+                self._stats["control"] += 1
+                if on_sent is not None:
+                    on_sent()
+                continue
+            batch = self._take_transcripts()
+            if batch:
+                await self._send_transcripts(ws, batch)
+                continue
+            if not self._audio.empty():
+                frame = self._audio.get_nowait()
+                await ws.send_bytes(frame)
+                self._stats["audioFrames"] += 1
+                self._stats["audioBytes"] += len(frame)
+                continue
+            break
+
+    async def _run(self):
+        try:
+            while True:
+                await self._wake.wait()
+                self._wake.clear()
+                ws = self.ws
+                if ws is None:
+                    continue
+                try:
+                    await self._drain(ws)
+                except Exception as e:
+                    if not self.resumable:
+                        self.log(f"[WsWriter] send failed, writer stopped: {e}")
+                        return
+                    if self.ws is ws:
+                        self.log(f"[WsWriter] send failed, waiting for reattach: {e}")
+                        self.detach()
+                if self.ws is not ws:
+                    self._wake.set()
+        except asyncio.CancelledError:
+            raise
+        finally:
+            self._closed = True
+            # Unblock anyone waiting on a full audio lane.
+            while not self._audio.empty():
+                self._audio.get_nowait()
+                self._stats["dropped"] += 1
+
+    def snapshot(self) -> dict:
+        out = dict(self._stats)
+        out["audioBackpressureSec"] = round(out["audioBackpressureSec"], 3)
+        out["queued"] = {"control": len(self._control), "transcripts": len(self._transcripts), "audio": self._audio.qsize()}
+        return out
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
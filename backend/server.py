@@ -25,8 +25,15 @@ from modules.memory import memory_service
 from modules.seoul_info_module import build_seoul_info_packet, build_speech_summary
 from modules.news_agent import NewsAgent
 from modules.intent_router import IntentRouter
+from modules.intent_route_cache import IntentRouteCache
+from modules.ngram_intent_classifier import DEFAULT_WEIGHTS_PATH as NGRAM_DEFAULT_WEIGHTS_PATH, NgramIntentClassifier
 from modules.seoul_live_service import SeoulLiveService
-from modules.vision_service import VisionService
+from modules.vision_service import VisionService, parse_camera_frame
+from modules.frame_change_detector import FrameChangeDetector
+from modules.image_normalizer import ImageNormalizer
+from modules.context_budget import ContextBudgetManager
+from modules.session_supervisor import SessionSupervisor, supervisor_totals
+from modules.session_registry import SessionRegistry, new_resume_token
 from modules.news_context_service import NewsContextService
 from modules.timer_service import TimerService
 from modules.proactive_service import ProactiveService
@@ -35,7 +42,7 @@ from modules.morning_briefing_module import MorningBriefingModule
 from modules.tmap_service import TmapService
 from modules.live_seoul_summary_service import LiveSeoulSummaryService
 from modules.context_runtime_service import ContextRuntimeService
-from modules.audio_stt_utils import create_push_stream
+from modules.audio_stt_utils import AiSttFlushScheduler, create_push_stream
 from modules.audio_stt_utils import create_recognizer as create_azure_recognizer
 from modules.http_api_routes import create_api_router
 from modules.briefing_runtime_service import BriefingRuntimeService
@@ -43,8 +50,16 @@ from modules import conversation_text_utils
 from modules import runtime_env as runtime_env_utils
 from modules import route_text_utils
 from modules.fast_intent_router import fast_route_intent as fast_route_intent_core
+from modules.text_features import extract_text_features
 from modules.transit_runtime_service import TransitRuntimeService
+from modules.turn_deadline import TurnDeadline, configure_fetch_pool, fetch_pool_stats
+from modules.latency_stats import LatencyStats
+from modules.speculative_prefetch import SpeculativePrefetcher
 from modules.lumirami import LumiRamiManager
+from modules.live_tools import LiveToolExecutor
+from modules.audio_downlink import DownlinkPacketizer
+from modules.ws_outbound_writer import WsOutboundWriter
+from modules.audio_codec import ImaAdpcmEncoder, mulaw_decode, negotiate_audio_codecs
 
 from contextlib import asynccontextmanager
 
@@ -73,6 +88,10 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown logic
     print("[Server] Shutting down... (Lifespan Event)")
+    await intent_router.aclose()
+    if IMAGE_NORMALIZER is not None:
+        print(f"[Image] {IMAGE_NORMALIZER.stats()}")
+        IMAGE_NORMALIZER.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -111,6 +130,18 @@ ORCHESTRATION_SINGLE_PATH = os.getenv("ORCHESTRATION_SINGLE_PATH", "true").strip
 EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT = GEMINI_DIRECT_AUDIO_INPUT and (not ORCHESTRATION_SINGLE_PATH)
 CAMERA_FRAME_MIN_INTERVAL_SEC = float(os.getenv("CAMERA_FRAME_MIN_INTERVAL_SEC", "1.0"))
 VISION_SNAPSHOT_TTL_SEC = float(os.getenv("VISION_SNAPSHOT_TTL_SEC", "120"))
+VISION_SNAPSHOT_BUFFER_BYTES = int(os.getenv("VISION_SNAPSHOT_BUFFER_BYTES", str(4 * 1024 * 1024)))
+VISION_SNAPSHOT_MIN_INTERVAL_SEC = float(os.getenv("VISION_SNAPSHOT_MIN_INTERVAL_SEC", "0.2"))
+# Perceptual (dHash) change detection: skip frames that look like the last one sent to Gemini.
+VISION_CHANGE_DETECTION = os.getenv("VISION_CHANGE_DETECTION", "true").strip().lower() in {"1", "true", "yes", "on"}
+VISION_CHANGE_MIN_DISTANCE = int(os.getenv("VISION_CHANGE_MIN_DISTANCE", "6"))
+VISION_STATIC_FRAME_INTERVAL_SEC = float(os.getenv("VISION_STATIC_FRAME_INTERVAL_SEC", "4.0"))
+VISION_KEEPALIVE_SEC = float(os.getenv("VISION_KEEPALIVE_SEC", "30"))
+# Every image sent to Gemini (camera frames, snapshot turns, multimodal uploads) is resized/re-encoded first.
+IMAGE_NORMALIZE = os.getenv("IMAGE_NORMALIZE", "true").strip().lower() in {"1", "true", "yes", "on"}
+IMAGE_MAX_LONG_EDGE = int(os.getenv("IMAGE_MAX_LONG_EDGE", "768"))
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "80"))
+IMAGE_NORMALIZE_WORKERS = int(os.getenv("IMAGE_NORMALIZE_WORKERS", "2"))
 ENV_CACHE_TTL_SEC = float(os.getenv("ENV_CACHE_TTL_SEC", "300"))
 
 # Azure Speech Config
@@ -133,10 +164,80 @@ AI_STT_SEGMENTATION_SILENCE_TIMEOUT_MS = os.getenv("AI_STT_SEGMENTATION_SILENCE_
 AI_FLUSH_SILENCE_AFTER_SEC = float(os.getenv("AI_FLUSH_SILENCE_AFTER_SEC", "1.2"))
 AI_FLUSH_SILENCE_SEC = float(os.getenv("AI_FLUSH_SILENCE_SEC", "0.15"))
 AI_FLUSH_MIN_INTERVAL_SEC = float(os.getenv("AI_FLUSH_MIN_INTERVAL_SEC", "1.5"))
+TURN_DEADLINE_SEC = float(os.getenv("TURN_DEADLINE_SEC", "3.5"))
+TURN_OPTIONAL_RESERVE_SEC = float(os.getenv("TURN_OPTIONAL_RESERVE_SEC", "1.2"))
+# Process-wide live-fetch pool; each fetch's HTTP timeout is also cut to its remaining turn budget.
+TURN_FETCH_WORKERS = int(os.getenv("TURN_FETCH_WORKERS", "32"))
+configure_fetch_pool(TURN_FETCH_WORKERS)
+PROGRESSIVE_LIVE_CONTEXT = os.getenv("PROGRESSIVE_LIVE_CONTEXT", "false").strip().lower() in {"1", "true", "yes", "on"}
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "false").strip().lower() in {"1", "true", "yes", "on"}
+SPECULATIVE_STABLE_HITS = int(os.getenv("SPECULATIVE_STABLE_HITS", "2"))
+INTENT_ROUTER_BUDGET_SEC = float(os.getenv("INTENT_ROUTER_BUDGET_SEC", "1.2"))
+INTENT_ROUTE_CACHE_TTL_SEC = float(os.getenv("INTENT_ROUTE_CACHE_TTL_SEC", "600"))
+INTENT_ROUTE_CACHE_RELATIVE_TTL_SEC = float(os.getenv("INTENT_ROUTE_CACHE_RELATIVE_TTL_SEC", "30"))
+INTENT_ROUTE_LOG_PATH = os.getenv("INTENT_ROUTE_LOG_PATH", "").strip()
+# Off until the classifier is retrained on logged routes (INTENT_ROUTE_LOG_PATH); the seed set is tiny.
+INTENT_NGRAM_TIER = os.getenv("INTENT_NGRAM_TIER", "false").strip().lower() in {"1", "true", "yes", "on"}
+INTENT_NGRAM_WEIGHTS = os.getenv("INTENT_NGRAM_WEIGHTS", "").strip() or NGRAM_DEFAULT_WEIGHTS_PATH
+INTENT_NGRAM_THRESHOLD = float(os.getenv("INTENT_NGRAM_THRESHOLD", "0.85"))
+INTENT_ROUTER_STREAMING = os.getenv("INTENT_ROUTER_STREAMING", "false").strip().lower() in {"1", "true", "yes", "on"}
+AUDIO_UPLINK_COALESCE_MS = int(os.getenv("AUDIO_UPLINK_COALESCE_MS", "100"))
+DOWNLINK_FRAME_MS = int(os.getenv("DOWNLINK_FRAME_MS", "40"))
+DOWNLINK_LEAD_MS = int(os.getenv("DOWNLINK_LEAD_MS", "200"))
+# Frames waiting to be paced out before Gemini audio forwarding blocks (128 x 40 ms ~ 5 s).
+DOWNLINK_MAX_QUEUED_FRAMES = int(os.getenv("DOWNLINK_MAX_QUEUED_FRAMES", "128"))
+CONTEXT_BUDGET = os.getenv("CONTEXT_BUDGET", "true").strip().lower() in {"1", "true", "yes", "on"}
+CONTEXT_WINDOW_COMPRESSION = os.getenv("CONTEXT_WINDOW_COMPRESSION", "true").strip().lower() in {"1", "true", "yes", "on"}
+CONTEXT_TRIGGER_TOKENS = int(os.getenv("CONTEXT_TRIGGER_TOKENS", "32000"))
+CONTEXT_TARGET_TOKENS = int(os.getenv("CONTEXT_TARGET_TOKENS", "16000"))
+# Peer transcripts are injected once per AI turn, after late STT segments settle for this long.
+PEER_TRANSCRIPT_SETTLE_SEC = float(os.getenv("PEER_TRANSCRIPT_SETTLE_SEC", "0.8"))
+# Barge-in: user speech onset cuts AI playback and interrupts the speaking persona.
+BARGE_IN = os.getenv("BARGE_IN", "true").strip().lower() in {"1", "true", "yes", "on"}
+BARGE_IN_MIN_CHARS = int(os.getenv("BARGE_IN_MIN_CHARS", "2"))
+# Upper bound for cancelling a session's tasks and closing its connections after disconnect.
+SESSION_TEARDOWN_SEC = float(os.getenv("SESSION_TEARDOWN_SEC", "8"))
+# "?resumable=1" sessions stay alive this long after a disconnect and can be reattached; 0 disables.
+SESSION_RESUME_GRACE_SEC = max(0.0, float(os.getenv("SESSION_RESUME_GRACE_SEC", "30")))
+# "router": IntentRouter picks the intent and the server injects live context.
+# "function_calling": Gemini calls the live-data tools itself (no router hop, no response gate).
+LIVE_TOOL_MODE = os.getenv("LIVE_TOOL_MODE", "router").strip().lower()
+if LIVE_TOOL_MODE not in {"router", "function_calling"}:
+    print(f"[Config] Unknown LIVE_TOOL_MODE={LIVE_TOOL_MODE!r}, using 'router'")
+    LIVE_TOOL_MODE = "router"
 print(f"[Config] ENABLE_TRANSIT_FILLER={ENABLE_TRANSIT_FILLER}")
 print(f"[Config] GEMINI_DIRECT_AUDIO_INPUT={GEMINI_DIRECT_AUDIO_INPUT}")
 print(f"[Config] ORCHESTRATION_SINGLE_PATH={ORCHESTRATION_SINGLE_PATH}")
 print(f"[Config] EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT={EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT}")
+print(f"[Config] TURN_DEADLINE_SEC={TURN_DEADLINE_SEC}, TURN_FETCH_WORKERS={TURN_FETCH_WORKERS}")
+print(f"[Config] PROGRESSIVE_LIVE_CONTEXT={PROGRESSIVE_LIVE_CONTEXT}")
+print(f"[Config] SPECULATIVE_PREFETCH={SPECULATIVE_PREFETCH}")
+print(f"[Config] INTENT_ROUTER_BUDGET_SEC={INTENT_ROUTER_BUDGET_SEC}")
+print(f"[Config] INTENT_ROUTER_STREAMING={INTENT_ROUTER_STREAMING}")
+print(f"[Config] INTENT_ROUTE_CACHE_TTL_SEC={INTENT_ROUTE_CACHE_TTL_SEC}")
+print(f"[Config] INTENT_NGRAM_TIER={INTENT_NGRAM_TIER}, threshold={INTENT_NGRAM_THRESHOLD}")
+print(f"[Config] LIVE_TOOL_MODE={LIVE_TOOL_MODE}")
+print(f"[Config] AUDIO_UPLINK_COALESCE_MS={AUDIO_UPLINK_COALESCE_MS}")
+print(
+    f"[Config] DOWNLINK_FRAME_MS={DOWNLINK_FRAME_MS}, DOWNLINK_LEAD_MS={DOWNLINK_LEAD_MS}, "
+    f"DOWNLINK_MAX_QUEUED_FRAMES={DOWNLINK_MAX_QUEUED_FRAMES}"
+)
+print(
+    f"[Config] CONTEXT_BUDGET={CONTEXT_BUDGET}, CONTEXT_WINDOW_COMPRESSION={CONTEXT_WINDOW_COMPRESSION} "
+    f"(trigger={CONTEXT_TRIGGER_TOKENS}, target={CONTEXT_TARGET_TOKENS})"
+)
+print(f"[Config] PEER_TRANSCRIPT_SETTLE_SEC={PEER_TRANSCRIPT_SETTLE_SEC}")
+print(f"[Config] BARGE_IN={BARGE_IN}, min_chars={BARGE_IN_MIN_CHARS}")
+print(f"[Config] SESSION_TEARDOWN_SEC={SESSION_TEARDOWN_SEC}")
+print(f"[Config] SESSION_RESUME_GRACE_SEC={SESSION_RESUME_GRACE_SEC}")
+print(
+    f"[Config] VISION_CHANGE_DETECTION={VISION_CHANGE_DETECTION}, min_distance={VISION_CHANGE_MIN_DISTANCE}, "
+    f"static_interval={VISION_STATIC_FRAME_INTERVAL_SEC}s, keepalive={VISION_KEEPALIVE_SEC}s"
+)
+print(
+    f"[Config] IMAGE_NORMALIZE={IMAGE_NORMALIZE}, long_edge={IMAGE_MAX_LONG_EDGE}, "
+    f"quality={IMAGE_JPEG_QUALITY}, workers={IMAGE_NORMALIZE_WORKERS}"
+)
 
 RUNTIME_ENV_PATH = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -183,7 +284,26 @@ CONTEXT_RUNTIME = ContextRuntimeService(
 )
 
 news_context_service = NewsContextService(news_agent=NEWS_AGENT, log=print)
+TURN_LATENCY = LatencyStats()
+# Process-wide: identical utterances from any session reuse the LLM route.
+INTENT_ROUTE_CACHE = IntentRouteCache(
+    ttl_sec=INTENT_ROUTE_CACHE_TTL_SEC,
+    relative_ttl_sec=INTENT_ROUTE_CACHE_RELATIVE_TTL_SEC,
+)
 ws_orchestrator = WsOrchestratorService()
+# Process-wide: one bounded pool caps image CPU regardless of how many sessions upload at once.
+IMAGE_NORMALIZER = (
+    ImageNormalizer(
+        max_long_edge=IMAGE_MAX_LONG_EDGE,
+        jpeg_quality=IMAGE_JPEG_QUALITY,
+        max_workers=IMAGE_NORMALIZE_WORKERS,
+        log=print,
+    )
+    if IMAGE_NORMALIZE
+    else None
+)
+# Process-wide: disconnected resumable sessions waiting for their client to come back.
+SESSION_REGISTRY = SessionRegistry(log=print)
 
 _to_float = CONTEXT_RUNTIME.to_float
 _resolve_home_coords = CONTEXT_RUNTIME.resolve_home_coords
@@ -196,8 +316,25 @@ intent_router = IntentRouter(
     api_version=AZURE_OPENAI_API_VERSION,
     model=INTENT_ROUTER_MODEL,
     destination_extractor=_extract_destination_from_text,
+    budget_sec=INTENT_ROUTER_BUDGET_SEC,
+    latency_stats=TURN_LATENCY,
+    streaming=INTENT_ROUTER_STREAMING,
+    route_cache=INTENT_ROUTE_CACHE,
+    route_log_path=INTENT_ROUTE_LOG_PATH,
 )
 
+NGRAM_CLASSIFIER = None
+if INTENT_NGRAM_TIER and os.path.exists(INTENT_NGRAM_WEIGHTS):
+    try:
+        NGRAM_CLASSIFIER = NgramIntentClassifier.load(
+            INTENT_NGRAM_WEIGHTS,
+            threshold=INTENT_NGRAM_THRESHOLD,
+            destination_extractor=_extract_destination_from_text,
+        )
+        print(f"[IntentRouter] n-gram tier loaded: labels={len(NGRAM_CLASSIFIER.labels)}")
+    except Exception as e:
+        print(f"[IntentRouter] n-gram tier load failed: {e}")
+
 
 _extract_news_topic_from_text = news_context_service.extract_topic
 _get_news_headlines = news_context_service.get_headlines
@@ -208,6 +345,7 @@ _select_news_item_by_text = news_context_service.select_item_by_text
 _build_news_detail_summary = news_context_service.build_detail_summary
 
 _search_restaurants_nearby = CONTEXT_RUNTIME.search_restaurants_nearby
+_extract_restaurant_keyword = CONTEXT_RUNTIME.extract_restaurant_keyword
 
 _is_vision_related_query = conversation_text_utils.is_vision_related_query
 _is_vision_followup_utterance = conversation_text_utils.is_vision_followup_utterance
@@ -284,11 +422,13 @@ seoul_live_service = SeoulLiveService(
 )
 
 _execute_tools_for_intent = seoul_live_service.execute_tools_for_intent
-_fast_route_intent = lambda text, active_timer=False: fast_route_intent_core(
+_execute_tools_for_intents = seoul_live_service.execute_tools_for_intents
+_fast_route_intent = lambda text, active_timer=False, features=None: fast_route_intent_core(
     text=text,
     active_timer=active_timer,
     destination_extractor=_extract_destination_from_text,
     arrival_eta_query_checker=_is_arrival_eta_query,
+    features=features,
 )
 
 # --- Helper: Azure STT Setup ---
@@ -327,6 +467,17 @@ async def audio_websocket(ws: WebSocket):
         await ws.close(code=1008, reason="API Keys missing")
         return
 
+    # Reattach: "?resume=<token>" hands this socket to the existing session instead of bootstrapping,
+    # whether it is parked or its old socket has not been noticed as dead yet.
+    resume_request = str(ws.query_params.get("resume") or "").strip()
+    if resume_request and SESSION_RESUME_GRACE_SEC > 0:
+        released = SESSION_REGISTRY.claim(user_id, resume_request, ws)
+        if released is not None:
+            print(f"[Resume] {user_id} reattached to its session")
+            await released
+            return
+        print(f"[Resume] No resumable session for {user_id}; starting a new one")
+
     # 2. Load Memory (Context)
     past_memories = await asyncio.to_thread(cosmos_service.get_all_memories, user_id)
     lumi_mem_str = ""
@@ -417,759 +568,1222 @@ async def audio_websocket(ws: WebSocket):
 
     # Capture the main event loop
     loop = asyncio.get_running_loop()
-
-    async def send_audio_to_client(audio_bytes: bytes, speaker_name: str):
-        try:
-            await ws.send_bytes(audio_bytes)
-            if speaker_name == "lumi":
-                await asyncio.to_thread(lumi_push_stream.write, audio_bytes)
-                lumi_state["last_ai_write_time"] = time.monotonic()
-                lumi_state["flushed"] = False
-            elif speaker_name == "rami":
-                await asyncio.to_thread(rami_push_stream.write, audio_bytes)
-                rami_state["last_ai_write_time"] = time.monotonic()
-                rami_state["flushed"] = False
-        except Exception as e:
-            print(f"[Server] Error sending audio for {speaker_name}: {e}")
-
-    async def flush_ai_stt(speaker_name: str):
-        try:
-            silence = bytes(24000 * 2 * 1) 
-            if speaker_name == "lumi":
-                await asyncio.to_thread(lumi_push_stream.write, silence)
-            elif speaker_name == "rami":
-                await asyncio.to_thread(rami_push_stream.write, silence)
-        except Exception as e:
-            pass
-
-    lumi_rami_manager = LumiRamiManager(ws_send_func=send_audio_to_client, flush_stt_func=flush_ai_stt)
-
-    # Track state for Smart Flushing
-    lumi_state = {"last_ai_write_time": 0.0, "flushed": True}
-    rami_state = {"last_ai_write_time": 0.0, "flushed": True}
-    vision_service = VisionService(
-        min_interval_sec=CAMERA_FRAME_MIN_INTERVAL_SEC,
-        snapshot_ttl_sec=VISION_SNAPSHOT_TTL_SEC,
-        log=print,
-    )
-    dynamic_contexts = []
-    dynamic_context_lock = asyncio.Lock()
-    session_ref = {"obj": None}
-    
-    import uuid
-    from datetime import datetime
+    # Owns every task and connection of this session; see the finally block for teardown.
+    supervisor = SessionSupervisor(label=f"ws:{user_id}", loop=loop, teardown_sec=SESSION_TEARDOWN_SEC, log=print)
+    # Names the teardown reads even when setup fails part-way.
+    session_started = False
+    resume_token = None
+    resume_state = {"released": None, "handoff": None, "resumes": 0}
     session_messages = []
-    global_seq = 0
-    conversation_id = f"c_{uuid.uuid4().hex[:8]}"
-    session_start_time = datetime.utcnow().isoformat() + "Z"
-
-    route_dedupe = {"text": "", "ts": 0.0}
-    timer_set_dedupe = {"key": "", "ts": 0.0}
-    context_turn_dedupe = {"key": "", "ts": 0.0}
-    transcript_ui_dedupe = {"key": "", "ts": 0.0}
-    user_activity = {"last_user_ts": time.monotonic()}
-    speech_window_state = {"last_recognizing_ts": 0.0, "utterance_start_ts": 0.0}
-    default_transport_mode = "public"
-    if MORNING_BRIEFING is not None:
-        try:
-            default_transport_mode = MORNING_BRIEFING.get_default_transport_mode()
-        except Exception:
-            default_transport_mode = "public"
-    briefing_state = {
-        "wake_sent_date": "",
-        "test_wake_sent": False,
-        "leave_home_sent_date": "",
-        "leave_office_sent_date": "",
-        "last_leave_home_check_ts": 0.0,
-        "last_leave_office_check_ts": 0.0,
-        "awaiting_transport_choice": False,
-        "selected_transport": default_transport_mode,
-        "transport_choice_date": "",
-    }
-    transit_turn_gate = {"until": 0.0}
-    speech_capture_gate = {"until": 0.0}
-    response_guard = {
-        "active": False,
-        "context_sent": False,
-        "suppressed_audio_seen": False,
-        "block_direct_audio": False,
-        "block_direct_audio_until": 0.0,
-        "post_context_audio_hold_until": 0.0,
-        "active_since": 0.0,
-        "context_sent_at": 0.0,
-        "pending_intent": None,
-        "pending_context_summary": "",
-        "pending_action_instruction": "",
-        "pending_user_text": "",
-        "retry_issued": False,
-        "forced_intent_turn": None,
-    }
+    try:
+        def _wire_options(sock) -> dict:
+            # Per-socket wire choices; a resumed session re-reads them from the socket it moves to.
+            params = sock.query_params
+            return {
+                "codecs": negotiate_audio_codecs(params.get("codec")),
+                "codec_requested": bool(params.get("codec")),
+                "header": str(params.get("downlink") or "").strip().lower() == "framed",
+                "camera_binary": str(params.get("camera") or "").strip().lower() == "binary",
+                "batch_transcripts": str(params.get("transcripts") or "").strip().lower() == "batch",
+            }
 
-    async def _inject_live_context_now(context_text: str, complete_turn: bool = False):
-        if not getattr(lumi_rami_manager, "running", False):
-            async with dynamic_context_lock:
-                dynamic_contexts.append(context_text)
-            return
-        payload = "[LIVE_CONTEXT_UPDATE]\n" + context_text + "\nUse this for current answer."
-        queue_key = "text" if complete_turn else "context"
-        for name, q in lumi_rami_manager.queues.items():
-            await q.put((queue_key, payload))
-
-    proactive_service = ProactiveService(
-        response_guard=response_guard,
-        transit_turn_gate=transit_turn_gate,
-        inject_live_context_now=_inject_live_context_now,
-        log=print,
-    )
+        wire = _wire_options(ws)
+        # Every outbound frame goes through this writer; "?transcripts=batch" opts into transcript_batch frames.
+        ws_writer = WsOutboundWriter(
+            ws,
+            loop,
+            batch_transcripts=wire["batch_transcripts"],
+            log=print,
+        ).start()
+        supervisor.add_closer("ws_writer", ws_writer.close)
+        if SESSION_RESUME_GRACE_SEC > 0 and str(ws.query_params.get("resumable") or "").strip().lower() in {"1", "true", "yes", "on"}:
+            resume_token = new_resume_token()
+            ws_writer.resumable = True
+            # Claimable for the whole session, not only once parked.
+            resume_state["handoff"] = SESSION_REGISTRY.register(user_id, resume_token)
+            ws_writer.send_control(
+                {"type": "session", "resumeToken": resume_token, "resumeGraceSec": SESSION_RESUME_GRACE_SEC}
+            )
 
-    def _reset_response_gate(reason: str = ""):
-        proactive_service.reset_response_gate(reason)
-
-    async def _request_spoken_response_with_context(
-        intent_tag: str,
-        context_summary: str,
-        action_instruction: str,
-        tone: str = "neutral",
-        style: str = "",
-        complete_turn: bool = True,
-    ):
-        try:
-            await proactive_service.request_spoken_response_with_context(
-                intent_tag=intent_tag,
-                context_summary=context_summary,
-                action_instruction=action_instruction,
-                tone=tone,
-                style=style,
-                complete_turn=complete_turn,
+        # "?codec=compact" (or "mulaw" / "adpcm"): wire formats only; STT and Gemini still get PCM16.
+        audio_codecs = dict(wire["codecs"])
+        uplink_audio = {"wireBytes": 0, "pcmBytes": 0, "decodeSec": 0.0}
+        # "?downlink=framed" opts into the 12-byte seq/timestamp header (see modules/audio_downlink.py).
+        downlink = DownlinkPacketizer(
+            send_bytes=ws_writer.send_audio,
+            frame_ms=DOWNLINK_FRAME_MS,
+            lead_ms=DOWNLINK_LEAD_MS,
+            header=wire["header"],
+            encode=ImaAdpcmEncoder().encode if audio_codecs["downlink"] == "ima_adpcm" else None,
+            max_frames=DOWNLINK_MAX_QUEUED_FRAMES,
+            log=print,
+        ).start()
+        supervisor.add_closer("downlink", downlink.close)
+
+        def _send_audio_format():
+            print(f"[Codec] negotiated uplink={audio_codecs['uplink']}, downlink={audio_codecs['downlink']}")
+            ws_writer.send_control(
+                {
+                    "type": "audio_format",
+                    "uplink": audio_codecs["uplink"],
+                    "uplinkRate": 16000,
+                    "downlink": audio_codecs["downlink"],
+                    "downlinkRate": 24000,
+                    "downlinkFrameMs": DOWNLINK_FRAME_MS,
+                    "frameHeader": downlink.header,
+                }
             )
-            response_guard["context_sent"] = True
-            response_guard["context_sent_at"] = time.monotonic()
-        except Exception as e:
-            print(f"[Guard] context request failed: {e}")
-            _reset_response_gate("context request failed")
-
-    def _submit_coroutine(coro, label: str):
-        if not loop.is_running():
-            return None
-        fut = asyncio.run_coroutine_threadsafe(coro, loop)
-        def _done_callback(f):
+
+        if wire["codec_requested"]:
+            _send_audio_format()
+
+        # Trailing silence makes Azure finalize the last AI segment; deadline-driven, nothing polls.
+        ai_stt_flush = AiSttFlushScheduler(
+            streams={"lumi": lumi_push_stream, "rami": rami_push_stream},
+            silence_after_sec=AI_FLUSH_SILENCE_AFTER_SEC,
+            silence_sec=max(1.0, AI_FLUSH_SILENCE_SEC),
+            sample_rate=24000,
+            log=print,
+        )
+        supervisor.add_closer("ai_stt_flush", ai_stt_flush.close)
+
+        async def send_audio_to_client(audio_bytes: bytes, speaker_name: str):
             try:
-                _ = f.result()
-            except Exception as ex:
-                print(f"[Async:{label}] failed: {ex}")
-        fut.add_done_callback(_done_callback)
-        return fut
-
-    def _queue_transcript_event(role: str, text: str):
-        clean_text = str(text or "").strip()
-        if not clean_text:
-            return
-        role_norm = str(role or "").strip().lower()
-        if role_norm not in ("user", "lumi", "rami"):
-            role_norm = "ai"
-        normalized_text = re.sub(r"\s+", " ", clean_text)
-        key = f"{role_norm}:{normalized_text}"
-        now_ts = time.monotonic()
-        if (
-            key
-            and key == str(transcript_ui_dedupe.get("key") or "")
-            and (now_ts - float(transcript_ui_dedupe.get("ts") or 0.0)) < 1.2
+                await downlink.push(audio_bytes, speaker_name)
+                armed_at = float(first_audio_probe.get("armed_at") or 0.0)
+                if armed_at > 0:
+                    first_audio_probe["armed_at"] = 0.0
+                    path = str(first_audio_probe.get("path") or "")
+                    TURN_LATENCY.record(path, time.monotonic() - armed_at)
+                    print(f"[Latency] {TURN_LATENCY.format_line(path)}")
+                if speaker_name == "lumi":
+                    await asyncio.to_thread(lumi_push_stream.write, audio_bytes)
+                elif speaker_name == "rami":
+                    await asyncio.to_thread(rami_push_stream.write, audio_bytes)
+                ai_stt_flush.note_write(speaker_name)
+            except Exception as e:
+                print(f"[Server] Error sending audio for {speaker_name}: {e}")
+
+        async def flush_ai_stt(speaker_name: str):
+            # Turn over: send the partial last frame now instead of waiting for the tail timer.
+            downlink.flush()
+            ai_stt_flush.flush_now(speaker_name)
+
+        live_tool_turn = {"text": ""}
+        live_tool_executor = None
+        if LIVE_TOOL_MODE == "function_calling":
+            live_tool_executor = LiveToolExecutor(
+                execute_tools=_execute_tools_for_intent,
+                context_provider=lambda: {
+                    "lat": client_state.get("lat"),
+                    "lng": client_state.get("lng"),
+                    "env_cache": env_cache,
+                    "destination": destination_state.get("name"),
+                    "user_text": live_tool_turn["text"],
+                },
+                budget_sec=TURN_DEADLINE_SEC,
+                optional_reserve_sec=TURN_OPTIONAL_RESERVE_SEC,
+                latency_stats=TURN_LATENCY,
+                log=print,
+            )
+        lumi_rami_manager = LumiRamiManager(
+            ws_send_func=send_audio_to_client,
+            flush_stt_func=flush_ai_stt,
+            tool_executor=live_tool_executor,
+            audio_coalesce_ms=AUDIO_UPLINK_COALESCE_MS,
+            context_budget=(
+                ContextBudgetManager(
+                    compression=CONTEXT_WINDOW_COMPRESSION,
+                    trigger_tokens=CONTEXT_TRIGGER_TOKENS,
+                    target_tokens=CONTEXT_TARGET_TOKENS,
+                    log=print,
+                )
+                if CONTEXT_BUDGET
+                else None
+            ),
+            peer_settle_sec=PEER_TRANSCRIPT_SETTLE_SEC,
+            spawn=supervisor.spawn,
+        )
+
+        vision_service = VisionService(
+            min_interval_sec=CAMERA_FRAME_MIN_INTERVAL_SEC,
+            snapshot_ttl_sec=VISION_SNAPSHOT_TTL_SEC,
+            snapshot_buffer_bytes=VISION_SNAPSHOT_BUFFER_BYTES,
+            snapshot_min_interval_sec=VISION_SNAPSHOT_MIN_INTERVAL_SEC,
+            change_detector=(
+                FrameChangeDetector(
+                    min_interval_sec=CAMERA_FRAME_MIN_INTERVAL_SEC,
+                    max_interval_sec=VISION_STATIC_FRAME_INTERVAL_SEC,
+                    min_distance=VISION_CHANGE_MIN_DISTANCE,
+                    keepalive_sec=VISION_KEEPALIVE_SEC,
+                )
+                if VISION_CHANGE_DETECTION
+                else None
+            ),
+            log=print,
+        )
+        # "?camera=binary": camera frames arrive as binary messages (see vision_service.CAMERA_FRAME_HEADER).
+        camera_binary = wire["camera_binary"]
+        dynamic_contexts = []
+        dynamic_context_lock = asyncio.Lock()
+        session_ref = {"obj": None}
+    
+        import uuid
+        from datetime import datetime
+        global_seq = 0
+        conversation_id = f"c_{uuid.uuid4().hex[:8]}"
+        session_start_time = datetime.utcnow().isoformat() + "Z"
+
+        route_dedupe = {"text": "", "ts": 0.0}
+        user_turn_seq = {"id": 0, "corrected": 0}
+        speculative_prefetcher = SpeculativePrefetcher(
+            execute_tools=_execute_tools_for_intent,
+            stable_hits=SPECULATIVE_STABLE_HITS,
+            log=print,
+        )
+        first_audio_probe = {"armed_at": 0.0, "path": ""}
+        timer_set_dedupe = {"key": "", "ts": 0.0}
+        context_turn_dedupe = {"key": "", "ts": 0.0}
+        transcript_ui_dedupe = {"key": "", "ts": 0.0}
+        user_activity = {"last_user_ts": time.monotonic()}
+        speech_window_state = {"last_recognizing_ts": 0.0, "utterance_start_ts": 0.0}
+        default_transport_mode = "public"
+        if MORNING_BRIEFING is not None:
+            try:
+                default_transport_mode = MORNING_BRIEFING.get_default_transport_mode()
+            except Exception:
+                default_transport_mode = "public"
+        briefing_state = {
+            "wake_sent_date": "",
+            "test_wake_sent": False,
+            "leave_home_sent_date": "",
+            "leave_office_sent_date": "",
+            "last_leave_home_check_ts": 0.0,
+            "last_leave_office_check_ts": 0.0,
+            "awaiting_transport_choice": False,
+            "selected_transport": default_transport_mode,
+            "transport_choice_date": "",
+        }
+        transit_turn_gate = {"until": 0.0}
+        speech_capture_gate = {"until": 0.0}
+        response_guard = {
+            "active": False,
+            "context_sent": False,
+            "suppressed_audio_seen": False,
+            "block_direct_audio": False,
+            "block_direct_audio_until": 0.0,
+            "post_context_audio_hold_until": 0.0,
+            "active_since": 0.0,
+            "context_sent_at": 0.0,
+            "pending_intent": None,
+            "pending_context_summary": "",
+            "pending_action_instruction": "",
+            "pending_user_text": "",
+            "retry_issued": False,
+            "forced_intent_turn": None,
+        }
+
+        async def _inject_live_context_now(context_text: str, complete_turn: bool = False):
+            if not getattr(lumi_rami_manager, "running", False):
+                async with dynamic_context_lock:
+                    dynamic_contexts.append(context_text)
+                return
+            payload = "[LIVE_CONTEXT_UPDATE]\n" + context_text + "\nUse this for current answer."
+            queue_key = "text" if complete_turn else "context"
+            for name, q in lumi_rami_manager.queues.items():
+                await q.put((queue_key, payload))
+
+        proactive_service = ProactiveService(
+            response_guard=response_guard,
+            transit_turn_gate=transit_turn_gate,
+            inject_live_context_now=_inject_live_context_now,
+            log=print,
+        )
+
+        def _reset_response_gate(reason: str = ""):
+            proactive_service.reset_response_gate(reason)
+
+        async def _request_spoken_response_with_context(
+            intent_tag: str,
+            context_summary: str,
+            action_instruction: str,
+            tone: str = "neutral",
+            style: str = "",
+            complete_turn: bool = True,
         ):
-            return
-        transcript_ui_dedupe["key"] = key
-        transcript_ui_dedupe["ts"] = now_ts
+            try:
+                await proactive_service.request_spoken_response_with_context(
+                    intent_tag=intent_tag,
+                    context_summary=context_summary,
+                    action_instruction=action_instruction,
+                    tone=tone,
+                    style=style,
+                    complete_turn=complete_turn,
+                )
+                response_guard["context_sent"] = True
+                response_guard["context_sent_at"] = time.monotonic()
+            except Exception as e:
+                print(f"[Guard] context request failed: {e}")
+                _reset_response_gate("context request failed")
+
+        def _submit_coroutine(coro, label: str):
+            if not loop.is_running():
+                return None
+            fut = supervisor.submit_threadsafe(coro, label)
+            def _done_callback(f):
+                try:
+                    _ = f.result()
+                except Exception as ex:
+                    print(f"[Async:{label}] failed: {ex}")
+            fut.add_done_callback(_done_callback)
+            return fut
+
+        def _queue_transcript_event(role: str, text: str):
+            clean_text = str(text or "").strip()
+            if not clean_text:
+                return
+            role_norm = str(role or "").strip().lower()
+            if role_norm not in ("user", "lumi", "rami"):
+                role_norm = "ai"
+            normalized_text = re.sub(r"\s+", " ", clean_text)
+            key = f"{role_norm}:{normalized_text}"
+            now_ts = time.monotonic()
+            if (
+                key
+                and key == str(transcript_ui_dedupe.get("key") or "")
+                and (now_ts - float(transcript_ui_dedupe.get("ts") or 0.0)) < 1.2
+            ):
+                return
+            transcript_ui_dedupe["key"] = key
+            transcript_ui_dedupe["ts"] = now_ts
 
-        # Build message object for memory saving
-        nonlocal global_seq
-        created_at_str = datetime.utcnow().isoformat() + "Z"
+            # Build message object for memory saving
+            nonlocal global_seq
+            created_at_str = datetime.utcnow().isoformat() + "Z"
         
-        msg_obj = {
-            "message_id": f"msg_{conversation_id}_{(global_seq):03d}",
-            "conversation_id": conversation_id,
-            "seq": global_seq,
-            "speaker_type": "user" if role_norm == "user" else "ai",
-            "ai_persona": role_norm if (role_norm in ("lumi", "rami")) else None,
-            "text": clean_text,
-            "created_at": created_at_str
-        }
-        global_seq += 1
-        session_messages.append(msg_obj)
+            msg_obj = {
+                "message_id": f"msg_{conversation_id}_{(global_seq):03d}",
+                "conversation_id": conversation_id,
+                "seq": global_seq,
+                "speaker_type": "user" if role_norm == "user" else "ai",
+                "ai_persona": role_norm if (role_norm in ("lumi", "rami")) else None,
+                "text": clean_text,
+                "created_at": created_at_str
+            }
+            global_seq += 1
+            session_messages.append(msg_obj)
 
-        payload = json.dumps({"type": "transcript", "role": role_norm, "text": clean_text})
-        if loop.is_running():
-            asyncio.run_coroutine_threadsafe(ws.send_text(payload), loop)
-        else:
-            print(f"[Error] Main loop is closed. Cannot send STT: {clean_text}")
+            if loop.is_running():
+                ws_writer.send_transcript_threadsafe({"type": "transcript", "role": role_norm, "text": clean_text})
+            else:
+                print(f"[Error] Main loop is closed. Cannot send STT: {clean_text}")
 
-    async def _send_user_text_turn(user_text: str):
-        if not getattr(lumi_rami_manager, "running", False):
-            return
-        payload = [{"role": "user", "parts": [{"text": str(user_text or "")}]}]
-        for name, q in lumi_rami_manager.queues.items():
-            await q.put(("turns", payload))
+        async def _send_user_text_turn(user_text: str):
+            if not getattr(lumi_rami_manager, "running", False):
+                return
+            payload = [{"role": "user", "parts": [{"text": str(user_text or "")}]}]
+            for name, q in lumi_rami_manager.queues.items():
+                await q.put(("turns", payload))
 
-    async def _send_user_text_with_snapshot_turn(user_text: str, snapshot_bytes: bytes):
-        if not getattr(lumi_rami_manager, "running", False):
-            return
+        async def _normalize_image(image_bytes) -> bytes:
+            if IMAGE_NORMALIZER is None:
+                return bytes(image_bytes)
+            return await IMAGE_NORMALIZER.normalize(image_bytes)
+
+        async def _push_image_normalized(image_bytes):
+            await lumi_rami_manager.push_image(await _normalize_image(image_bytes))
+
+        async def _handle_multimodal_image(text: str, image_bytes: bytes):
+            await lumi_rami_manager.handle_multimodal_input(text, image_bytes=await _normalize_image(image_bytes))
+
+        async def _send_user_text_with_snapshot_turn(user_text: str, snapshot_bytes: bytes):
+            if not getattr(lumi_rami_manager, "running", False):
+                return
             
-        import base64 as _b64
-        frame_tag = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%H:%M:%S")
+            import base64 as _b64
+            frame_tag = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%H:%M:%S")
+            snapshot_bytes = await _normalize_image(snapshot_bytes)
         
-        # We append inline base64 string directly into prompt Turn instead of unreliable realtime_input.
-        b64_str = _b64.b64encode(snapshot_bytes).decode("utf-8")
-        parts = [
-            {
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": b64_str
-                }
-            },
-            {
-                "text": (
-                    "[VISION TURN]\n"
-                    f"Frame time: {frame_tag} KST.\n"
-                    "Prioritize the camera frame that was just uploaded.\n"
-                    "Only use memory if it does not conflict with the frame."
-                )
-            },
-            {"text": f"사용자: {str(user_text or '')}"}
-        ]
+            # We append inline base64 string directly into prompt Turn instead of unreliable realtime_input.
+            b64_str = _b64.b64encode(snapshot_bytes).decode("utf-8")
+            parts = [
+                {
+                    "inline_data": {
+                        "mime_type": "image/jpeg",
+                        "data": b64_str
+                    }
+                },
+                {
+                    "text": (
+                        "[VISION TURN]\n"
+                        f"Frame time: {frame_tag} KST.\n"
+                        "Prioritize the camera frame that was just uploaded.\n"
+                        "Only use memory if it does not conflict with the frame."
+                    )
+                },
+                {"text": f"사용자: {str(user_text or '')}"}
+            ]
         
-        payload = [{"role": "user", "parts": parts}]
-        for name, q in lumi_rami_manager.queues.items():
-            await q.put(("turns", payload))
-
-    async def _inject_guarded_context_turn(context_text: str):
-        try:
-            await _inject_live_context_now(context_text, complete_turn=True)
-            response_guard["context_sent"] = True
-            response_guard["context_sent_at"] = time.monotonic()
-        except Exception as e:
-            print(f"[Guard] guarded context inject failed: {e}")
-            _reset_response_gate("guarded context inject failed")
-
-    async def _send_proactive_announcement(
-        summary_text: str,
-        tone: str = "neutral",
-        style: str = "",
-        add_followup_hint: bool = True,
-        max_chars: int = 220,
-        max_sentences: int = 5,
-        split_by_sentence: bool = False,
-        chunk_max_sentences: int = 1,
-        chunk_max_chars: int = 180,
-    ):
-        await proactive_service.send_proactive_announcement(
-            summary_text=summary_text,
-            tone=tone,
-            style=style,
-            add_followup_hint=add_followup_hint,
-            max_chars=max_chars,
-            max_sentences=max_sentences,
-            split_by_sentence=False,
-            chunk_max_sentences=chunk_max_sentences,
-            chunk_max_chars=chunk_max_chars,
-        )
+            payload = [{"role": "user", "parts": parts}]
+            for name, q in lumi_rami_manager.queues.items():
+                await q.put(("turns", payload))
 
-    async def _on_timer_fired(delay_sec: int):
-        if delay_sec >= 60:
-            amount = max(1, delay_sec // 60)
-            unit = "분"
-        else:
-            amount = delay_sec
-            unit = "초"
-        await _send_proactive_announcement(
-            f"요청하신 {amount}{unit}이 지났어요. 다시 이야기할까요?",
-            tone="neutral",
-            add_followup_hint=False,
+        async def _inject_guarded_context_turn(context_text: str):
+            try:
+                await _inject_live_context_now(context_text, complete_turn=True)
+                response_guard["context_sent"] = True
+                response_guard["context_sent_at"] = time.monotonic()
+            except Exception as e:
+                print(f"[Guard] guarded context inject failed: {e}")
+                _reset_response_gate("guarded context inject failed")
+
+        async def _send_proactive_announcement(
+            summary_text: str,
+            tone: str = "neutral",
+            style: str = "",
+            add_followup_hint: bool = True,
+            max_chars: int = 220,
+            max_sentences: int = 5,
+            split_by_sentence: bool = False,
+            chunk_max_sentences: int = 1,
+            chunk_max_chars: int = 180,
+        ):
+            await proactive_service.send_proactive_announcement(
+                summary_text=summary_text,
+                tone=tone,
+                style=style,
+                add_followup_hint=add_followup_hint,
+                max_chars=max_chars,
+                max_sentences=max_sentences,
+                split_by_sentence=False,
+                chunk_max_sentences=chunk_max_sentences,
+                chunk_max_chars=chunk_max_chars,
+            )
+
+        async def _on_timer_fired(delay_sec: int):
+            if delay_sec >= 60:
+                amount = max(1, delay_sec // 60)
+                unit = "분"
+            else:
+                amount = delay_sec
+                unit = "초"
+            await _send_proactive_announcement(
+                f"요청하신 {amount}{unit}이 지났어요. 다시 이야기할까요?",
+                tone="neutral",
+                add_followup_hint=False,
+            )
+
+        timer_service = TimerService(
+            on_fire=_on_timer_fired,
+            log=print,
+        )
+        supervisor.add_closer("timers", timer_service.shutdown)
+
+        briefing_runtime = BriefingRuntimeService(
+            morning_briefing=MORNING_BRIEFING,
+            send_proactive_announcement=_send_proactive_announcement,
+            runtime_env_bool=runtime_env_utils.runtime_env_bool,
+            runtime_env_path=RUNTIME_ENV_PATH,
+            briefing_pre_ad_copy=BRIEFING_PRE_AD_COPY,
+            log=print,
         )
 
-    timer_service = TimerService(
-        on_fire=_on_timer_fired,
-        log=print,
-    )
+        async def _inject_initial_location_context():
+            if client_state.get("lat") is None or client_state.get("lng") is None:
+                return
+            try:
+                await _inject_live_context_now(
+                    "[INTENT:location_context] Current location coordinates are already known from device. "
+                    "Do not ask user's current location.",
+                    complete_turn=False,
+                )
+            except Exception as e:
+                print(f"[SeoulInfo] initial location context injection failed: {e}")
 
-    briefing_runtime = BriefingRuntimeService(
-        morning_briefing=MORNING_BRIEFING,
-        send_proactive_announcement=_send_proactive_announcement,
-        runtime_env_bool=runtime_env_utils.runtime_env_bool,
-        runtime_env_path=RUNTIME_ENV_PATH,
-        briefing_pre_ad_copy=BRIEFING_PRE_AD_COPY,
-        log=print,
-    )
+        async def _save_home_destination(new_home_destination: str):
+            dest = str(new_home_destination or "").strip()
+            if not dest:
+                return
+            try:
+                await asyncio.to_thread(
+                    cosmos_service.upsert_user_profile,
+                    user_id,
+                    {"home_destination": dest},
+                )
+            except Exception as e:
+                print(f"[Profile] Failed to save home destination: {e}")
 
-    async def _inject_initial_location_context():
-        if client_state.get("lat") is None or client_state.get("lng") is None:
-            return
-        try:
-            await _inject_live_context_now(
-                "[INTENT:location_context] Current location coordinates are already known from device. "
-                "Do not ask user's current location.",
-                complete_turn=False,
+        async def _preload_env_cache(force: bool = False):
+            lat = client_state.get("lat")
+            lng = client_state.get("lng")
+            if lat is None or lng is None:
+                return
+            fresh = _is_env_cache_fresh(env_cache, lat, lng)
+            if fresh and not force:
+                return
+            try:
+                weather, air = await asyncio.to_thread(_get_weather_and_air, lat, lng)
+                env_cache["weather"] = weather or {}
+                env_cache["air"] = air or {}
+                env_cache["lat"] = lat
+                env_cache["lng"] = lng
+                env_cache["ts"] = time.monotonic()
+                print(
+                    f"[SeoulInfo] Env cache refreshed: "
+                    f"weather={bool(env_cache['weather'])}, air={bool(env_cache['air'])}"
+                )
+            except Exception as e:
+                print(f"[SeoulInfo] Env cache refresh failed: {e}")
+
+        def _dispatch_live_context_turn(intent: str, live_summary: str | None, text: str, intents=None) -> bool:
+            transit_intents = ws_orchestrator.TRANSIT_INTENTS
+            has_transit = intent in transit_intents or bool(set(intents or []) & transit_intents)
+            guidance = []
+            if client_state.get("lat") is not None and client_state.get("lng") is not None:
+                guidance.append("Location is known; do not ask user's current location.")
+            if intents and len(intents) > 1:
+                guidance.append(
+                    f"The user asked for several things at once ({', '.join(intents)}); "
+                    "answer each part briefly in that order in this single reply."
+                )
+            if has_transit and destination_state.get("name"):
+                guidance.append(
+                    f"Use destination '{destination_state['name']}' for this turn and ignore older destination context."
+                )
+            if (
+                not destination_state.get("name")
+                and has_transit
+            ):
+                if not destination_state.get("asked_once", False):
+                    guidance.append("Ask destination exactly once in one short question.")
+                    destination_state["asked_once"] = True
+                else:
+                    guidance.append("Destination still missing; do not repeat destination question.")
+
+            if not live_summary:
+                live_summary = "현재 요청하신 정보를 받을 수 없습니다."
+
+            context_priority_intents = ws_orchestrator.CONTEXT_PRIORITY_INTENTS
+            context_summary = ws_orchestrator.merge_context_summary(
+                live_summary=live_summary,
+                guidance=guidance,
             )
-        except Exception as e:
-            print(f"[SeoulInfo] initial location context injection failed: {e}")
-
-    async def _save_home_destination(new_home_destination: str):
-        dest = str(new_home_destination or "").strip()
-        if not dest:
-            return
-        try:
-            await asyncio.to_thread(
-                cosmos_service.upsert_user_profile,
-                user_id,
-                {"home_destination": dest},
+            action_instruction = ws_orchestrator.build_action_instruction(intent)
+
+            if intent in context_priority_intents:
+                # Keep gate a little longer while response turn is being finalized.
+                ws_orchestrator.extend_post_context_gate(transit_turn_gate)
+
+            if not loop.is_running():
+                return False
+            # Suppress near-duplicate context turns generated by STT split finalization.
+            normalized_summary = re.sub(r"\s+", " ", str(context_summary or "")).strip()[:220]
+            dedupe_key = f"{intent}|{normalized_summary}"
+            now_ctx_ts = time.monotonic()
+            if (
+                dedupe_key
+                and dedupe_key == str(context_turn_dedupe.get("key") or "")
+                and (now_ctx_ts - float(context_turn_dedupe.get("ts") or 0.0)) < 8.0
+            ):
+                print(f"[Guard] duplicate context turn skipped: intent={intent}")
+                return False
+            context_turn_dedupe["key"] = dedupe_key
+            context_turn_dedupe["ts"] = now_ctx_ts
+            response_guard["pending_intent"] = (intent or "commute_overview")
+            response_guard["pending_context_summary"] = context_summary
+            response_guard["pending_action_instruction"] = action_instruction
+            response_guard["pending_user_text"] = str(text or "").strip()
+            _submit_coroutine(
+                _request_spoken_response_with_context(
+                    intent_tag=(intent or "commute_overview"),
+                    context_summary=context_summary,
+                    action_instruction=action_instruction,
+                    tone="neutral",
+                    complete_turn=(intent in context_priority_intents),
+                ),
+                label=f"context_turn:{intent}",
             )
-        except Exception as e:
-            print(f"[Profile] Failed to save home destination: {e}")
-
-    async def _preload_env_cache(force: bool = False):
-        lat = client_state.get("lat")
-        lng = client_state.get("lng")
-        if lat is None or lng is None:
-            return
-        fresh = _is_env_cache_fresh(env_cache, lat, lng)
-        if fresh and not force:
-            return
-        try:
-            weather, air = await asyncio.to_thread(_get_weather_and_air, lat, lng)
-            env_cache["weather"] = weather or {}
-            env_cache["air"] = air or {}
-            env_cache["lat"] = lat
-            env_cache["lng"] = lng
-            env_cache["ts"] = time.monotonic()
+            return True
+
+        def _finalize_live_summary(intent: str, live_data, text: str, features=None) -> str | None:
+            live_summary = live_data.get("speechSummary") if isinstance(live_data, dict) else None
+            # Strict fail-closed behavior for API-backed intents:
+            # if data is unavailable, do not provide alternative guidance.
+            api_backed_intents = {"subway_route", "bus_route", "commute_overview", "weather", "air_quality", "restaurant", "news"}
+            if intent in api_backed_intents:
+                if not isinstance(live_data, dict):
+                    live_summary = "현재 요청하신 정보를 받을 수 없습니다."
+                elif not str(live_data.get("speechSummary") or "").strip():
+                    live_summary = "현재 요청하신 정보를 받을 수 없습니다."
+
+            # If user asked congestion specifically, do not fallback to route guidance.
+            if intent in {"subway_route", "commute_overview"} and _is_congestion_query(text, features=features):
+                cong = live_data.get("subwayCongestion") if isinstance(live_data, dict) else None
+                least_car = str(cong.get("leastCar") or "").strip() if isinstance(cong, dict) else ""
+                if not least_car:
+                    live_summary = "현재 지하철 혼잡도 정보를 받을 수 없습니다."
+            compound_intents = live_data.get("intents") if isinstance(live_data, dict) else None
+            if intent == "news" or "news" in (compound_intents or []):
+                news_meta = live_data.get("news") if isinstance(live_data, dict) else None
+                if isinstance(news_meta, dict):
+                    news_state["topic"] = str(news_meta.get("topic") or "").strip()
+                    items = news_meta.get("items") or []
+                    if isinstance(items, list):
+                        news_state["items"] = [i for i in items if isinstance(i, dict)]
+                    else:
+                        news_state["items"] = []
+                    news_state["selected"] = None
+                    news_state["ts"] = time.monotonic()
+            return live_summary
+
+        def _correct_turn_with_late_route(text: str, late_route: dict, acted_route: dict, turn_id: int):
+            # Runs off the event loop: the corrected fetch blocks like any other live-tool turn.
+            intent = late_route.get("intent")
+            if int(user_turn_seq.get("id") or 0) != turn_id:
+                print(f"[IntentRouter] late correction dropped: newer user turn (intent={intent})")
+                return
+            dest = str(late_route.get("destination") or "").strip()
+            if dest:
+                destination_state["name"] = dest
+                destination_state["asked_once"] = False
+            if bool(late_route.get("home_update")) and dest:
+                _submit_coroutine(_save_home_destination(dest), label="save_home")
+                print(f"[Profile] Home destination updated in-session: {dest}")
+            if intent == acted_route.get("intent"):
+                return
+            if intent not in ws_orchestrator.ROUTING_INTENTS:
+                # The keyword fallback started a data turn for what the LLM calls conversation.
+                if response_guard.get("context_sent"):
+                    print(f"[IntentRouter] late correction too late: fallback turn already answered (intent={intent})")
+                    return
+                user_turn_seq["corrected"] = turn_id
+                _reset_response_gate(f"late LLM route {intent}: fallback data turn dropped")
+                if (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT) and loop.is_running():
+                    supervisor.submit_threadsafe(_send_user_text_turn(text), "user_text_turn")
+                print(f"[IntentRouter] late correction applied: intent={intent}, fallback data turn suppressed")
+                return
+            ws_orchestrator.arm_live_response_gate(
+                response_guard=response_guard,
+                transit_turn_gate=transit_turn_gate,
+                intent=intent,
+            )
+            response_guard["active_since"] = time.monotonic()
+            response_guard["context_sent_at"] = 0.0
+            response_guard["retry_issued"] = False
+            context_destination = destination_state["name"] if intent in ws_orchestrator.TRANSIT_INTENTS else None
+            deadline = TurnDeadline(TURN_DEADLINE_SEC, optional_reserve_sec=TURN_OPTIONAL_RESERVE_SEC)
+            live_data = _execute_tools_for_intent(
+                intent=intent,
+                lat=client_state.get("lat"),
+                lng=client_state.get("lng"),
+                destination_name=context_destination,
+                env_cache=env_cache,
+                user_text=text,
+                deadline=deadline,
+            )
+            if int(user_turn_seq.get("id") or 0) != turn_id:
+                print(f"[IntentRouter] late correction dropped after fetch: newer user turn (intent={intent})")
+                return
+            live_summary = _finalize_live_summary(intent, live_data, text)
+            user_turn_seq["corrected"] = turn_id
             print(
-                f"[SeoulInfo] Env cache refreshed: "
-                f"weather={bool(env_cache['weather'])}, air={bool(env_cache['air'])}"
+                f"[IntentRouter] late correction applied: intent={intent}, destination={context_destination}, "
+                f"elapsed={deadline.elapsed():.2f}s"
             )
-        except Exception as e:
-            print(f"[SeoulInfo] Env cache refresh failed: {e}")
+            _dispatch_live_context_turn(intent, live_summary, text)
+
+        def _route_with_budget(text: str, turn_id: int, features=None):
+            active_timer = timer_service.has_active()
+            if not loop.is_running():
+                return intent_router.route(text, active_timer=active_timer)
+
+            def _on_late_correction(late_route: dict, acted_route: dict):
+                # Called on the loop; a closed supervisor drops the correction instead of starting it.
+                supervisor.spawn(
+                    asyncio.to_thread(_correct_turn_with_late_route, text, late_route, acted_route, turn_id),
+                    "late_route_correction",
+                )
 
-    # STT Event Handlers
-    def on_recognized(args, role):
-        if args.result.text:
-            text = args.result.text
-            print(f"[STT] {role}: {text}")
-            _queue_transcript_event(role, text)
+            fut = supervisor.submit_threadsafe(
+                intent_router.route_hedged(
+                    text,
+                    active_timer=active_timer,
+                    on_late_correction=_on_late_correction,
+                    features=features,
+                ),
+                "route",
+            )
+            # Budget 0 means "wait for the LLM": no cap here either.
+            wait_sec = INTENT_ROUTER_BUDGET_SEC + 0.5 if INTENT_ROUTER_BUDGET_SEC > 0 else None
+            try:
+                return fut.result(timeout=wait_sec)
+            except Exception as e:
+                fut.cancel()
+                print(f"[IntentRouter] hedged route failed: {e}")
+                return intent_router._budget_fallback(text, active_timer=active_timer, features=features)
+
+        def _speculation_key(intent: str | None, destination_name: str | None, text: str, features=None):
+            if intent in ws_orchestrator.TRANSIT_INTENTS:
+                is_schedule = _is_schedule_query(text, features=features)
+                return (
+                    intent,
+                    _normalize_place_name(destination_name),
+                    _is_arrival_eta_query(text, features=features),
+                    is_schedule,
+                    _extract_schedule_search_dttm(text)[0] if is_schedule else "",
+                    route_text_utils.extract_station_mention(text) or "",
+                )
+            if intent in {"weather", "air_quality"}:
+                return (intent,)
+            if intent == "news":
+                return (intent, str(_extract_news_topic_from_text(text) or "").strip())
+            if intent == "restaurant":
+                return (intent, _extract_restaurant_keyword(text))
+            return None
 
-            if role == "user":
-                try:
-                    user_activity["last_user_ts"] = time.monotonic()
-                    speech_capture_gate["until"] = max(
-                        float(speech_capture_gate.get("until") or 0.0),
-                        time.monotonic() + 1.0,
-                    )
+        def _speculate_on_partial(text: str):
+            # Mirrors the routing in on_recognized closely enough to pre-warm data-backed intents.
+            features = extract_text_features(text)
+            route = _fast_route_intent(text, active_timer=timer_service.has_active(), features=features)
+            if not route and NGRAM_CLASSIFIER is not None:
+                route = NGRAM_CLASSIFIER.route(text, active_timer=timer_service.has_active())
+            intent = route.get("intent") if isinstance(route, dict) else None
+            dest = (route.get("destination") if isinstance(route, dict) else None) or features.destination
+            if intent is None and dest and features.has("route_words"):
+                intent = "commute_overview"
+            if intent not in SpeculativePrefetcher.DATA_INTENTS:
+                speculative_prefetcher.observe(None, None)
+                return
+            context_destination = None
+            if intent in ws_orchestrator.TRANSIT_INTENTS:
+                context_destination = str(dest or "").strip() or destination_state.get("name")
+            speculative_prefetcher.observe(
+                _speculation_key(intent, context_destination, text, features=features),
+                intent,
+                tool_kwargs={
+                    "intent": intent,
+                    "lat": client_state.get("lat"),
+                    "lng": client_state.get("lng"),
+                    "destination_name": context_destination,
+                    "env_cache": env_cache,
+                    "user_text": text,
+                    "deadline": TurnDeadline(TURN_DEADLINE_SEC, optional_reserve_sec=TURN_OPTIONAL_RESERVE_SEC),
+                },
+            )
 
-                    normalized_user_text = re.sub(r"[\s\W_]+", "", str(text or ""))
-                    now_ts = time.monotonic()
-                    utterance_start_ts = float(speech_window_state.get("utterance_start_ts") or 0.0)
-                    if utterance_start_ts <= 0:
-                        utterance_start_ts = max(0.0, now_ts - 2.0)
-
-                    camera_on = bool(vision_service.camera_state.get("enabled", False))
-                    explicit_vision = _is_vision_related_query(text)
-                    inferred_vision = camera_on and _is_vision_followup_utterance(text)
-                    is_vision_query = explicit_vision or inferred_vision
-                    snapshot_bytes = (
-                        vision_service.get_snapshot_for_speech_window(
-                            utterance_start_ts=utterance_start_ts,
-                            utterance_end_ts=now_ts,
-                            pre_roll_sec=2.0,
-                            max_age_sec=12.0,
+        # STT Event Handlers
+        def _hand_turn_to_live_tools(text: str, turn_deadline: TurnDeadline, features=None):
+            # Keep destination/home state current: it is the tools' default when Gemini omits a destination.
+            dest = features.destination if features is not None else _extract_destination_from_text(text)
+            if dest:
+                destination_state["name"] = str(dest).strip()
+                destination_state["asked_once"] = False
+                if _is_home_update_utterance(text, features=features) and loop.is_running():
+                    _submit_coroutine(_save_home_destination(destination_state["name"]), label="save_home")
+                    print(f"[Profile] Home destination updated in-session: {destination_state['name']}")
+            live_tool_turn["text"] = text
+            first_audio_probe["armed_at"] = turn_deadline.started_at
+            first_audio_probe["path"] = "first_audio:function_calling"
+            if (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT) and loop.is_running():
+                _submit_coroutine(_send_user_text_turn(text), label="function_calling_turn")
+            print(f"[LiveTool] turn handed to Gemini function calling: {text}")
+
+        def on_recognized(args, role):
+            if args.result.text:
+                text = args.result.text
+                print(f"[STT] {role}: {text}")
+                _queue_transcript_event(role, text)
+
+                if role == "user":
+                    try:
+                        # Budget for the whole turn (routing + live fetches) starts at STT finalization.
+                        turn_deadline = TurnDeadline(
+                            TURN_DEADLINE_SEC,
+                            optional_reserve_sec=TURN_OPTIONAL_RESERVE_SEC,
                         )
-                        if camera_on
-                        else None
-                    )
-                    speech_window_state["utterance_start_ts"] = 0.0
-                    if is_vision_query and snapshot_bytes and loop.is_running():
-                        _submit_coroutine(
-                            _send_user_text_with_snapshot_turn(text, snapshot_bytes),
-                            label="vision_turn_with_snapshot",
+                        # One keyword pass per utterance; every detector below reads these flags.
+                        turn_features = extract_text_features(text)
+                        user_turn_seq["id"] = int(user_turn_seq.get("id") or 0) + 1
+                        turn_id = user_turn_seq["id"]
+                        user_activity["last_user_ts"] = time.monotonic()
+                        speech_capture_gate["until"] = max(
+                            float(speech_capture_gate.get("until") or 0.0),
+                            time.monotonic() + 1.0,
                         )
-                        return
-                    # Azure STT can emit near-duplicate finalized chunks; skip fast duplicates.
-                    if (
-                        normalized_user_text
-                        and normalized_user_text == route_dedupe.get("text")
-                        and (now_ts - float(route_dedupe.get("ts") or 0.0)) < 1.5
-                    ):
-                        print(f"[IntentRouter] skip duplicate user turn: {text}")
-                        return
-                    route_dedupe["text"] = normalized_user_text
-                    route_dedupe["ts"] = now_ts
-
-                    transport_pick = briefing_runtime.apply_transport_choice(briefing_state, text)
-                    if transport_pick.get("handled"):
-                        if loop.is_running():
+
+                        normalized_user_text = re.sub(r"[\s\W_]+", "", str(text or ""))
+                        now_ts = time.monotonic()
+                        utterance_start_ts = float(speech_window_state.get("utterance_start_ts") or 0.0)
+                        if utterance_start_ts <= 0:
+                            utterance_start_ts = max(0.0, now_ts - 2.0)
+
+                        camera_on = bool(vision_service.camera_state.get("enabled", False))
+                        explicit_vision = _is_vision_related_query(text, features=turn_features)
+                        inferred_vision = camera_on and _is_vision_followup_utterance(text, features=turn_features)
+                        is_vision_query = explicit_vision or inferred_vision
+                        snapshot_bytes = (
+                            vision_service.get_snapshot_for_speech_window(
+                                utterance_start_ts=utterance_start_ts,
+                                utterance_end_ts=now_ts,
+                                pre_roll_sec=2.0,
+                                max_age_sec=12.0,
+                            )
+                            if camera_on
+                            else None
+                        )
+                        speech_window_state["utterance_start_ts"] = 0.0
+                        if is_vision_query and snapshot_bytes and loop.is_running():
+                            speculative_prefetcher.cancel("vision turn")
                             _submit_coroutine(
-                                _send_proactive_announcement(
-                                    summary_text=str(transport_pick.get("ack_text") or ""),
-                                    tone="neutral",
-                                    add_followup_hint=False,
-                                    max_chars=80,
-                                    max_sentences=2,
-                                ),
-                                label="transport_choice_ack",
+                                _send_user_text_with_snapshot_turn(text, snapshot_bytes),
+                                label="vision_turn_with_snapshot",
                             )
-                        if bool(transport_pick.get("should_short_circuit")):
                             return
+                        # Azure STT can emit near-duplicate finalized chunks; skip fast duplicates.
+                        if (
+                            normalized_user_text
+                            and normalized_user_text == route_dedupe.get("text")
+                            and (now_ts - float(route_dedupe.get("ts") or 0.0)) < 1.5
+                        ):
+                            print(f"[IntentRouter] skip duplicate user turn: {text}")
+                            speculative_prefetcher.cancel("duplicate turn")
+                            return
+                        route_dedupe["text"] = normalized_user_text
+                        route_dedupe["ts"] = now_ts
 
-                    route = _fast_route_intent(text, active_timer=timer_service.has_active())
-                    if not route:
-                        route = intent_router.route(text, active_timer=timer_service.has_active())
-                    intent = route.get("intent") if isinstance(route, dict) else "commute_overview"
-                    routed_dest = route.get("destination") if isinstance(route, dict) else None
-                    routed_home_update = bool(route.get("home_update")) if isinstance(route, dict) else False
-                    routed_timer_seconds = route.get("timer_seconds") if isinstance(route, dict) else None
-                    route_source = route.get("source") if isinstance(route, dict) else "fallback"
-                    print(
-                        f"[IntentRouter] source={route_source}, intent={intent}, "
-                        f"destination={routed_dest}, home_update={routed_home_update}, "
-                        f"timer_seconds={routed_timer_seconds}"
-                    )
-                    if intent == "timer_cancel" and (not timer_service.has_active()):
-                        # Timer cancel intent is only meaningful while a timer is active.
-                        intent = "general"
-                    if intent == "timer_cancel" and timer_service.has_active():
-                        canceled = timer_service.cancel_all()
-                        # Force a single controlled response turn; suppress direct audio turn.
-                        response_guard["active"] = True
-                        response_guard["context_sent"] = False
-                        response_guard["suppressed_audio_seen"] = False
-                        response_guard["block_direct_audio"] = True
-                        response_guard["active_since"] = time.monotonic()
-                        response_guard["context_sent_at"] = 0.0
-                        response_guard["block_direct_audio_until"] = max(
-                            float(response_guard.get("block_direct_audio_until") or 0.0),
-                            time.monotonic() + 4.0,
-                        )
-                        _submit_coroutine(
-                            _inject_guarded_context_turn(
-                                f"[INTENT:timer_canceled] Canceled {canceled} active timer(s). "
-                                "Acknowledge cancellation briefly in Korean, then answer the user's current request directly."
-                            ),
-                            label="timer_cancel",
-                        )
-                        # Let the same user utterance proceed naturally after cancel notice.
-                        # Do not run live-tool routing for this branch.
-                        return
-                    if intent == "timer" and loop.is_running():
-                        timer_sec = None
-                        try:
-                            timer_sec = int(routed_timer_seconds) if routed_timer_seconds is not None else None
-                        except Exception:
-                            timer_sec = None
-                        if timer_sec is not None and 5 <= timer_sec <= 21600:
-                            # Prevent duplicate "timer set" responses from near-duplicate STT finalization.
-                            timer_key = f"{timer_sec}:{normalized_user_text}"
-                            now_timer_ts = time.monotonic()
-                            if (
-                                timer_key
-                                and timer_key == str(timer_set_dedupe.get("key") or "")
-                                and (now_timer_ts - float(timer_set_dedupe.get("ts") or 0.0)) < 2.5
-                            ):
-                                print(f"[Timer] duplicate timer_set skipped: {timer_sec}s")
+                        transport_pick = briefing_runtime.apply_transport_choice(briefing_state, text)
+                        if transport_pick.get("handled"):
+                            if loop.is_running():
+                                _submit_coroutine(
+                                    _send_proactive_announcement(
+                                        summary_text=str(transport_pick.get("ack_text") or ""),
+                                        tone="neutral",
+                                        add_followup_hint=False,
+                                        max_chars=80,
+                                        max_sentences=2,
+                                    ),
+                                    label="transport_choice_ack",
+                                )
+                            if bool(transport_pick.get("should_short_circuit")):
+                                speculative_prefetcher.cancel("transport choice")
                                 return
-                            timer_set_dedupe["key"] = timer_key
-                            timer_set_dedupe["ts"] = now_timer_ts
 
-                            # Force a single controlled timer-set response.
+                        route_started_at = time.monotonic()
+                        route = _fast_route_intent(text, active_timer=timer_service.has_active(), features=turn_features)
+                        if route:
+                            TURN_LATENCY.record("route:fast", time.monotonic() - route_started_at)
+                        if LIVE_TOOL_MODE == "function_calling" and (route or {}).get("intent") not in {"timer", "timer_cancel"}:
+                            # Timers need server state and stay on the router path; everything else is Gemini's call.
+                            _hand_turn_to_live_tools(text, turn_deadline, features=turn_features)
+                            return
+                        if not route:
+                            if NGRAM_CLASSIFIER is not None:
+                                route = NGRAM_CLASSIFIER.route(text, active_timer=timer_service.has_active())
+                            if route:
+                                TURN_LATENCY.record("route:ngram", time.monotonic() - route_started_at)
+                            else:
+                                route = _route_with_budget(text, turn_id, features=turn_features)
+                        intent = route.get("intent") if isinstance(route, dict) else "commute_overview"
+                        routed_dest = route.get("destination") if isinstance(route, dict) else None
+                        routed_home_update = bool(route.get("home_update")) if isinstance(route, dict) else False
+                        routed_timer_seconds = route.get("timer_seconds") if isinstance(route, dict) else None
+                        route_source = route.get("source") if isinstance(route, dict) else "fallback"
+                        print(
+                            f"[IntentRouter] source={route_source}, intent={intent}, "
+                            f"destination={routed_dest}, home_update={routed_home_update}, "
+                            f"timer_seconds={routed_timer_seconds}"
+                        )
+                        if intent == "timer_cancel" and (not timer_service.has_active()):
+                            # Timer cancel intent is only meaningful while a timer is active.
+                            intent = "general"
+                        if intent in {"timer", "timer_cancel"}:
+                            speculative_prefetcher.cancel("timer turn")
+                        if intent == "timer_cancel" and timer_service.has_active():
+                            canceled = timer_service.cancel_all()
+                            # Force a single controlled response turn; suppress direct audio turn.
                             response_guard["active"] = True
                             response_guard["context_sent"] = False
                             response_guard["suppressed_audio_seen"] = False
                             response_guard["block_direct_audio"] = True
                             response_guard["active_since"] = time.monotonic()
                             response_guard["context_sent_at"] = 0.0
-                            response_guard["retry_issued"] = False
                             response_guard["block_direct_audio_until"] = max(
                                 float(response_guard.get("block_direct_audio_until") or 0.0),
                                 time.monotonic() + 4.0,
                             )
-                            transit_turn_gate["until"] = max(
-                                float(transit_turn_gate.get("until") or 0.0),
-                                time.monotonic() + 1.1,
-                            )
                             _submit_coroutine(
                                 _inject_guarded_context_turn(
-                                    (
-                                        f"[INTENT:timer_set] Timer seconds={timer_sec}. "
-                                        "Confirm timer set in one short Korean sentence. "
-                                        "Do not repeat the same timer confirmation."
-                                    )
+                                    f"[INTENT:timer_canceled] Canceled {canceled} active timer(s). "
+                                    "Acknowledge cancellation briefly in Korean, then answer the user's current request directly."
                                 ),
-                                label="timer_set",
-                            )
-                            asyncio.run_coroutine_threadsafe(
-                                timer_service.register(timer_sec),
-                                loop,
-                            )
-                            print(f"[Timer] timer_set accepted: {timer_sec}s")
-                        else:
-                            print("[Timer] timer_set rejected: invalid timer_seconds")
-                        return
-
-                    # News detail/follow-up inference from recently fetched news items.
-                    has_recent_news = (
-                        bool(news_state.get("items"))
-                        and (now_ts - float(news_state.get("ts") or 0.0)) < 900
-                    )
-                    if has_recent_news and intent in {"general", "news"}:
-                        wants_detail = _is_news_detail_query(text)
-                        wants_followup = _is_news_followup_query(text)
-                        if wants_detail or wants_followup:
-                            matched_item = _select_news_item_by_text(
-                                text=text,
-                                items=(news_state.get("items") or []),
+                                label="timer_cancel",
                             )
-                            if matched_item is None and wants_followup:
-                                matched_item = news_state.get("selected")
-                            # Detail request without explicit match:
-                            # keep conversation in current news context instead of re-fetching generic news.
-                            if matched_item is None and wants_detail:
-                                matched_item = news_state.get("selected") or ((news_state.get("items") or [None])[0])
-                            if matched_item is not None:
-                                news_state["selected"] = matched_item
-                                intent = "news_detail" if wants_detail else "news_followup"
-
-                    # LLM-first: only use regex destination extraction when fallback routing is active.
-                    if route_source == "llm":
-                        dest = routed_dest
-                    else:
-                        dest = routed_dest or _extract_destination_from_text(text)
-                    # If destination is explicitly mentioned with route-like wording, prefer route intent.
-                    if dest and intent == "general" and any(k in text for k in ["길", "경로", "가는"]):
-                        intent = "commute_overview"
-                    if dest:
-                        next_dest = str(dest).strip()
-                        if next_dest and next_dest != destination_state.get("name"):
-                            destination_state["name"] = next_dest
-                        destination_state["asked_once"] = False
-
-                    # Persist home destination only when classifier says this is a home update utterance.
-                    if routed_home_update or (route_source != "llm" and _is_home_update_utterance(text)):
-                        home_candidate = str(dest or "").strip()
-                        # Fallback: If LLM missed the destination but flagged home_update=True, try regex extraction
-                        if not home_candidate:
-                            home_candidate = str(_extract_destination_from_text(text) or "").strip()
-                            
-                        if home_candidate:
-                            destination_state["name"] = home_candidate
-                            destination_state["asked_once"] = False
-                            if loop.is_running():
+                            # Let the same user utterance proceed naturally after cancel notice.
+                            # Do not run live-tool routing for this branch.
+                            return
+                        if intent == "timer" and loop.is_running():
+                            timer_sec = None
+                            try:
+                                timer_sec = int(routed_timer_seconds) if routed_timer_seconds is not None else None
+                            except Exception:
+                                timer_sec = None
+                            if timer_sec is not None and 5 <= timer_sec <= 21600:
+                                # Prevent duplicate "timer set" responses from near-duplicate STT finalization.
+                                timer_key = f"{timer_sec}:{normalized_user_text}"
+                                now_timer_ts = time.monotonic()
+                                if (
+                                    timer_key
+                                    and timer_key == str(timer_set_dedupe.get("key") or "")
+                                    and (now_timer_ts - float(timer_set_dedupe.get("ts") or 0.0)) < 2.5
+                                ):
+                                    print(f"[Timer] duplicate timer_set skipped: {timer_sec}s")
+                                    return
+                                timer_set_dedupe["key"] = timer_key
+                                timer_set_dedupe["ts"] = now_timer_ts
+
+                                # Force a single controlled timer-set response.
+                                response_guard["active"] = True
+                                response_guard["context_sent"] = False
+                                response_guard["suppressed_audio_seen"] = False
+                                response_guard["block_direct_audio"] = True
+                                response_guard["active_since"] = time.monotonic()
+                                response_guard["context_sent_at"] = 0.0
+                                response_guard["retry_issued"] = False
+                                response_guard["block_direct_audio_until"] = max(
+                                    float(response_guard.get("block_direct_audio_until") or 0.0),
+                                    time.monotonic() + 4.0,
+                                )
+                                transit_turn_gate["until"] = max(
+                                    float(transit_turn_gate.get("until") or 0.0),
+                                    time.monotonic() + 1.1,
+                                )
                                 _submit_coroutine(
-                                    _save_home_destination(home_candidate),
-                                    label="save_home",
+                                    _inject_guarded_context_turn(
+                                        (
+                                            f"[INTENT:timer_set] Timer seconds={timer_sec}. "
+                                            "Confirm timer set in one short Korean sentence. "
+                                            "Do not repeat the same timer confirmation."
+                                        )
+                                    ),
+                                    label="timer_set",
                                 )
-                            print(f"[Profile] Home destination updated in-session: {home_candidate}")
-
-                    live_summary = None
-                    routing_intents = ws_orchestrator.ROUTING_INTENTS
-                    should_inject_live = intent in routing_intents
-
-                    if should_inject_live:
-                        # Always gate response until live context is injected to prevent pre-context utterances.
-                        ws_orchestrator.arm_live_response_gate(
-                            response_guard=response_guard,
-                            transit_turn_gate=transit_turn_gate,
-                            intent=intent,
-                        )
-                        response_guard["active_since"] = time.monotonic()
-                        response_guard["context_sent_at"] = 0.0
-                        response_guard["retry_issued"] = False
-                        if client_state.get("lat") is not None and client_state.get("lng") is not None and loop.is_running():
-                            asyncio.run_coroutine_threadsafe(
-                                _inject_live_context_now(
-                                    "[INTENT:location_guard] Device location is already known and valid for this turn. "
-                                    "Do not ask user location.",
-                                    complete_turn=False,
-                                ),
-                                loop,
-                            )
+                                supervisor.submit_threadsafe(timer_service.register(timer_sec), "timer_register")
+                                print(f"[Timer] timer_set accepted: {timer_sec}s")
+                            else:
+                                print("[Timer] timer_set rejected: invalid timer_seconds")
+                            return
 
-                        # For transit queries that require live API fetch, speak a short filler first.
-                        # This reduces awkward silence while ODSAY/Seoul APIs are being fetched.
-                        if (
-                            (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT)
-                            and ENABLE_TRANSIT_FILLER
-                            and intent in {"subway_route", "bus_route", "commute_overview"}
-                            and loop.is_running()
-                        ):
-                            filler_text = (
-                                "[INTENT:loading] The user requested live transit guidance. "
-                                "First, say one short Korean filler sentence naturally "
-                                "(e.g., '음, 잠시만요. 지금 확인해볼게요.'). "
-                                "Do not provide route details yet. "
-                                "Do not ask for user location."
-                            )
-                            asyncio.run_coroutine_threadsafe(
-                                _inject_live_context_now(filler_text, complete_turn=True),
-                                loop,
+                        # News detail/follow-up inference from recently fetched news items.
+                        has_recent_news = (
+                            bool(news_state.get("items"))
+                            and (now_ts - float(news_state.get("ts") or 0.0)) < 900
+                        )
+                        if has_recent_news and intent in {"general", "news"}:
+                            wants_detail = _is_news_detail_query(text, features=turn_features)
+                            wants_followup = _is_news_followup_query(text, features=turn_features)
+                            if wants_detail or wants_followup:
+                                matched_item = _select_news_item_by_text(
+                                    text=text,
+                                    items=(news_state.get("items") or []),
+                                )
+                                if matched_item is None and wants_followup:
+                                    matched_item = news_state.get("selected")
+                                # Detail request without explicit match:
+                                # keep conversation in current news context instead of re-fetching generic news.
+                                if matched_item is None and wants_detail:
+                                    matched_item = news_state.get("selected") or ((news_state.get("items") or [None])[0])
+                                if matched_item is not None:
+                                    news_state["selected"] = matched_item
+                                    intent = "news_detail" if wants_detail else "news_followup"
+
+                        routed_intents = route.get("intents") if isinstance(route, dict) else None
+                        routed_intents = [i for i in (routed_intents or []) if isinstance(i, dict)]
+                        if routed_intents:
+                            # Compound turn: the destination belongs to its transit leg, not the whole utterance.
+                            routed_dest = next(
+                                (i.get("destination") for i in routed_intents if i.get("intent") in ws_orchestrator.TRANSIT_INTENTS),
+                                None,
                             )
-                        transit_intents = ws_orchestrator.TRANSIT_INTENTS
-                        context_destination = destination_state["name"] if intent in transit_intents else None
-                        if intent in {"news_detail", "news_followup"}:
-                            picked = news_state.get("selected")
-                            if picked is None and news_state.get("items"):
-                                picked = _select_news_item_by_text(text=text, items=(news_state.get("items") or []))
-                            if picked is None and news_state.get("items"):
-                                picked = (news_state.get("items") or [None])[0]
-                            if picked is not None:
-                                news_state["selected"] = picked
-                            detail_summary = _build_news_detail_summary(picked) if picked else "먼저 최신 뉴스를 불러온 뒤에, 관심 있는 키워드를 말해주시면 자세히 설명해드릴게요."
-                            live_data = {
-                                "speechSummary": detail_summary,
-                                "news": {
-                                    "topic": news_state.get("topic") or "",
-                                    "headlines": [str(i.get("title") or "").strip() for i in (news_state.get("items") or []) if isinstance(i, dict)],
-                                    "items": news_state.get("items") or [],
-                                    "selected": picked,
-                                },
-                            }
+                        # LLM-first: only use regex destination extraction when fallback routing is active.
+                        if route_source in IntentRouter.LLM_SOURCES or routed_intents:
+                            dest = routed_dest
                         else:
-                            live_data = _execute_tools_for_intent(
-                                intent=intent or "commute_overview",
-                                lat=client_state.get("lat"),
-                                lng=client_state.get("lng"),
-                                destination_name=context_destination,
-                                env_cache=env_cache,
-                                user_text=text,
-                            )
-                        live_summary = live_data.get("speechSummary") if isinstance(live_data, dict) else None
-                        # Strict fail-closed behavior for API-backed intents:
-                        # if data is unavailable, do not provide alternative guidance.
-                        api_backed_intents = {"subway_route", "bus_route", "commute_overview", "weather", "air_quality", "restaurant", "news"}
-                        if intent in api_backed_intents:
-                            if not isinstance(live_data, dict):
-                                live_summary = "현재 요청하신 정보를 받을 수 없습니다."
-                            elif not str(live_data.get("speechSummary") or "").strip():
-                                live_summary = "현재 요청하신 정보를 받을 수 없습니다."
-
-                        # If user asked congestion specifically, do not fallback to route guidance.
-                        if intent in {"subway_route", "commute_overview"} and _is_congestion_query(text):
-                            cong = live_data.get("subwayCongestion") if isinstance(live_data, dict) else None
-                            least_car = str(cong.get("leastCar") or "").strip() if isinstance(cong, dict) else ""
-                            if not least_car:
-                                live_summary = "현재 지하철 혼잡도 정보를 받을 수 없습니다."
-                        if intent == "news":
-                            news_meta = live_data.get("news") if isinstance(live_data, dict) else None
-                            if isinstance(news_meta, dict):
-                                news_state["topic"] = str(news_meta.get("topic") or "").strip()
-                                items = news_meta.get("items") or []
-                                if isinstance(items, list):
-                                    news_state["items"] = [i for i in items if isinstance(i, dict)]
-                                else:
-                                    news_state["items"] = []
-                                news_state["selected"] = None
-                                news_state["ts"] = time.monotonic()
-                        print(
-                            f"[SeoulInfo] live context built: intent={intent}, destination={context_destination}, "
-                            f"summary_ok={bool(live_summary)}"
-                        )
+                            dest = routed_dest or turn_features.destination
+                        # If destination is explicitly mentioned with route-like wording, prefer route intent.
+                        if dest and intent == "general" and turn_features.has("route_words"):
+                            intent = "commute_overview"
+                        if dest:
+                            next_dest = str(dest).strip()
+                            if next_dest and next_dest != destination_state.get("name"):
+                                destination_state["name"] = next_dest
+                            destination_state["asked_once"] = False
 
-                        guidance = []
-                        if client_state.get("lat") is not None and client_state.get("lng") is not None:
-                            guidance.append("Location is known; do not ask user's current location.")
-                        if intent in transit_intents and destination_state.get("name"):
-                            guidance.append(
-                                f"Use destination '{destination_state['name']}' for this turn and ignore older destination context."
+                        # Persist home destination only when classifier says this is a home update utterance.
+                        if routed_home_update or (route_source not in IntentRouter.LLM_SOURCES and _is_home_update_utterance(text, features=turn_features)):
+                            home_candidate = str(dest or "").strip()
+                            # Fallback: If LLM missed the destination but flagged home_update=True, try regex extraction
+                            if not home_candidate:
+                                home_candidate = str(turn_features.destination or "").strip()
+                            
+                            if home_candidate:
+                                destination_state["name"] = home_candidate
+                                destination_state["asked_once"] = False
+                                if loop.is_running():
+                                    _submit_coroutine(
+                                        _save_home_destination(home_candidate),
+                                        label="save_home",
+                                    )
+                                print(f"[Profile] Home destination updated in-session: {home_candidate}")
+
+                        # "날씨랑 집 가는 길 알려줘": fetch every intent at once and answer in one context turn.
+                        turn_intents = []
+                        if len(routed_intents) > 1 and isinstance(route, dict) and intent == route.get("intent"):
+                            turn_intents = routed_intents
+                        live_summary = None
+                        routing_intents = ws_orchestrator.ROUTING_INTENTS
+                        should_inject_live = intent in routing_intents
+
+                        if should_inject_live:
+                            # Always gate response until live context is injected to prevent pre-context utterances.
+                            ws_orchestrator.arm_live_response_gate(
+                                response_guard=response_guard,
+                                transit_turn_gate=transit_turn_gate,
+                                intent=intent,
                             )
-                        if (
-                            not destination_state.get("name")
-                            and intent in transit_intents
-                        ):
-                            if not destination_state.get("asked_once", False):
-                                guidance.append("Ask destination exactly once in one short question.")
-                                destination_state["asked_once"] = True
-                            else:
-                                guidance.append("Destination still missing; do not repeat destination question.")
-
-                        if not live_summary:
-                            live_summary = "현재 요청하신 정보를 받을 수 없습니다."
-
-                        context_priority_intents = ws_orchestrator.CONTEXT_PRIORITY_INTENTS
-                        context_summary = ws_orchestrator.merge_context_summary(
-                            live_summary=live_summary,
-                            guidance=guidance,
-                        )
-                        action_instruction = ws_orchestrator.build_action_instruction(intent)
-
-                        if intent in context_priority_intents:
-                            # Keep gate a little longer while response turn is being finalized.
-                            ws_orchestrator.extend_post_context_gate(transit_turn_gate)
+                            response_guard["active_since"] = time.monotonic()
+                            response_guard["context_sent_at"] = 0.0
+                            response_guard["retry_issued"] = False
+                            if client_state.get("lat") is not None and client_state.get("lng") is not None and loop.is_running():
+                                supervisor.submit_threadsafe(
+                                    _inject_live_context_now(
+                                        "[INTENT:location_guard] Device location is already known and valid for this turn. "
+                                        "Do not ask user location.",
+                                        complete_turn=False,
+                                    ),
+                                    "location_guard",
+                                )
 
-                        if loop.is_running():
-                            # Suppress near-duplicate context turns generated by STT split finalization.
-                            normalized_summary = re.sub(r"\s+", " ", str(context_summary or "")).strip()[:220]
-                            dedupe_key = f"{intent}|{normalized_summary}"
-                            now_ctx_ts = time.monotonic()
+                            # For transit queries that require live API fetch, speak a short filler first.
+                            # This reduces awkward silence while ODSAY/Seoul APIs are being fetched.
                             if (
-                                dedupe_key
-                                and dedupe_key == str(context_turn_dedupe.get("key") or "")
-                                and (now_ctx_ts - float(context_turn_dedupe.get("ts") or 0.0)) < 8.0
+                                (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT)
+                                and ENABLE_TRANSIT_FILLER
+                                and intent in {"subway_route", "bus_route", "commute_overview"}
+                                and loop.is_running()
                             ):
-                                print(f"[Guard] duplicate context turn skipped: intent={intent}")
+                                filler_text = (
+                                    "[INTENT:loading] The user requested live transit guidance. "
+                                    "First, say one short Korean filler sentence naturally "
+                                    "(e.g., '음, 잠시만요. 지금 확인해볼게요.'). "
+                                    "Do not provide route details yet. "
+                                    "Do not ask for user location."
+                                )
+                                supervisor.submit_threadsafe(
+                                    _inject_live_context_now(filler_text, complete_turn=True),
+                                    "transit_filler",
+                                )
+                            transit_intents = ws_orchestrator.TRANSIT_INTENTS
+                            context_destination = destination_state["name"] if intent in transit_intents else None
+                            if turn_intents:
+                                speculative_prefetcher.cancel("compound turn")
+                                speculative_future = None
+                            else:
+                                speculative_future = speculative_prefetcher.claim(
+                                    _speculation_key(intent, context_destination, text, features=turn_features)
+                                )
+                            if intent in {"news_detail", "news_followup"}:
+                                picked = news_state.get("selected")
+                                if picked is None and news_state.get("items"):
+                                    picked = _select_news_item_by_text(text=text, items=(news_state.get("items") or []))
+                                if picked is None and news_state.get("items"):
+                                    picked = (news_state.get("items") or [None])[0]
+                                if picked is not None:
+                                    news_state["selected"] = picked
+                                detail_summary = _build_news_detail_summary(picked) if picked else "먼저 최신 뉴스를 불러온 뒤에, 관심 있는 키워드를 말해주시면 자세히 설명해드릴게요."
+                                live_data = {
+                                    "speechSummary": detail_summary,
+                                    "news": {
+                                        "topic": news_state.get("topic") or "",
+                                        "headlines": [str(i.get("title") or "").strip() for i in (news_state.get("items") or []) if isinstance(i, dict)],
+                                        "items": news_state.get("items") or [],
+                                        "selected": picked,
+                                    },
+                                }
+                            elif speculative_future is not None:
+                                first_audio_probe["armed_at"] = turn_deadline.started_at
+                                first_audio_probe["path"] = "first_audio:speculative"
+                                live_data = turn_deadline.wait("speculative_prefetch", speculative_future)
+                                print(f"[Speculative] reused prefetch: intent={intent}, ready={live_data is not None}")
+                            elif turn_intents:
+                                first_audio_probe["armed_at"] = turn_deadline.started_at
+                                first_audio_probe["path"] = "first_audio:compound"
+                                live_data = _execute_tools_for_intents(
+                                    intents=turn_intents,
+                                    lat=client_state.get("lat"),
+                                    lng=client_state.get("lng"),
+                                    destination_name=destination_state.get("name"),
+                                    env_cache=env_cache,
+                                    user_text=text,
+                                    deadline=turn_deadline,
+                                )
+                            else:
+                                progressive = {"sent": False, "parts": []}
+
+                                def _on_route_ready(partial: dict):
+                                    # Speak the route strategy now; ETA/congestion follow as silent updates.
+                                    if int(user_turn_seq.get("corrected") or 0) == turn_id:
+                                        print("[IntentRouter] progressive context skipped: late LLM route already answered")
+                                        return
+                                    if _dispatch_live_context_turn(intent, partial.get("speechSummary"), text):
+                                        progressive["sent"] = True
+                                        progressive["parts"] = list(partial.get("speechParts") or [])
+                                        print(
+                                            f"[SeoulInfo] progressive route context sent: intent={intent}, "
+                                            f"elapsed={turn_deadline.elapsed():.2f}s"
+                                        )
+
+                                stream_route_first = (
+                                    PROGRESSIVE_LIVE_CONTEXT
+                                    and intent in {"subway_route", "commute_overview"}
+                                    and not _is_congestion_query(text, features=turn_features)
+                                )
+                                first_audio_probe["armed_at"] = turn_deadline.started_at
+                                first_audio_probe["path"] = (
+                                    "first_audio:progressive" if stream_route_first else "first_audio:full"
+                                )
+                                live_data = _execute_tools_for_intent(
+                                    intent=intent or "commute_overview",
+                                    lat=client_state.get("lat"),
+                                    lng=client_state.get("lng"),
+                                    destination_name=context_destination,
+                                    env_cache=env_cache,
+                                    user_text=text,
+                                    deadline=turn_deadline,
+                                    on_route_ready=_on_route_ready if stream_route_first else None,
+                                )
+                                if progressive["sent"]:
+                                    sent_parts = set(progressive["parts"])
+                                    final_parts = live_data.get("speechParts") if isinstance(live_data, dict) else None
+                                    update_parts = [p for p in (final_parts or []) if p and p not in sent_parts]
+                                    if int(user_turn_seq.get("corrected") or 0) == turn_id:
+                                        print("[IntentRouter] progressive update skipped: late LLM route already answered")
+                                        update_parts = []
+                                    if update_parts and loop.is_running():
+                                        _submit_coroutine(
+                                            _inject_live_context_now(
+                                                f"[INTENT:{intent}_update] " + " ".join(update_parts) + " "
+                                                "Add this to the route answer briefly if it is still relevant; "
+                                                "do not repeat the route itself.",
+                                                complete_turn=False,
+                                            ),
+                                            label=f"context_update:{intent}",
+                                        )
+                                    print(
+                                        f"[SeoulInfo] progressive enrichment: intent={intent}, "
+                                        f"updates={len(update_parts)}, elapsed={turn_deadline.elapsed():.2f}s"
+                                    )
+                                    return
+                            live_summary = _finalize_live_summary(intent, live_data, text, features=turn_features)
+                            print(
+                                f"[SeoulInfo] live context built: intent={intent}, destination={context_destination}, "
+                                f"summary_ok={bool(live_summary)}, elapsed={turn_deadline.elapsed():.2f}s, "
+                                f"skipped={turn_deadline.skipped}, timed_out={turn_deadline.timed_out}"
+                            )
+                            if int(user_turn_seq.get("corrected") or 0) == turn_id:
+                                print("[IntentRouter] fallback context skipped: late LLM route already answered")
                                 return
-                            context_turn_dedupe["key"] = dedupe_key
-                            context_turn_dedupe["ts"] = now_ctx_ts
-                            response_guard["pending_intent"] = (intent or "commute_overview")
-                            response_guard["pending_context_summary"] = context_summary
-                            response_guard["pending_action_instruction"] = action_instruction
-                            response_guard["pending_user_text"] = str(text or "").strip()
-                            _submit_coroutine(
-                                _request_spoken_response_with_context(
-                                    intent_tag=(intent or "commute_overview"),
-                                    context_summary=context_summary,
-                                    action_instruction=action_instruction,
-                                    tone="neutral",
-                                    complete_turn=(intent in context_priority_intents),
-                                ),
-                                label=f"context_turn:{intent}",
+
+                            _dispatch_live_context_turn(
+                                intent,
+                                live_summary,
+                                text,
+                                intents=[i.get("intent") for i in turn_intents] or None,
                             )
-                    else:
-                        # Text-only path for non-routing/general turns when direct audio is disabled.
-                        if (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT) and loop.is_running():
-                            asyncio.run_coroutine_threadsafe(_send_user_text_turn(text), loop)
-                except Exception as e:
-                    print(f"[SeoulInfo] dynamic context build failed: {e}")
+                        else:
+                            speculative_prefetcher.cancel("non-data turn")
+                            # Text-only path for non-routing/general turns when direct audio is disabled.
+                            if (not EFFECTIVE_GEMINI_DIRECT_AUDIO_INPUT) and loop.is_running():
+                                supervisor.submit_threadsafe(_send_user_text_turn(text), "user_text_turn")
+                    except Exception as e:
+                        speculative_prefetcher.cancel("turn failed")
+                        print(f"[SeoulInfo] dynamic context build failed: {e}")
             
-    def on_recognizing(args, role):
-        if role != "user":
-            return
-        text = str(getattr(args.result, "text", "") or "").strip()
-        if not text:
-            return
-        now_ts = time.monotonic()
-        user_activity["last_user_ts"] = now_ts
-        last_ts = float(speech_window_state.get("last_recognizing_ts") or 0.0)
-        if (now_ts - last_ts) > 0.9:
-            speech_window_state["utterance_start_ts"] = now_ts
-        speech_window_state["last_recognizing_ts"] = now_ts
-        # Gate early model audio while user speech is being finalized by STT.
-        speech_capture_gate["until"] = max(float(speech_capture_gate.get("until") or 0.0), now_ts + 1.2)
-        # Also hard-block direct audio briefly to avoid stale pre-context model turns.
-        response_guard["block_direct_audio"] = True
-        response_guard["block_direct_audio_until"] = max(
-            float(response_guard.get("block_direct_audio_until") or 0.0),
-            now_ts + 1.5,
-        )
+        barge_in_state = {"utterance_ts": 0.0}
 
-    def dual_on_recognized(args, role):
-        if args.result.text:
-            text = args.result.text
-            if loop.is_running():
-                asyncio.run_coroutine_threadsafe(lumi_rami_manager.handle_stt_result(text, role), loop)
-            on_recognized(args, role)
+        def _barge_in(onset_ts: float):
+            speaking = lumi_rami_manager.turn_manager.current_speaker
+            if not (speaking or downlink.is_playing()):
+                return
+            dropped = downlink.clear() + ws_writer.clear_audio()
+            interrupted = lumi_rami_manager.interrupt()
 
-    user_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "user"))
-    lumi_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "lumi"))
-    rami_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "rami"))
-    user_recognizer.recognizing.connect(lambda evt: on_recognizing(evt, "user"))
+            def _on_flush_sent():
+                TURN_LATENCY.record("barge_in", time.monotonic() - onset_ts)
+                print(f"[Latency] {TURN_LATENCY.format_line('barge_in')}")
 
-    user_recognizer.start_continuous_recognition()
-    lumi_recognizer.start_continuous_recognition()
-    rami_recognizer.start_continuous_recognition()
+            # Clients that do not know this frame ignore it; server-side audio is already cut either way.
+            ws_writer.send_control({"type": "playback_flush", "reason": "barge_in"}, on_sent=_on_flush_sent)
+            print(f"[BargeIn] user speech over {speaking or 'playback'}: dropped {dropped} frames, interrupted={interrupted}")
+
+        def on_recognizing(args, role):
+            if role != "user":
+                return
+            text = str(getattr(args.result, "text", "") or "").strip()
+            if not text:
+                return
+            now_ts = time.monotonic()
+            user_activity["last_user_ts"] = now_ts
+            last_ts = float(speech_window_state.get("last_recognizing_ts") or 0.0)
+            if (now_ts - last_ts) > 0.9:
+                speech_window_state["utterance_start_ts"] = now_ts
+            speech_window_state["last_recognizing_ts"] = now_ts
+            utterance_ts = float(speech_window_state.get("utterance_start_ts") or now_ts)
+            if (
+                BARGE_IN
+                and len(text) >= BARGE_IN_MIN_CHARS
+                and barge_in_state["utterance_ts"] != utterance_ts
+                and loop.is_running()
+            ):
+                # Once per utterance, measured from its first partial (the earliest onset signal STT gives).
+                barge_in_state["utterance_ts"] = utterance_ts
+                loop.call_soon_threadsafe(_barge_in, utterance_ts)
+            if SPECULATIVE_PREFETCH and LIVE_TOOL_MODE != "function_calling":
+                try:
+                    _speculate_on_partial(text)
+                except Exception as e:
+                    print(f"[Speculative] partial routing failed: {e}")
+            # Gate early model audio while user speech is being finalized by STT.
+            speech_capture_gate["until"] = max(float(speech_capture_gate.get("until") or 0.0), now_ts + 1.2)
+            # Also hard-block direct audio briefly to avoid stale pre-context model turns.
+            response_guard["block_direct_audio"] = True
+            response_guard["block_direct_audio_until"] = max(
+                float(response_guard.get("block_direct_audio_until") or 0.0),
+                now_ts + 1.5,
+            )
+
+        def dual_on_recognized(args, role):
+            if args.result.text:
+                text = args.result.text
+                if loop.is_running():
+                    supervisor.submit_threadsafe(lumi_rami_manager.handle_stt_result(text, role), f"stt:{role}")
+                on_recognized(args, role)
+
+        user_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "user"))
+        lumi_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "lumi"))
+        rami_recognizer.recognized.connect(lambda evt: dual_on_recognized(evt, "rami"))
+        user_recognizer.recognizing.connect(lambda evt: on_recognizing(evt, "user"))
+
+        # Closers first: if one recognizer fails to start, the others are still stopped.
+        for recognizer_name, recognizer in (("user", user_recognizer), ("lumi", lumi_recognizer), ("rami", rami_recognizer)):
+            supervisor.add_closer(
+                f"recognizer:{recognizer_name}",
+                lambda r=recognizer: asyncio.to_thread(r.stop_continuous_recognition),
+            )
+        user_recognizer.start_continuous_recognition()
+        lumi_recognizer.start_continuous_recognition()
+        rami_recognizer.start_continuous_recognition()
+        session_started = True
 
-    try:
         await lumi_rami_manager.start(lumi_memory=lumi_mem_str, rami_memory=rami_mem_str)
         await _preload_env_cache(force=True)
         await _inject_initial_location_context()
@@ -1181,7 +1795,7 @@ async def audio_websocket(ws: WebSocket):
                     msg_type = msg.get("type")
                     if msg_type == "websocket.disconnect":
                         print("[Server] WebSocket Disconnected (Receive Loop)")
-                        return
+                        return "disconnect"
                     if msg_type != "websocket.receive":
                         continue
 
@@ -1205,19 +1819,21 @@ async def audio_websocket(ws: WebSocket):
                                         client_state["last_log_lat"] = new_lat
                                         client_state["last_log_lng"] = new_lng
                                     if moved_m is None or moved_m >= 80:
-                                        asyncio.create_task(_preload_env_cache(force=False))
-                                    asyncio.create_task(
+                                        supervisor.spawn(_preload_env_cache(force=False), "env_preload")
+                                    supervisor.spawn(
                                         briefing_runtime.maybe_send_leaving_home_alert(
                                             briefing_state=briefing_state,
                                             current_gps={"lat": new_lat, "lng": new_lng},
-                                        )
+                                        ),
+                                        "leaving_home_alert",
                                     )
-                                    asyncio.create_task(
+                                    supervisor.spawn(
                                         briefing_runtime.maybe_send_evening_local_alert(
                                             briefing_state=briefing_state,
                                             current_gps={"lat": new_lat, "lng": new_lng},
                                             moved_m=moved_m,
-                                        )
+                                        ),
+                                        "evening_local_alert",
                                     )
                             elif isinstance(payload, dict) and payload.get("type") == "camera_state":
                                 await vision_service.set_camera_enabled(
@@ -1227,13 +1843,13 @@ async def audio_websocket(ws: WebSocket):
                             elif isinstance(payload, dict) and payload.get("type") == "camera_frame_base64":
                                 await vision_service.handle_camera_frame_payload(
                                     payload=payload,
-                                    push_image_now=lumi_rami_manager.push_image if hasattr(lumi_rami_manager, "push_image") else None,
+                                    push_image_now=_push_image_normalized,
                                     inject_live_context_now=_inject_live_context_now,
                                 )
                             elif isinstance(payload, dict) and payload.get("type") == "camera_snapshot_base64":
                                 await vision_service.handle_camera_snapshot_payload(
                                     payload=payload,
-                                    push_image_now=lumi_rami_manager.push_image if hasattr(lumi_rami_manager, "push_image") else None,
+                                    push_image_now=_push_image_normalized,
                                     inject_live_context_now=_inject_live_context_now,
                                 )
                             elif isinstance(payload, dict) and payload.get("type") == "multimodal_input":
@@ -1252,7 +1868,7 @@ async def audio_websocket(ws: WebSocket):
                                         b64_str = input_image.split(",")[-1] if "," in input_image else input_image
                                         img_bytes = base64.b64decode(b64_str)
                                         if loop.is_running():
-                                            _submit_coroutine(lumi_rami_manager.handle_multimodal_input(input_text, image_bytes=img_bytes), label="multimodal_img")
+                                            _submit_coroutine(_handle_multimodal_image(input_text, img_bytes), label="multimodal_img")
                                     except Exception as e:
                                         print(f"[Multimodal] Error parsing image: {e}")
                                 else:
@@ -1266,6 +1882,22 @@ async def audio_websocket(ws: WebSocket):
                     data = msg.get("bytes")
                     if not data:
                         continue
+                    if camera_binary:
+                        camera_frame = parse_camera_frame(data)
+                        if camera_frame is not None:
+                            await vision_service.handle_camera_frame_bytes(
+                                kind=camera_frame[0],
+                                jpeg=camera_frame[1],
+                                push_image_now=_push_image_normalized,
+                                inject_live_context_now=_inject_live_context_now,
+                            )
+                            continue
+                    uplink_audio["wireBytes"] += len(data)
+                    if audio_codecs["uplink"] == "mulaw":
+                        decode_started = time.perf_counter()
+                        data = mulaw_decode(data)
+                        uplink_audio["decodeSec"] += time.perf_counter() - decode_started
+                    uplink_audio["pcmBytes"] += len(data)
 
                     if (
                         (not response_guard.get("active"))
@@ -1304,56 +1936,103 @@ async def audio_websocket(ws: WebSocket):
                     await asyncio.to_thread(user_push_stream.write, data)
             except WebSocketDisconnect:
                 print("[Server] WebSocket Disconnected (Receive Loop)")
-                return
+                return "disconnect"
             except Exception as e:
                 print(f"[Server] Error processing input: {e}")
+                return "error"
 
         # Run tasks
-        async def smart_flush_injector():
-            silence_chunk = b"\x00" * int(max(1, AI_FLUSH_SILENCE_SEC) * 48000)
-            try:
-                while True:
-                    await asyncio.sleep(0.1)
-                    now_mono = time.monotonic()
-                    
-                    if (now_mono - lumi_state["last_ai_write_time"] > AI_FLUSH_SILENCE_AFTER_SEC) and not lumi_state["flushed"]:
-                        await asyncio.to_thread(lumi_push_stream.write, silence_chunk)
-                        lumi_state["flushed"] = True
-                        
-                    if (now_mono - rami_state["last_ai_write_time"] > AI_FLUSH_SILENCE_AFTER_SEC) and not rami_state["flushed"]:
-                        await asyncio.to_thread(rami_push_stream.write, silence_chunk)
-                        rami_state["flushed"] = True
-            except asyncio.CancelledError:
-                pass
-
-        tasks = [
-            asyncio.create_task(receive_from_client()),
-            asyncio.create_task(smart_flush_injector()),
-        ]
+        background = []
         if MORNING_BRIEFING is not None:
-            tasks.append(asyncio.create_task(briefing_runtime.scheduler_loop(briefing_state)))
-        done, pending = await asyncio.wait(
-            tasks,
-            return_when=asyncio.FIRST_COMPLETED
-        )
-        for task in pending: task.cancel()
+            background.append(supervisor.spawn(briefing_runtime.scheduler_loop(briefing_state), "briefing_scheduler"))
+
+        def _release_socket():
+            released = resume_state["released"]
+            if released is not None and not released.done():
+                released.set_result(None)
+
+        receive_task = supervisor.spawn(receive_from_client(), "receive")
+        while True:
+            handoff = resume_state["handoff"]
+            # The rest is cancelled and awaited by supervisor.aclose().
+            done, pending = await asyncio.wait(
+                [receive_task, *background, *([handoff] if handoff is not None else [])],
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if handoff is not None and handoff in done:
+                # Reconnected before this socket was seen to drop: it is stale, move to the new one.
+                receive_task.cancel()
+                try:
+                    await asyncio.wait_for(ws.close(code=4000, reason="Session resumed on another connection"), timeout=1.0)
+                except Exception:
+                    pass
+            elif handoff is None or receive_task not in done or receive_task.result() != "disconnect":
+                break
+            else:
+                # Client dropped: keep Gemini, recognizers and state alive and wait for a reattach.
+                ws_writer.detach()
+                downlink.clear()
+                lumi_rami_manager.interrupt()
+                _release_socket()
+                SESSION_REGISTRY.park(user_id, resume_token)
+                print(f"[Resume] {user_id} parked for {SESSION_RESUME_GRACE_SEC}s")
+                try:
+                    await asyncio.wait_for(handoff, timeout=SESSION_RESUME_GRACE_SEC)
+                except asyncio.TimeoutError:
+                    SESSION_REGISTRY.discard(user_id, resume_token, expired=True)
+                    print(f"[Resume] {user_id} did not come back within {SESSION_RESUME_GRACE_SEC}s")
+                    break
+
+            _release_socket()
+            ws, resume_state["released"] = handoff.result()
+            resume_state["resumes"] += 1
+            resume_state["handoff"] = SESSION_REGISTRY.arm(user_id, resume_token)
+            # The new socket may ask for other codecs/framing: re-negotiate before anything is sent on it.
+            wire = _wire_options(ws)
+            if wire["codecs"]["downlink"] != audio_codecs["downlink"] or wire["header"] != downlink.header:
+                # Already-encoded frames in the writer are in the old format; queued PCM is encoded on send.
+                ws_writer.clear_audio()
+            audio_codecs.update(wire["codecs"])
+            downlink.header = wire["header"]
+            downlink.encode = ImaAdpcmEncoder().encode if audio_codecs["downlink"] == "ima_adpcm" else None
+            ws_writer.batch_transcripts = wire["batch_transcripts"]
+            camera_binary = wire["camera_binary"]
+            ws_writer.attach(ws)
+            if wire["codec_requested"]:
+                _send_audio_format()
+            ws_writer.send_control({"type": "session_resumed", "resumes": resume_state["resumes"]})
+            print(f"[Resume] {user_id} resumed (#{resume_state['resumes']})")
+            receive_task = supervisor.spawn(receive_from_client(), "receive")
 
     except Exception as e:
         print(f"[Server] Session Error or Disconnect: {e}")
     finally:
         # Cleanup
-        session_ref["obj"] = None
+        if resume_token is not None:
+            SESSION_REGISTRY.discard(user_id, resume_token)
         print("[Server] Cleaning up resources...")
-        await timer_service.shutdown()
-        await lumi_rami_manager.stop()
-        try:
-            await asyncio.wait_for(asyncio.to_thread(user_recognizer.stop_continuous_recognition), timeout=2.0)
-            await asyncio.wait_for(asyncio.to_thread(lumi_recognizer.stop_continuous_recognition), timeout=2.0)
-            await asyncio.wait_for(asyncio.to_thread(rami_recognizer.stop_continuous_recognition), timeout=2.0)
-        except Exception as e:
-            print(f"[Server] Cleanup Warning: {e}")
+        if session_started:
+            session_ref["obj"] = None
+            await lumi_rami_manager.stop()
+            print(f"[Downlink] {downlink.format_line()}")
+            print(
+                f"[Uplink] codec={audio_codecs['uplink']}, wire={uplink_audio['wireBytes']} B, "
+                f"pcm={uplink_audio['pcmBytes']} B, decode={uplink_audio['decodeSec']:.3f}s"
+            )
+            print(f"[STT] AI silence flushes: {ai_stt_flush.stats}")
+            print(f"[WsWriter] {ws_writer.snapshot()}")
+            if vision_service.change_detector is not None and vision_service.change_detector.stats()["hashed"]:
+                print(f"[Vision] change detection: {vision_service.change_detector.stats()}")
+        if IMAGE_NORMALIZER is not None and IMAGE_NORMALIZER.stats()["images"]:
+            print(f"[Image] normalization (process-wide): {IMAGE_NORMALIZER.stats()}")
+        # Runs even when setup failed: stops whatever was already started (writer, packetizer, recognizers).
+        # Cancels persona tasks (closing both Gemini connections), timers and stray work, then closers.
+        await supervisor.aclose()
+        print(f"[Supervisor] process totals: {supervisor_totals()}")
         try: await ws.close() 
         except: pass
+        if resume_state["released"] is not None and not resume_state["released"].done():
+            resume_state["released"].set_result(None)
         print("[Server] Connection closed")
 
         # 3. Save Memory (Unified Unified Schema)
@@ -1399,6 +2078,20 @@ async def get_memory_history(token: str):
     items = await asyncio.to_thread(cosmos_service.get_all_memories, token)
     return {"ok": True, "data": items}
 
+@app.get("/api/runtime/latency")
+async def get_runtime_latency():
+    """Rolling routing / first-audio latency percentiles per path (route:*, first_audio:*), plus fetch pool load."""
+    return {"ok": True, "data": dict(TURN_LATENCY.snapshot(), fetchPool=fetch_pool_stats())}
+
+@app.get("/api/runtime/sessions")
+async def get_runtime_sessions():
+    """Live session count and task/connection leak counters (should stay flat over time)."""
+    return {"ok": True, "data": dict(supervisor_totals(), resume=SESSION_REGISTRY.snapshot())}
+
+@app.get("/api/runtime/intent-cache")
+async def get_intent_route_cache_stats():
+    return {"ok": True, "data": INTENT_ROUTE_CACHE.stats()}
+
 # --- OAuth Routes for Frontend ---
 
 @app.get('/login')